@@ -0,0 +1,55 @@
+import argparse
+import timeit
+from collections.abc import Callable
+
+from pylox.caches import PropertyCache
+from pylox.objects import BoundMethod, LoxClass, LoxInstance
+
+Method = Callable[[LoxInstance, float], float]
+
+
+def add(this: LoxInstance, value: float) -> float:
+    return value + 1
+
+
+# `serve` is defined at the root of a chain of `depth` classes and called on
+# instances of the leaf, the worst case for walking superclass dicts.
+def hierarchy(depth: int) -> LoxClass:
+    klass = LoxClass("Root", methods={"serve": add})
+    for level in range(depth):
+        klass = LoxClass(f"Level{level}", klass, {f"other{level}": add})
+    return klass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare method dispatch with and without inline caches"
+    )
+    _ = parser.add_argument("--depth", type=int, default=5)
+    _ = parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    instance = LoxInstance(hierarchy(args.depth))
+    instance.set("x", 1.0)
+    cache = PropertyCache("serve")
+
+    def plain() -> None:
+        _ = add(instance, 1.0)
+
+    def uncached() -> None:
+        bound = BoundMethod(instance, instance.shape.klass.find_method("serve"))
+        method: Method = bound.method  # pyright: ignore[reportAssignmentType]
+        _ = method(bound.receiver, 1.0)
+
+    def cached() -> None:
+        method, this = cache.callee(instance)
+        _ = method(this, 1.0)  # pyright: ignore[reportCallIssue]
+
+    for name, call in [("function", plain), ("uncached", uncached), ("cached", cached)]:
+        seconds = min(timeit.repeat(call, number=args.calls, repeat=3))
+        print(f"{name}: {seconds / args.calls * 1e9:.0f} ns per call")
+    print(f"cache: {cache.state}, {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
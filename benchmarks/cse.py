@@ -0,0 +1,80 @@
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+from pylox.cse import MemoizingInterpreter
+from pylox.hashcons import InterningFactory, NodeFactory
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+
+VARIABLES: list[str] = ["price", "rate", "quantity", "discount"]
+OPERATORS: list[str] = ["+", "-", "*"]
+
+
+# Formulas are assembled from a small pool of terms, the way generated
+# spreadsheet-style code repeats the same subexpressions over and over.
+def generate_formulas(statements: int, terms: int, depth: int) -> str:
+    pool = [f"({random.choice(VARIABLES)} * {random.randint(1, 9)})"]
+    for _ in range(terms):
+        left, right = random.choice(pool), random.choice(pool)
+        pool.append(f"({left} {random.choice(OPERATORS)} {right})")
+        pool = pool[-depth:]
+    header = "".join(
+        f"var {name} = {index + 1.5};\n" for index, name in enumerate(VARIABLES)
+    )
+    body = "".join(
+        f"print {random.choice(pool)} {random.choice(OPERATORS)} {random.choice(pool)};\n"
+        for _ in range(statements)
+    )
+    return header + body
+
+
+def parse(source: str, nodes: NodeFactory) -> tuple[list[Stmt], int]:
+    tracemalloc.start()
+    statements = Parser(RegexScanner(source).scan_buffer(), nodes).parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statements, peak
+
+
+def run(engine: type[Interpreter], statements: list[Stmt], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = engine(stdout=io.StringIO())
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare plain and hash-consed parsing and evaluation of formulas"
+    )
+    _ = parser.add_argument("--statements", type=int, default=2000)
+    _ = parser.add_argument("--terms", type=int, default=40)
+    _ = parser.add_argument("--depth", type=int, default=12)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    source = generate_formulas(args.statements, args.terms, args.depth)
+    plain, plain_bytes = parse(source, NodeFactory())
+    shared, shared_bytes = parse(source, InterningFactory())
+    print(f"source: {len(source) / 1e6:.1f} MB")
+    print(
+        f"parse peak memory: plain {plain_bytes / 1e6:.1f} MB, shared {shared_bytes / 1e6:.1f} MB"
+    )
+    tree = run(Interpreter, plain, args.repeat)
+    memoized = run(MemoizingInterpreter, shared, args.repeat)
+    print(
+        f"evaluate: tree {tree * 1000:.1f} ms, cse {memoized * 1000:.1f} ms ({tree / memoized:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import contextlib
+import os
+import random
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from pylox.closures import ClosureCompiler
+from pylox.compiler import Compiler
+from pylox.cse import MemoizingInterpreter
+from pylox.interpreter import Interpreter
+from pylox.iterative import IterativeInterpreter
+from pylox.parser import Parser
+from pylox.quicken import SpecializingInterpreter
+from pylox.scanner import Scanner
+from pylox.stmt import Stmt
+from pylox.transpile import transpile
+from pylox.vm import VM
+
+# Each engine splits into a one-off preparation step and a repeatable run.
+ENGINES: dict[str, tuple[Callable[[list[Stmt]], Any], Callable[[Any], None]]] = {
+    "tree": (
+        lambda statements: statements,
+        lambda statements: Interpreter().interpret(statements),
+    ),
+    # One interpreter across repeats, so later runs use the specialized sites.
+    "specializing": (
+        lambda statements: (SpecializingInterpreter(), statements),
+        lambda prepared: prepared[0].interpret(prepared[1]),
+    ),
+    "iterative": (
+        lambda statements: statements,
+        lambda statements: IterativeInterpreter().interpret(statements),
+    ),
+    "cse": (
+        lambda statements: statements,
+        lambda statements: MemoizingInterpreter().interpret(statements),
+    ),
+    "closure": (
+        lambda statements: [ClosureCompiler().compile(s) for s in statements],
+        lambda actions: [action() for action in actions] and None,
+    ),
+    "vm": (
+        lambda statements: Compiler().compile(statements),
+        lambda chunk: VM().run(chunk),
+    ),
+    "python": (
+        lambda statements: transpile(statements),
+        lambda program: program.run(),
+    ),
+}
+
+
+def best_of(function: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0:
+        return str(random.randint(1, 1000))
+    operator = random.choice(["+", "-", "*", "+", "-", "*", "<", "=="])
+    left = generate_expression(depth - 1)
+    right = generate_expression(depth - 1)
+    return f"({left} {operator} {right})"
+
+
+def generate_program(statements: int, depth: int) -> str:
+    return "\n".join(f"{generate_expression(depth)};" for _ in range(statements))
+
+
+def parse(source: str) -> list[Stmt]:
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare pylox execution engines on a generated workload"
+    )
+    _ = parser.add_argument("--statements", type=int, default=500)
+    _ = parser.add_argument("--depth", type=int, default=6)
+    _ = parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    statements = parse(generate_program(args.statements, args.depth))
+    results: dict[str, tuple[float, float]] = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, (prepare, run) in ENGINES.items():
+            prepared = prepare(statements)
+            results[name] = (
+                best_of(partial(prepare, statements), args.repeat),
+                best_of(partial(run, prepared), args.repeat),
+            )
+    baseline = results["tree"][1]
+    print(f"{'engine':<12} {'prepare':>12} {'run':>12} {'speedup':>8}")
+    for name, (prepare_seconds, run_seconds) in results.items():
+        print(
+            f"{name:<12} {prepare_seconds * 1000:9.2f} ms {run_seconds * 1000:9.2f} ms"
+            f" {baseline / run_seconds:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from pylox.objects import FieldCache, LoxClass, LoxInstance
+
+
+# The layout shapes replace: a class reference plus a dict of fields.
+class DictInstance:
+    __slots__ = ("fields", "klass")
+
+    def __init__(self, klass: LoxClass) -> None:
+        self.klass: LoxClass = klass
+        self.fields: dict[str, object] = {}
+
+
+def build_dicts(klass: LoxClass, count: int) -> list[object]:
+    instances: list[object] = []
+    for index in range(count):
+        instance = DictInstance(klass)
+        instance.fields["x"] = index
+        instance.fields["y"] = index
+        instance.fields["z"] = index
+        instances.append(instance)
+    return instances
+
+
+def build_shaped(klass: LoxClass, count: int) -> list[object]:
+    x, y, z = FieldCache("x"), FieldCache("y"), FieldCache("z")
+    instances: list[object] = []
+    for index in range(count):
+        instance = LoxInstance(klass)
+        x.set(instance, index)
+        y.set(instance, index)
+        z.set(instance, index)
+        instances.append(instance)
+    return instances
+
+
+def measure(build: Callable[[LoxClass, int], list[object]], count: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    instances = build(LoxClass("Point"), count)
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{build.__name__}: {size / len(instances):.0f} bytes per instance, "
+        f"{seconds * 1000:.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare dict and shape-based layouts for small instances"
+    )
+    _ = parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    measure(build_dicts, args.count)
+    measure(build_shaped, args.count)
+
+
+if __name__ == "__main__":
+    main()
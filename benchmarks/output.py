@@ -0,0 +1,77 @@
+import argparse
+import os
+import time
+from collections.abc import Callable
+
+from pylox.compiler import Compiler
+from pylox.output import FdSink, Sink, StreamSink
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.vm import VM
+
+
+def generate_script(lines: int) -> str:
+    return "var n = 0.5;\n" + "print n = n * 1.5 + 1;\n" * lines
+
+
+# What every Lox print cost before sinks: the built-in print() per value.
+def time_print(values: list[float], path: str) -> float:
+    with open(path, "w") as stream:
+        start = time.perf_counter()
+        for value in values:
+            print(str(value), file=stream)
+        return time.perf_counter() - start
+
+
+def time_sink(values: list[float], output: Sink) -> float:
+    start = time.perf_counter()
+    write = output.write
+    for value in values:
+        write(value)
+    output.flush()
+    return time.perf_counter() - start
+
+
+def with_fd(path: str, run: Callable[[int], float]) -> float:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    try:
+        return run(fd)
+    finally:
+        os.close(fd)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare print() with output sinks on a print-heavy workload"
+    )
+    _ = parser.add_argument("--lines", type=int, default=1_000_000)
+    _ = parser.add_argument("--output", default=os.devnull)
+    args = parser.parse_args()
+
+    value = 0.5
+    values: list[float] = []
+    for _ in range(args.lines):
+        value = value * 1.5 + 1
+        values.append(value)
+    print(f"print() per value: {time_print(values, args.output) * 1000:.1f} ms")
+    with open(args.output, "w") as stream:
+        seconds = time_sink(values, StreamSink(stream))
+    print(f"text stream sink: {seconds * 1000:.1f} ms")
+    seconds = with_fd(args.output, lambda fd: time_sink(values, FdSink(fd)))
+    print(f"fd sink: {seconds * 1000:.1f} ms")
+
+    statements = Parser(RegexScanner(generate_script(args.lines)).scan_buffer()).parse()
+
+    def run_vm(fd: int) -> float:
+        vm = VM(None, FdSink(fd))
+        chunk = Compiler(vm.resolver).compile(statements)
+        start = time.perf_counter()
+        vm.run(chunk)
+        vm.output.flush()
+        return time.perf_counter() - start
+
+    print(f"vm script, fd sink: {with_fd(args.output, run_vm) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
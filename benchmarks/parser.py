@@ -0,0 +1,54 @@
+import argparse
+import random
+import timeit
+from functools import partial
+
+from pylox.parser import Parser, RecursiveDescentParser
+from pylox.scanner import RegexScanner
+from pylox.token import TokenBuffer
+
+OPERATORS: list[str] = ["==", "<", "+", "-", "*", "/"]
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0:
+        return random.choice(["1", "2.5", '"s"', "true", "nil"])
+    if random.random() < 0.2:
+        return f"-({generate_expression(depth - 1)})"
+    left = generate_expression(depth - 1)
+    right = generate_expression(depth - 1)
+    return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def parse(parser: type[Parser], tokens: TokenBuffer) -> None:
+    _ = parser(tokens).parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure pylox parser throughput")
+    _ = parser.add_argument("--statements", type=int, default=2_000)
+    _ = parser.add_argument("--depth", type=int, default=5)
+    _ = parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    source = "\n".join(
+        f"print {generate_expression(args.depth)};" for _ in range(args.statements)
+    )
+    tokens = RegexScanner(source).scan_buffer()
+    baseline = 0.0
+    for implementation in (RecursiveDescentParser, Parser):
+        seconds = min(
+            timeit.repeat(
+                partial(parse, implementation, tokens), number=1, repeat=args.repeat
+            )
+        )
+        baseline = baseline or seconds
+        print(
+            f"{implementation.__name__:<23} {len(tokens) / seconds:12,.0f} tokens/s"
+            f"  {baseline / seconds:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import random
+import timeit
+from functools import partial
+
+from pylox.scanner import RegexScanner, Scanner
+
+STATEMENTS: list[str] = [
+    'print "Hello, world!";',
+    "var total = (60 * 60 * 24) * days + 1.5;",
+    "// A comment that runs to the end of the line",
+    "if (a >= b and !done) { print a; } else { print b; }",
+    'fun greet(name) { return "Hi " + name; }',
+]
+
+
+def generate_source(size: int) -> str:
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        line = random.choice(STATEMENTS)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure pylox scanner throughput")
+    _ = parser.add_argument("--size", type=int, default=1_000_000)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    source = generate_source(args.size)
+    token_count = len(RegexScanner(source).scan_tokens())
+    baseline = 0.0
+    for scanner in (Scanner, RegexScanner):
+        seconds = min(
+            timeit.repeat(
+                partial(lambda scanner: scanner(source).scan_tokens(), scanner),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        baseline = baseline or seconds
+        print(
+            f"{scanner.__name__:<13} {token_count / seconds:12,.0f} tokens/s"
+            f"  {baseline / seconds:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import statistics
+import time
+
+from pylox.program import compile
+from pylox.scheduler import run_all
+
+
+# A mix of short scripts and a few long ones that would starve the rest if
+# they ran to completion in one go.
+def generate_script(statements: int) -> str:
+    return "var n = 0;\n" + "n = n + 1;\n" * statements + "print n;"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run many Lox scripts concurrently on one event loop"
+    )
+    _ = parser.add_argument("--scripts", type=int, default=2000)
+    _ = parser.add_argument("--long-every", type=int, default=100)
+    _ = parser.add_argument("--slice-steps", type=int, default=100)
+    args = parser.parse_args()
+
+    short, long = compile(generate_script(20)), compile(generate_script(50_000))
+    programs = {
+        f"script{index}": long if index % args.long_every == 0 else short
+        for index in range(args.scripts)
+    }
+    start = time.perf_counter()
+    results = run_all(programs, slice_steps=args.slice_steps)
+    seconds = time.perf_counter() - start
+    slices = sorted(result.cost.longest_slice for result in results)
+    print(
+        f"{len(results)} scripts, {sum(result.cost.steps for result in results)} steps"
+    )
+    print(f"wall {seconds * 1000:.1f} ms")
+    print(
+        f"longest slice: median {statistics.median(slices) * 1e6:.0f} us, "
+        f"max {slices[-1] * 1e6:.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HELLO: Path = Path(__file__).parent.parent / "samples" / "hello.lox"
+COMMANDS: dict[str, list[str]] = {
+    "python": ["-c", "pass"],
+    "import pylox": ["-c", "import pylox"],
+    "import run_file": ["-c", "from pylox import run_file"],
+    "run hello.lox": ["-m", "pylox", "--no-cache", str(HELLO)],
+    "run cached": ["-m", "pylox", str(HELLO)],
+}
+
+
+def wall_time(arguments: list[str]) -> float:
+    start = time.perf_counter()
+    _ = subprocess.run(
+        [sys.executable, *arguments], check=True, stdout=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start
+
+
+# The slowest imports of a command, as reported by `python -X importtime`.
+def slowest_imports(arguments: list[str], count: int) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imports: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imports.append((int(fields[1]), fields[2].strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure pylox cold-start latency")
+    _ = parser.add_argument("--repeat", type=int, default=20)
+    _ = parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ["PYTHONWARNINGS"] = "ignore"
+    for name, arguments in COMMANDS.items():
+        _ = wall_time(arguments)
+        timings = [wall_time(arguments) for _ in range(args.repeat)]
+        print(
+            f"{name:<16} {statistics.fmean(timings) * 1000:8.1f} ms"
+            f" ± {statistics.stdev(timings) * 1000:5.1f} ms"
+        )
+    print(f"\nSlowest imports of `{' '.join(COMMANDS['run hello.lox'])}`:")
+    for microseconds, module in slowest_imports(COMMANDS["run hello.lox"], args.top):
+        print(f"{microseconds / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import io
+import time
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+
+PIECE: str = "x" * 99 + "\\n"
+
+
+# Lox has no loops yet, so the loop is unrolled into one statement per append.
+def build_report(appends: int) -> list[Stmt]:
+    source = 'var report = "";\n' + f'report = report + "{PIECE}";\n' * appends
+    return Parser(RegexScanner(source + "print report;\n").scan_buffer()).parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time building a large string by repeated appends"
+    )
+    _ = parser.add_argument(
+        "--appends", type=int, nargs="+", default=[10_000, 20_000, 40_000, 80_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'appends':>8} {'MB':>6} {'seconds':>8} {'us/append':>10}")
+    for appends in args.appends:
+        statements = build_report(appends)
+        stdout = io.StringIO()
+        start = time.perf_counter()
+        Interpreter(stdout=stdout).interpret(statements)
+        elapsed = time.perf_counter() - start
+        megabytes = len(stdout.getvalue()) / 1e6
+        print(
+            f"{appends:>8} {megabytes:>6.1f} {elapsed:>8.3f}"
+            f" {elapsed / appends * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import Scanner
+
+SAMPLES: Path = Path(__file__).parent.parent / "samples"
+OPERATORS: list[str] = ["+", "-", "*", "<", "==", "!="]
+PHASES: tuple[str, ...] = ("scan", "parse", "interpret")
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0:
+        return random.choice(["1", "2.5", "42", "true", "nil", '"s"'])
+    left = generate_expression(depth - 1)
+    right = generate_expression(depth - 1)
+    return f"({left} {random.choice(OPERATORS)} {right})"
+
+
+# A chain of groupings and unary operators whose nesting grows linearly.
+def generate_nested(depth: int) -> str:
+    expression = "1"
+    for _ in range(depth):
+        expression = f"-({expression} + 1)"
+    return expression
+
+
+def workloads() -> Iterator[tuple[str, str]]:
+    for path in sorted(SAMPLES.glob("*.lox")):
+        yield f"sample/{path.name}", path.read_text()
+    random.seed(0)
+    for statements in (100, 1_000, 10_000):
+        yield (
+            f"size/{statements}",
+            "\n".join(f"print {generate_expression(3)};" for _ in range(statements)),
+        )
+    for depth in (8, 32, 96):
+        yield (
+            f"depth/{depth}",
+            "\n".join(f"{generate_nested(depth)};" for _ in range(50)),
+        )
+
+
+def measure(function: Callable[[], object], repeat: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def benchmark(source: str, repeat: int) -> dict[str, dict[str, Any]]:
+    tokens = Scanner(source).scan_tokens()
+    statements = Parser(tokens).parse()
+    interpreter = Interpreter()
+    phases: dict[str, tuple[Callable[[], object], int, str]] = {
+        "scan": (lambda: Scanner(source).scan_tokens(), len(tokens), "tokens"),
+        "parse": (lambda: Parser(tokens).parse(), len(tokens), "tokens"),
+        "interpret": (
+            lambda: interpreter.interpret(statements),
+            len(statements),
+            "statements",
+        ),
+    }
+    results: dict[str, dict[str, Any]] = {}
+    for phase, (function, items, unit) in phases.items():
+        timings = measure(function, repeat)
+        mean = statistics.fmean(timings)
+        results[phase] = {
+            "mean": mean,
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "timings": timings,
+            "items": items,
+            "unit": unit,
+            "throughput": items / mean if mean else 0.0,
+        }
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    report: dict[str, object] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "repeat": args.repeat,
+        "benchmarks": {},
+    }
+    benchmarks: dict[str, object] = {}
+    for name, source in workloads():
+        if args.filter and args.filter not in name:
+            continue
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                results = benchmark(source, args.repeat)
+        except RuntimeError as e:
+            print(f"{name:<28} skipped: {e}", file=sys.stderr)
+            continue
+        benchmarks[name] = results
+        for phase in PHASES:
+            result = results[phase]
+            mean, stdev = result["mean"], result["stdev"]
+            print(
+                f"{name:<28} {phase:<10} {mean * 1000:10.3f} ms"
+                f" ± {stdev / mean * 100 if mean else 0.0:5.1f}%"
+                f" {result['throughput']:14,.0f} {result['unit']}/s"
+            )
+    report["benchmarks"] = benchmarks
+    if args.output:
+        _ = Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+# A phase regresses when it is slower by more than the threshold and the gap
+# is larger than the combined noise of both runs.
+def compare(args: argparse.Namespace) -> None:
+    base = json.loads(Path(args.base).read_text())["benchmarks"]
+    head = json.loads(Path(args.head).read_text())["benchmarks"]
+    regressions = 0
+    for name in sorted(base.keys() & head.keys()):
+        for phase in PHASES:
+            old, new = base[name][phase], head[name][phase]
+            ratio = new["mean"] / old["mean"] if old["mean"] else 1.0
+            noise = old["stdev"] + new["stdev"]
+            regressed = ratio > 1 + args.threshold and new["mean"] - old["mean"] > noise
+            regressions += regressed
+            print(
+                f"{name:<28} {phase:<10} {old['mean'] * 1000:10.3f} ms"
+                f" -> {new['mean'] * 1000:10.3f} ms {ratio:6.2f}x"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+    print(f"{regressions} regression(s)")
+    if regressions:
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time pylox scanning, parsing and interpretation"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    _ = run_parser.add_argument("--repeat", type=int, default=10)
+    _ = run_parser.add_argument("--filter", help="only run benchmarks containing this")
+    _ = run_parser.add_argument("--output", help="write results as JSON to this path")
+    run_parser.set_defaults(handler=run)
+    compare_parser = commands.add_parser("compare", help="compare two JSON results")
+    _ = compare_parser.add_argument("base")
+    _ = compare_parser.add_argument("head")
+    _ = compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown tolerated before flagging (default 0.1)",
+    )
+    compare_parser.set_defaults(handler=compare)
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
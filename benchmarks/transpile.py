@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pylox.cache import ProgramCache
+from pylox.interpreter import Interpreter
+from pylox.output import FdSink
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+from pylox.transpile import run_source, transpile
+
+
+# Arithmetic on globals and block locals, the kind of script the transpiler
+# turns into plain Python locals and float operations.
+def generate_script(blocks: int) -> str:
+    block = (
+        "{\n  var a = x * 1.5;\n  var b = a - y / 2;\n"
+        "  a = a * b + (a - b) * (a + b);\n  x = x + 1;\n  y = y + a / b;\n}\n"
+    )
+    return "var x = 1;\nvar y = 2;\n" + block * blocks + "print x;\nprint y;\n"
+
+
+def parse(source: str) -> list[Stmt]:
+    return Parser(RegexScanner(source).scan_buffer()).parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the transpiling engine with the tree interpreter"
+    )
+    _ = parser.add_argument("--blocks", type=int, default=2_000)
+    args = parser.parse_args()
+
+    source = generate_script(args.blocks)
+    statements = parse(source)
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        start = time.perf_counter()
+        Interpreter(None, FdSink(fd)).interpret(statements)
+        tree_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        program = transpile(statements)
+        compile_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        program.run(None, FdSink(fd))
+        run_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ProgramCache(Path(directory))
+            timings: list[float] = []
+            for _ in range(2):
+                start = time.perf_counter()
+                run_source(source, 1, lambda: parse(source), 0, cache, FdSink(fd))
+                timings.append(time.perf_counter() - start)
+    finally:
+        os.close(fd)
+
+    print(f"tree interpreter: {tree_seconds * 1000:.1f} ms")
+    print(f"transpile and compile: {compile_seconds * 1000:.1f} ms")
+    print(
+        f"transpiled run: {run_seconds * 1000:.1f} ms"
+        f" ({tree_seconds / run_seconds:.1f}x)"
+    )
+    print(f"script, cold cache: {timings[0] * 1000:.1f} ms")
+    print(f"script, warm cache: {timings[1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import timeit
+
+import numpy as np
+
+from pylox.expr import Expr
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Expression
+from pylox.vectorize import evaluate
+
+FORMULA: str = "(price * quantity - discount) / 100 > threshold == !flagged"
+
+
+def per_row(expression: Expr, columns: dict[str, list[object]], rows: int) -> None:
+    for row in range(rows):
+        values = {name: column[row] for name, column in columns.items()}
+        _ = Interpreter(values).evaluate(expression)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-row and vectorized evaluation of a Lox formula"
+    )
+    _ = parser.add_argument("--rows", type=int, default=100_000)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    [statement] = Parser(RegexScanner(f"{FORMULA};").scan_buffer()).parse()
+    assert isinstance(statement, Expression)
+    rng = np.random.default_rng(0)
+    columns = {
+        "price": rng.uniform(1, 100, args.rows),
+        "quantity": rng.integers(1, 10, args.rows).astype(np.float64),
+        "discount": rng.uniform(0, 5, args.rows),
+        "threshold": np.full(args.rows, 2.5),
+        "flagged": rng.integers(0, 2, args.rows).astype(np.bool_),
+    }
+    rows = {name: column.tolist() for name, column in columns.items()}
+    timings = {
+        "per-row": min(
+            timeit.repeat(
+                lambda: per_row(statement.expr, rows, args.rows),
+                number=1,
+                repeat=args.repeat,
+            )
+        ),
+        "vectorized": min(
+            timeit.repeat(
+                lambda: evaluate(statement.expr, columns),
+                number=1,
+                repeat=args.repeat,
+            )
+        ),
+    }
+    for name, seconds in timings.items():
+        print(
+            f"{name:<12} {args.rows / seconds:14,.0f} rows/s"
+            f"  {timings['per-row'] / seconds:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
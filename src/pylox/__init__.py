@@ -1,3 +1,22 @@
-from pylox.__main__ import main
+from typing import Any
 
-__all__ = ["main"]
+# Submodules load on first attribute access, so `import pylox` stays cheap
+# and scripts that only call run_file never import the CLI's extras.
+EXPORTS: dict[str, str] = {
+    "Program": "pylox.program",
+    "compile": "pylox.program",
+    "main": "pylox.__main__",
+    "run_file": "pylox.__main__",
+}
+
+__all__ = ["Program", "compile", "main", "run_file"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in EXPORTS:
+        raise AttributeError(f"module 'pylox' has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,57 +1,111 @@
 import argparse
-from typing import TextIO, cast, override
+import os
+import stat
+import sys
+from collections.abc import Iterable, Mapping
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, TextIO, cast
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import PromptBase
-from rich.tree import Tree
-
-from pylox.expr import RichTreePrinter
-from pylox.interpreter import Interpreter
 from pylox.parser import Parser
-from pylox.scanner import Scanner
-from pylox.token import TokenType
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+
+if TYPE_CHECKING:
+    from pylox.cache import ProgramCache
+    from pylox.hashcons import InterningFactory, NodeFactory
+    from pylox.output import Sink
+    from pylox.repl import ReplSession
+
+# Exit statuses, following the sysexits codes used by clox.
+EXIT_OK = 0
+EXIT_DATA_ERROR = 65
+EXIT_SOFTWARE = 70
+
+# Engines, rich and the optional passes are imported on first use, so a plain
+# script run only loads the scanner, parser and tree interpreter.
+ENGINES: dict[str, str] = {
+    "tree": "pylox.interpreter:Interpreter",
+    "specializing": "pylox.quicken:SpecializingInterpreter",
+    "iterative": "pylox.iterative:IterativeInterpreter",
+    "cse": "pylox.cse:MemoizingInterpreter",
+    "closure": "pylox.closures:ClosureInterpreter",
+    "vm": "pylox.vm:VM",
+    "python": "pylox.transpile:TranspilingInterpreter",
+}
+
+
+class Engine(Protocol):
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: "TextIO | Sink | None" = None,
+    ) -> None: ...
+
+    def interpret(self, statements: Iterable[Stmt]) -> bool: ...
 
 
-class LoxPrompt(PromptBase[Scanner]):
-    prompt_suffix: str = ">> "
+def load_engine(name: str) -> type[Engine]:
+    module, _, attribute = ENGINES[name].partition(":")
+    return getattr(import_module(module), attribute)
 
-    @override
-    def process_response(self, value: str) -> Scanner:
-        return Scanner(value)
 
+def run_prompt(session: "ReplSession | None" = None, plain: bool = False) -> None:
+    from configparser import ParsingError
 
-def run_prompt() -> None:
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.prompt import PromptBase
+    from rich.tree import Tree
+
+    from pylox.repl import ReplSession, is_exit, run_plain
+    from pylox.scanner import Scanner
+    from pylox.token import TokenType
+
+    class LoxPrompt(PromptBase[str]):
+        prompt_suffix: str = ">> "
+
+    session = session or ReplSession()
+    if plain:
+        run_plain(session, sys.stdin)
+        return
     console = Console()
     while True:
         try:
             line = LoxPrompt.ask()
-            tokens = line.scan_tokens()
-            if tokens[0].token_type == TokenType.EXIT:
+            if is_exit(line):
                 return
-            parser = Parser(tokens)
-            if statements := parser.parse():
+            error: Exception | None = None
+            try:
+                statements = session.parse(line)
+            except (RuntimeError, ParsingError) as e:
+                statements, error = [], e
+            if statements:
                 # expr_tree = RichTreePrinter().print(expr)
                 # console.print(
                 #     Panel(
                 #         expr_tree,
                 #         title="Expression Tree",
                 #         style="cyan",
-                #         subtitle=f"`{line.source}`",
+                #         subtitle=f"`{line}`",
                 #     )
                 # )
-                interpreter = Interpreter()
-                result = interpreter.interpret(statements)
+                result = session.interpreter.interpret(statements)
                 console.print(
                     Panel(
                         str(result),
                         title="Result",
                         style="green",
-                        subtitle=f"`{line.source}`",
+                        subtitle=f"`{line}`",
                     )
                 )
             else:
-                tree = Tree("Detected Tokens:")
+                tree = Tree("Detected Tokens:" if error is None else str(error))
+                try:
+                    tokens = Scanner(line).scan_tokens()
+                except ParsingError:
+                    # The line does not even scan; the error says why.
+                    tokens = []
                 for token in tokens:
                     suffix = (
                         f": {token.lexeme}"
@@ -64,17 +118,193 @@ def run_prompt() -> None:
                         tree,
                         title="Parsing Error",
                         style="red",
-                        subtitle=f"`{line.source}`",
+                        subtitle=f"`{line}`",
                     )
                 )
         except (EOFError, KeyboardInterrupt):
             return
 
 
-def run_file(filename: TextIO) -> None:
+def interpret(
+    statements: Iterable[Stmt],
+    engine: str = "tree",
+    profile: bool = False,
+    output: "Sink | None" = None,
+    factory: "InterningFactory | None" = None,
+) -> bool:
+    from pylox.output import standard_output
+
+    output = output or standard_output()
+    if not profile and factory is not None:
+        # The statements were built through the cse engine's factory.
+        from pylox.cse import MemoizingInterpreter
+
+        return MemoizingInterpreter(None, output, factory=factory).interpret(statements)
+    if not profile:
+        return load_engine(engine)(None, output).interpret(statements)
+    from rich.console import Console
+
+    from pylox.profiler import ProfilingInterpreter
+
+    profiler = ProfilingInterpreter(None, output)
+    ran = profiler.interpret(statements)
+    console = Console(stderr=True)
+    for table in profiler.tables():
+        console.print(table)
+    return ran
+
+
+# The cse engine shares identical subtrees anyway; building them shared in
+# the first place saves allocating the duplicates. The engine is then given
+# the same factory, so it does not share them all over again.
+def node_factory(engine: str) -> "InterningFactory | None":
+    if engine != "cse":
+        return None
+    from pylox.hashcons import InterningFactory
+
+    return InterningFactory()
+
+
+# Only regular files have an mtime that tracks their contents; pipes and
+# in-memory streams are never cached.
+def source_mtime_ns(filename: TextIO) -> int | None:
+    try:
+        file_stat = os.fstat(filename.fileno())
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns if stat.S_ISREG(file_stat.st_mode) else None
+
+
+# Returns whether the script ran without a runtime error. Scan and parse
+# errors are raised.
+def run_file(
+    filename: TextIO,
+    engine: str = "tree",
+    opt_level: int = 0,
+    cache: "ProgramCache | None" = None,
+    profile: bool = False,
+) -> bool:
     source = "".join(filename.readlines())
+    mtime_ns = source_mtime_ns(filename)
     filename.close()
-    print(source)
+    # The python engine caches the code it compiles, not the parsed program.
+    if engine == "python" and not profile:
+        from pylox.output import standard_output
+        from pylox.transpile import run_source
+
+        return run_source(
+            source,
+            mtime_ns,
+            lambda: parse_source(source, None, opt_level),
+            opt_level,
+            cache,
+            standard_output(),
+        )
+    factory = node_factory(engine)
+    if cache is None or mtime_ns is None:
+        statements = parse_source(source, factory, opt_level)
+        return interpret(statements, engine, profile, factory=factory)
+    key = cache.key(source, opt_level)
+    statements = cache.load(key, mtime_ns)
+    if statements is None:
+        statements = parse_source(source, factory, opt_level)
+        cache.store(key, mtime_ns, statements)
+    elif factory is not None:
+        # Cached programs are stored as plain trees.
+        statements = [factory.share(statement) for statement in statements]
+    return interpret(statements, engine, profile, factory=factory)
+
+
+def parse_source(
+    source: str, factory: "NodeFactory | None", opt_level: int
+) -> list[Stmt]:
+    tokens = RegexScanner(source).scan_buffer()
+    statements = Parser(tokens, factory).parse()
+    if opt_level > 0:
+        from pylox.optimizer import optimize
+
+        statements, removed = optimize(statements, opt_level)
+        print(f"Optimizer removed {removed} nodes", file=sys.stderr)
+    return statements
+
+
+def run_stream(
+    filename: TextIO, engine: str = "tree", opt_level: int = 0, profile: bool = False
+) -> None:
+    from pylox.output import standard_output
+    from pylox.stream import TokenStream, flush_before_reading, read_chunks
+
+    output = standard_output()
+    chunks = flush_before_reading(read_chunks(filename), output)
+    tokens = TokenStream(RegexScanner().scan_stream(chunks))
+    factory = node_factory(engine)
+    statements = Parser(tokens, factory).statements()
+    if opt_level > 0:
+        from pylox.optimizer import Optimizer
+
+        optimizer = Optimizer(opt_level)
+        statements = (
+            optimized
+            for statement in statements
+            for optimized in optimizer.optimize([statement])
+        )
+    _ = interpret(statements, engine, profile, output, factory)
+    filename.close()
+
+
+def program_cache(args: argparse.Namespace) -> "ProgramCache | None":
+    if cast(bool, args.no_cache):
+        return None
+    from pylox.cache import ProgramCache, default_cache_dir
+
+    return ProgramCache(cast(Path | None, args.cache_dir) or default_cache_dir())
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    from time import perf_counter
+
+    # Imported by name: batch mode runs scripts through this module's
+    # run_file, and a static import back would be a cycle.
+    batch = import_module("pylox.batch")
+    start = perf_counter()
+    results = batch.run_batch(
+        batch.expand(cast(str, args.batch)),
+        max(1, cast(int, args.jobs)),
+        cast(str, args.engine),
+        cast(int, args.opt_level),
+        program_cache(args),
+    )
+    print(batch.summary(results, perf_counter() - start))
+    return int(any(result.status != EXIT_OK for result in results))
+
+
+# Runs a script file, returning its exit status: a scan or parse error is
+# printed to stderr and is a data error, as in batch mode, and a runtime
+# error, which the engine reports, is a software error.
+def run_script(args: argparse.Namespace, plain: bool) -> int:
+    from configparser import ParsingError
+
+    filename = cast(TextIO, args.filename)
+    try:
+        if not cast(bool, args.interactive):
+            ran = run_file(
+                filename,
+                cast(str, args.engine),
+                cast(int, args.opt_level),
+                program_cache(args),
+                cast(bool, args.profile),
+            )
+            return EXIT_OK if ran else EXIT_SOFTWARE
+        from pylox.repl import ReplSession
+
+        session = ReplSession()
+        session.load(Parser(RegexScanner(filename.read()).scan_buffer()).parse())
+        filename.close()
+    except (RuntimeError, ParsingError) as e:
+        print(e, file=sys.stderr)
+        return EXIT_DATA_ERROR
+    run_prompt(session, plain)
+    return EXIT_OK
 
 
 def main() -> None:
@@ -84,12 +314,82 @@ def main() -> None:
         epilog="Python 3.13",
     )
     _ = parser.add_argument("filename", nargs="?", type=argparse.FileType("r"))
+    _ = parser.add_argument(
+        "--engine",
+        choices=ENGINES.keys(),
+        default="tree",
+        help="execution engine used to run a script file",
+    )
+    _ = parser.add_argument(
+        "--opt-level",
+        type=int,
+        choices=range(3),
+        default=0,
+        help="0 disables the AST optimizer, 1 folds constants, 2 also simplifies",
+    )
+    _ = parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="run each statement as soon as it is parsed, without loading the "
+        "whole script into memory (use `-` as the filename to read stdin)",
+    )
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always scan and parse, without reading or writing the program cache",
+    )
+    _ = parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="directory for cached parsed programs "
+        "(default: $XDG_CACHE_HOME/pylox or ~/.cache/pylox)",
+    )
+    _ = parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report evaluation counts and timings per node type, operator and "
+        "line on stderr (tree engine only)",
+    )
+    _ = parser.add_argument(
+        "-i",
+        "--interactive",
+        action="store_true",
+        help="run the script, then keep its interpreter session open in the REPL",
+    )
+    _ = parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="REPL prints program output only, without rich panels",
+    )
+    _ = parser.add_argument(
+        "--batch",
+        metavar="DIR_OR_GLOB",
+        help="run every .lox file in a directory, or every file matching a glob, "
+        "and print a JSON summary of their output, exit status and wall time",
+    )
+    _ = parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes used by --batch (default: one per CPU)",
+    )
     args = parser.parse_args()
     args.filename = cast(TextIO | None, args.filename)
+    profile = cast(bool, args.profile)
+    if profile and args.engine != "tree":
+        parser.error("--profile requires --engine tree")
+    plain = cast(bool, args.plain)
+    if args.batch is not None:
+        sys.exit(run_batch(args))
     if args.filename is None:
-        run_prompt()
+        run_prompt(plain=plain)
+    elif cast(bool, args.stream):
+        run_stream(
+            args.filename, cast(str, args.engine), cast(int, args.opt_level), profile
+        )
     else:
-        run_file(args.filename)
+        sys.exit(run_script(args, plain))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+import contextlib
+import glob
+import io
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from configparser import ParsingError
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+
+from pylox.__main__ import (
+    EXIT_DATA_ERROR,
+    EXIT_OK,
+    EXIT_SOFTWARE,
+    load_engine,
+    run_file,
+)
+from pylox.cache import ProgramCache
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    path: str
+    status: int
+    stdout: str
+    stderr: str
+    seconds: float
+
+
+def expand(pattern: str) -> list[Path]:
+    if Path(pattern).is_dir():
+        return sorted(Path(pattern).glob("*.lox"))
+    return [Path(path) for path in sorted(glob.glob(pattern, recursive=True))]
+
+
+# Pool initializer: import everything a script run needs once per worker, so
+# each job only pays for scanning, parsing and running its own script.
+def warm_up(engine: str) -> None:
+    _ = load_engine(engine)
+
+
+def run_script(
+    path: Path,
+    engine: str = "tree",
+    opt_level: int = 0,
+    cache: ProgramCache | None = None,
+) -> BatchResult:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    status = EXIT_OK
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            # Engines report runtime errors themselves, and return whether
+            # there was one.
+            if not run_file(path.open(), engine, opt_level, cache):
+                status = EXIT_SOFTWARE
+        except (RuntimeError, ParsingError) as e:
+            # So an error escaping run_file is a scan or parse error.
+            print(e, file=stderr)
+            status = EXIT_DATA_ERROR
+        except Exception as e:  # noqa: BLE001
+            print(f"{type(e).__name__}: {e}", file=stderr)
+            status = EXIT_SOFTWARE
+    return BatchResult(
+        str(path),
+        status,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        time.perf_counter() - start,
+    )
+
+
+# Results come back in the order of `paths`, whatever order workers finish in.
+def run_batch(
+    paths: list[Path],
+    jobs: int = 1,
+    engine: str = "tree",
+    opt_level: int = 0,
+    cache: ProgramCache | None = None,
+) -> list[BatchResult]:
+    run = partial(run_script, engine=engine, opt_level=opt_level, cache=cache)
+    if jobs == 1:
+        return [run(path) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=warm_up, initargs=(engine,)
+    ) as executor:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        return list(executor.map(run, paths, chunksize=chunksize))
+
+
+def summary(results: list[BatchResult], seconds: float) -> str:
+    return json.dumps(
+        {
+            "scripts": [asdict(result) for result in results],
+            "failed": sum(result.status != EXIT_OK for result in results),
+            "seconds": seconds,
+        },
+        indent=2,
+    )
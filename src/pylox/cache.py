@@ -0,0 +1,234 @@
+import hashlib
+import marshal
+import os
+import struct
+import time
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from pylox.expr import Assign, Binary, Expr, Grouping, Literal, Unary, Variable
+from pylox.stmt import Block, Expression, Print, Stmt, Var
+from pylox.token import TOKEN_TYPES, Token
+
+MAGIC: bytes = b"LOXC\x01"
+# Magic followed by the source file's mtime in nanoseconds.
+HEADER: struct.Struct = struct.Struct(f"<{len(MAGIC)}sq")
+SUFFIX: str = ".loxc"
+# Entries are written to a temporary file first. One older than this was
+# left behind by a writer that died before renaming it; a younger one may
+# still be being written.
+TEMP_SUFFIX: str = ".tmp"
+STALE_TEMP_SECONDS: int = 60 * 60
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+
+# Node tags of the flat postfix encoding.
+LITERAL = 0
+GROUPING = 1
+UNARY = 2
+BINARY = 3
+PRINT = 4
+EXPRESSION = 5
+VARIABLE = 6
+ASSIGN = 7
+VAR = 8
+BLOCK = 9
+
+
+# Identifies the installed pylox code by the size and mtime of its modules.
+# This changes with every release, like the version would, and also with
+# local edits, without paying for an importlib.metadata lookup on each run.
+@cache
+def code_fingerprint() -> str:
+    package = Path(__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package.glob("*.py")):
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pylox"
+
+
+def encode_token(token: Token) -> tuple[object, ...]:
+    return (token.token_type.value, token.lexeme, token.literal, token.line)
+
+
+# Programs are flattened in postfix order into one list of primitives, which
+# marshal stores compactly and which decodes with a stack, without recursion.
+def encode(statements: list[Stmt]) -> list[object]:
+    code: list[object] = []
+    pending: list[Stmt | Expr | tuple[object, ...]] = list(reversed(statements))
+    while pending:
+        match pending.pop():
+            case tuple() as instruction:
+                code += instruction
+            case Literal(value):
+                code += (LITERAL, value)
+            case Grouping(inner):
+                pending += ((GROUPING,), inner)
+            case Unary(operator, right):
+                pending += ((UNARY, *encode_token(operator)), right)
+            case Binary(left, operator, right):
+                pending += ((BINARY, *encode_token(operator)), right, left)
+            case Variable(name):
+                code += (VARIABLE, *encode_token(name))
+            case Assign(name, value):
+                pending += ((ASSIGN, *encode_token(name)), value)
+            case Print(value):
+                pending += ((PRINT,), value)
+            case Expression(value):
+                pending += ((EXPRESSION,), value)
+            case Var(name, None):
+                code += (VAR, *encode_token(name), False)
+            case Var(name, Expr() as initializer):
+                pending += ((VAR, *encode_token(name), True), initializer)
+            case Block(inner):
+                pending += ((BLOCK, len(inner)), *reversed(inner))
+            case node:
+                raise TypeError(f"Cannot encode {type(node).__name__}")
+    return code
+
+
+def decode(code: list[Any]) -> list[Stmt]:
+    statements: list[Stmt] = []
+    exprs: list[Expr] = []
+    index = 0
+    while index < len(code):
+        tag = code[index]
+        if tag == LITERAL:
+            exprs.append(Literal(code[index + 1]))
+            index += 2
+        elif tag == GROUPING:
+            exprs.append(Grouping(exprs.pop()))
+            index += 1
+        elif tag == UNARY or tag == BINARY:
+            token_type, lexeme, literal, line = code[index + 1 : index + 5]
+            operator = Token(TOKEN_TYPES[token_type], lexeme, literal, line)
+            right = exprs.pop()
+            if tag == UNARY:
+                exprs.append(Unary(operator, right))
+            else:
+                exprs.append(Binary(exprs.pop(), operator, right))
+            index += 5
+        elif tag == VARIABLE or tag == ASSIGN:
+            token_type, lexeme, literal, line = code[index + 1 : index + 5]
+            name = Token(TOKEN_TYPES[token_type], lexeme, literal, line)
+            if tag == VARIABLE:
+                exprs.append(Variable(name))
+            else:
+                exprs.append(Assign(name, exprs.pop()))
+            index += 5
+        elif tag == VAR:
+            token_type, lexeme, literal, line, initialized = code[index + 1 : index + 6]
+            name = Token(TOKEN_TYPES[token_type], lexeme, literal, line)
+            statements.append(Var(name, exprs.pop() if initialized else None))
+            index += 6
+        elif tag == BLOCK:
+            count = code[index + 1]
+            inner = tuple(statements[len(statements) - count :])
+            del statements[len(statements) - count :]
+            statements.append(Block(inner))
+            index += 2
+        elif tag == PRINT:
+            statements.append(Print(exprs.pop()))
+            index += 1
+        elif tag == EXPRESSION:
+            statements.append(Expression(exprs.pop()))
+            index += 1
+        else:
+            raise ValueError(f"Unknown node tag {tag}")
+    return statements
+
+
+class ProgramCache:
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory: Path = directory
+        self.max_bytes: int = max_bytes
+
+    # Entries other than parsed programs pass a `variant` naming what they
+    # hold, so they never share a key with the parsed program.
+    def key(self, source: str, opt_level: int = 0, variant: str = "") -> str:
+        digest = hashlib.sha256(
+            f"{code_fingerprint()}\0{opt_level}\0{variant}\0".encode()
+        )
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def load(self, key: str, mtime_ns: int) -> list[Stmt] | None:
+        data = self.read(key, mtime_ns)
+        if data is None:
+            return None
+        try:
+            return decode(marshal.loads(data))
+        except (ValueError, EOFError, TypeError, IndexError):
+            return None
+
+    def store(self, key: str, mtime_ns: int, statements: list[Stmt]) -> None:
+        try:
+            payload = marshal.dumps(encode(statements))
+        except (TypeError, ValueError):
+            return
+        self.write(key, mtime_ns, payload)
+
+    # The payload of an entry written for this mtime, if there is one.
+    def read(self, key: str, mtime_ns: int) -> bytes | None:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            magic, source_mtime_ns = HEADER.unpack_from(data)
+            if magic != MAGIC or source_mtime_ns != mtime_ns:
+                return None
+            # Mark the entry as recently used for eviction.
+            os.utime(path)
+        except (OSError, struct.error):
+            return None
+        return data[HEADER.size :]
+
+    def write(self, key: str, mtime_ns: int, payload: bytes) -> None:
+        import tempfile
+
+        name: str | None = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=TEMP_SUFFIX, delete=False
+            ) as file:
+                name = file.name
+                _ = file.write(HEADER.pack(MAGIC, mtime_ns))
+                _ = file.write(payload)
+            # Readers see either the previous entry or the complete new one.
+            os.replace(name, self.path(key))
+        except OSError:
+            if name is not None:
+                Path(name).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        stale = time.time() - STALE_TEMP_SECONDS
+        for path in self.directory.glob(f"*{TEMP_SUFFIX}"):
+            try:
+                if path.stat().st_mtime < stale:
+                    path.unlink()
+            except OSError:
+                continue
+        entries: list[tuple[int, int, Path]] = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,163 @@
+from abc import ABC, abstractmethod
+from typing import override
+from weakref import WeakSet
+
+from pylox.objects import BoundMethod, LoxClass, LoxInstance, Shape, undefined_property
+
+# Shapes a site caches before it gives up and always looks properties up.
+POLYMORPHIC_LIMIT: int = 4
+
+UNINITIALIZED = "uninitialized"
+MONOMORPHIC = "monomorphic"
+POLYMORPHIC = "polymorphic"
+MEGAMORPHIC = "megamorphic"
+
+# Caches are dropped from this along with the syntax trees that own them.
+LIVE_CACHES: "WeakSet[InlineCache]" = WeakSet()
+
+
+# A cache owned by one property access or call site. `site` says where it is
+# for the profiler's report, which covers every cache still in use.
+class InlineCache(ABC):
+    __slots__ = ("__weakref__", "hits", "misses", "site")
+
+    def __init__(self, site: str) -> None:
+        self.site: str = site
+        self.hits: int = 0
+        self.misses: int = 0
+        LIVE_CACHES.add(self)
+
+    @property
+    @abstractmethod
+    def state(self) -> str:
+        pass
+
+
+# Resolves `name` on instances: a field if the instance has one, otherwise a
+# method of its class or a superclass. Results are kept per shape, since the
+# shape fixes both the field slots and the class, along with the class
+# version they were looked up at. The first shape is kept in attributes and
+# the next ones in `entries`, up to POLYMORPHIC_LIMIT shapes in all; past
+# that the site is megamorphic and caches nothing new.
+class PropertyCache(InlineCache):
+    __slots__ = ("entries", "megamorphic", "method", "name", "shape", "slot", "version")
+
+    def __init__(self, name: str, site: str = "") -> None:
+        super().__init__(site or name)
+        self.name: str = name
+        self.shape: Shape | None = None
+        self.version: int = -1
+        # The field's slot, or -1 when the name is a method.
+        self.slot: int = -1
+        self.method: object = None
+        self.entries: dict[Shape, tuple[int, int, object]] | None = None
+        self.megamorphic: bool = False
+
+    @property
+    @override
+    def state(self) -> str:
+        if self.megamorphic:
+            return MEGAMORPHIC
+        if self.entries is not None:
+            return POLYMORPHIC
+        return UNINITIALIZED if self.shape is None else MONOMORPHIC
+
+    def resolve(self, instance: LoxInstance) -> tuple[int, object]:
+        shape = instance.shape
+        if shape is self.shape and shape.klass.version == self.version:
+            self.hits += 1
+            return self.slot, self.method
+        entries = self.entries
+        if entries is not None:
+            entry = entries.get(shape)
+            if entry is not None and entry[0] == shape.klass.version:
+                self.hits += 1
+                return entry[1], entry[2]
+        self.misses += 1
+        slot, method = lookup(shape, self.name)
+        self.store(shape, slot, method)
+        return slot, method
+
+    def store(self, shape: Shape, slot: int, method: object) -> None:
+        version = shape.klass.version
+        if self.shape is None or self.shape is shape:
+            self.shape, self.version, self.slot, self.method = (
+                shape,
+                version,
+                slot,
+                method,
+            )
+            return
+        if self.entries is None:
+            self.entries = {}
+        if shape in self.entries or len(self.entries) < POLYMORPHIC_LIMIT - 1:
+            self.entries[shape] = (version, slot, method)
+        else:
+            self.megamorphic = True
+
+    # For a Get node: the field's value, or the method bound to the instance.
+    def get(self, instance: LoxInstance) -> object:
+        shape = instance.shape
+        # The monomorphic hit is checked inline, as it is by far the most
+        # common case; everything else goes through resolve().
+        if shape is self.shape and shape.klass.version == self.version:
+            self.hits += 1
+            slot, method = self.slot, self.method
+        else:
+            slot, method = self.resolve(instance)
+        if slot >= 0:
+            return instance.values[slot]
+        return BoundMethod(instance, method)
+
+    # For a call through a Get, `instance.name(...)`: what to call, and the
+    # receiver to pass first, which is None when a field holds the callee.
+    # Methods are not bound, so a call allocates nothing.
+    def callee(self, instance: LoxInstance) -> tuple[object, LoxInstance | None]:
+        shape = instance.shape
+        if shape is self.shape and shape.klass.version == self.version:
+            self.hits += 1
+            slot, method = self.slot, self.method
+        else:
+            slot, method = self.resolve(instance)
+        if slot >= 0:
+            return instance.values[slot], None
+        return method, instance
+
+
+def lookup(shape: Shape, name: str) -> tuple[int, object]:
+    slot = shape.slots.get(name)
+    if slot is not None:
+        return slot, None
+    method = shape.klass.find_method(name)
+    if method is None:
+        raise undefined_property(name)
+    return -1, method
+
+
+# For `super.name`: the method is looked up from a fixed class, so one entry
+# checked against that class's version is all a site needs.
+class SuperCache(InlineCache):
+    __slots__ = ("klass", "method", "name", "version")
+
+    def __init__(self, klass: LoxClass, name: str, site: str = "") -> None:
+        super().__init__(site or f"super.{name}")
+        self.klass: LoxClass = klass
+        self.name: str = name
+        self.version: int = -1
+        self.method: object = None
+
+    @property
+    @override
+    def state(self) -> str:
+        return UNINITIALIZED if self.version < 0 else MONOMORPHIC
+
+    def find(self) -> object:
+        if self.version == self.klass.version:
+            self.hits += 1
+            return self.method
+        self.misses += 1
+        method = self.klass.find_method(self.name)
+        if method is None:
+            raise undefined_property(self.name)
+        self.version, self.method = self.klass.version, method
+        return method
@@ -0,0 +1,225 @@
+import operator
+from collections.abc import Callable, Iterable, Mapping
+from typing import TextIO, override
+
+from pylox import expr, stmt
+from pylox.environment import UNDEFINED, Frame, GlobalTable, undefined_variable
+from pylox.interpreter import binary_op, unary_op
+from pylox.output import Sink, sink
+from pylox.resolver import GLOBAL, Resolver
+from pylox.token import TokenType
+
+type Thunk = Callable[[], object]
+type Action = Callable[[], None]
+
+# Operators whose float/float case is a plain Python operator.
+FLOAT_OPERATIONS: dict[TokenType, Callable[[float, float], object]] = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+
+# Variable slots are looked up once, at compile time, so a closure reading a
+# variable only indexes a list. The frame of the innermost running block is
+# kept in the one-element list `current`, shared by every closure.
+class ClosureCompiler(expr.Visitor[Thunk], stmt.Visitor[Action]):
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+        resolver: Resolver | None = None,
+    ) -> None:
+        self.resolver: Resolver = Resolver() if resolver is None else resolver
+        self.globals: GlobalTable = GlobalTable(
+            self.resolver.global_names, globals or {}
+        )
+        self.current: list[Frame] = [Frame(0)]
+        self.output: Sink = sink(stdout)
+
+    def compile(self, statement: stmt.Stmt) -> Action:
+        self.resolver.resolve(statement)
+        self.globals.grow()
+        try:
+            return statement.accept(self)
+        finally:
+            # The closures hold the slots they need.
+            self.resolver.release()
+
+    def compile_expr(self, expr: expr.Expr) -> Thunk:
+        return expr.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> Thunk:
+        value = self.compile_expr(expr.value)
+        depth, slot = self.resolver.slots[id(expr)]
+        current = self.current
+        if depth == GLOBAL:
+            values = self.globals.cells
+            name = expr.name.lexeme
+
+            # The value is evaluated first, as the tree interpreter does.
+            def assign_global() -> object:
+                result = value()
+                if values[slot] is UNDEFINED:
+                    raise undefined_variable(name)
+                values[slot] = result
+                return result
+
+            return assign_global
+
+        def assign_local() -> object:
+            current[0].ancestor(depth).values[slot] = result = value()
+            return result
+
+        return assign_local
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> Thunk:
+        value = expr.value
+        return lambda: value
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> Thunk:
+        return self.compile_expr(expr.expr)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> Thunk:
+        right = self.compile_expr(expr.right)
+        match expr.operator.token_type:
+            case TokenType.MINUS:
+
+                def negate() -> object:
+                    value = right()
+                    if type(value) is float:
+                        return -value
+                    return unary_op(TokenType.MINUS, value)
+
+                return negate
+            case token_type:
+                return lambda: unary_op(token_type, right())
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> Thunk:
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        token_type = expr.operator.token_type
+        match token_type:
+            case TokenType.EQUAL_EQUAL:
+                return lambda: left() == right()
+            case TokenType.BANG_EQUAL:
+                return lambda: left() != right()
+            case _ if (operation := FLOAT_OPERATIONS.get(token_type)) is not None:
+
+                def arithmetic() -> object:
+                    lhs = left()
+                    rhs = right()
+                    if type(lhs) is float and type(rhs) is float:
+                        return operation(lhs, rhs)
+                    return binary_op(token_type, lhs, rhs)
+
+                return arithmetic
+            case _:
+                return lambda: binary_op(token_type, left(), right())
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> Thunk:
+        depth, slot = self.resolver.slots[id(expr)]
+        current = self.current
+        if depth == GLOBAL:
+            values = self.globals.cells
+            name = expr.name.lexeme
+
+            def global_() -> object:
+                value = values[slot]
+                if value is UNDEFINED:
+                    raise undefined_variable(name)
+                return value
+
+            return global_
+        if depth == 0:
+            return lambda: current[0].values[slot]
+        return lambda: current[0].ancestor(depth).values[slot]
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> Action:
+        size = self.resolver.frame_sizes[id(stmt)]
+        actions = [statement.accept(self) for statement in stmt.statements]
+        current = self.current
+
+        def block() -> None:
+            enclosing = current[0]
+            current[0] = Frame(size, enclosing)
+            try:
+                for action in actions:
+                    action()
+            finally:
+                current[0] = enclosing
+
+        return block
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> Action:
+        value = self.compile_expr(stmt.expr)
+
+        def expression() -> None:
+            _ = value()
+
+        return expression
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> Action:
+        value = self.compile_expr(stmt.expr)
+        write = self.output.write
+
+        def print_() -> None:
+            write(value())
+
+        return print_
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> Action:
+        value = (
+            (lambda: None)
+            if stmt.initializer is None
+            else self.compile_expr(stmt.initializer)
+        )
+        depth, slot = self.resolver.slots[id(stmt)]
+        if depth == GLOBAL:
+            values = self.globals.cells
+
+            def define_global() -> None:
+                values[slot] = value()
+
+            return define_global
+        current = self.current
+
+        def define_local() -> None:
+            current[0].values[slot] = value()
+
+        return define_local
+
+
+class ClosureInterpreter:
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> None:
+        self.compiler: ClosureCompiler = ClosureCompiler(globals, stdout)
+
+    def interpret(self, statements: Iterable[stmt.Stmt]) -> bool:
+        try:
+            for statement in statements:
+                self.compiler.compile(statement)()
+        except Exception as e:  # noqa: BLE001
+            self.compiler.output.write(e)
+            return False
+        finally:
+            self.compiler.output.flush()
+        return True
@@ -0,0 +1,260 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from enum import IntEnum, auto
+from typing import override
+
+from pylox import expr, stmt
+from pylox.resolver import GLOBAL, Resolver
+from pylox.token import TokenType
+
+
+class OpCode(IntEnum):
+    CONSTANT = auto()
+    NIL = auto()
+    TRUE = auto()
+    FALSE = auto()
+    POP = auto()
+
+    NEGATE = auto()
+    NOT = auto()
+
+    ADD = auto()
+    SUBTRACT = auto()
+    MULTIPLY = auto()
+    DIVIDE = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+
+    PRINT = auto()
+    RETURN = auto()
+
+    GET_GLOBAL = auto()
+    DEFINE_GLOBAL = auto()
+    SET_GLOBAL = auto()
+    GET_LOCAL = auto()
+    SET_LOCAL = auto()
+
+
+BINARY_OPCODES: dict[TokenType, OpCode] = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+}
+
+UNARY_OPCODES: dict[TokenType, OpCode] = {
+    TokenType.MINUS: OpCode.NEGATE,
+    TokenType.BANG: OpCode.NOT,
+}
+
+# Constant, global and local indices are encoded as a big-endian u16 operand.
+MAX_CONSTANTS: int = 1 << 16
+MAX_GLOBALS: int = 1 << 16
+MAX_LOCALS: int = 1 << 16
+INDEXED_OPCODES: frozenset[OpCode] = frozenset(
+    {
+        OpCode.GET_GLOBAL,
+        OpCode.DEFINE_GLOBAL,
+        OpCode.SET_GLOBAL,
+        OpCode.GET_LOCAL,
+        OpCode.SET_LOCAL,
+    }
+)
+
+
+@dataclass(slots=True)
+class Chunk:
+    code: bytearray = field(default_factory=bytearray)
+    constants: list[object] = field(default_factory=list)
+    # Run-length encoded line table: `(offset, line)` for the first byte of
+    # every run of instructions that share a source line.
+    lines: list[tuple[int, int]] = field(default_factory=list)
+
+    def write(self, byte: int, line: int) -> None:
+        if not self.lines or self.lines[-1][1] != line:
+            self.lines.append((len(self.code), line))
+        self.code.append(byte)
+
+    def line_at(self, offset: int) -> int:
+        index = bisect_right(self.lines, offset, key=lambda run: run[0]) - 1
+        return self.lines[index][1] if index >= 0 else 0
+
+
+# Globals are addressed by their index in the resolver's global table. Locals
+# live on the VM stack: a block's locals sit in declaration order from the
+# stack height at which the block started, so a resolved (depth, slot) turns
+# into a fixed stack index.
+class Compiler(expr.Visitor[None], stmt.Visitor[None]):
+    def __init__(self, resolver: Resolver | None = None) -> None:
+        self.chunk: Chunk = Chunk()
+        self.line: int = 1
+        self.constant_indices: dict[tuple[type, str], int] = {}
+        self.resolver: Resolver = Resolver() if resolver is None else resolver
+        # Stack index of the first local of each enclosing block.
+        self.bases: list[int] = []
+        self.local_count: int = 0
+
+    def compile(self, statements: list[stmt.Stmt]) -> Chunk:
+        try:
+            for statement in statements:
+                self.resolver.resolve(statement)
+                statement.accept(self)
+        finally:
+            # The code holds the slots it needs.
+            self.resolver.release()
+        self.emit(OpCode.RETURN)
+        return self.chunk
+
+    def emit(self, *data: int) -> None:
+        for byte in data:
+            self.chunk.write(byte, self.line)
+
+    def make_constant(self, value: object) -> int:
+        key = (type(value), repr(value))
+        if (index := self.constant_indices.get(key)) is not None:
+            return index
+        index = len(self.chunk.constants)
+        if index >= MAX_CONSTANTS:
+            raise RuntimeError("Too many constants in one chunk")
+        self.chunk.constants.append(value)
+        self.constant_indices[key] = index
+        return index
+
+    def emit_constant(self, value: object) -> None:
+        index = self.make_constant(value)
+        self.emit(OpCode.CONSTANT, index >> 8, index & 0xFF)
+
+    def emit_indexed(self, opcode: OpCode, index: int) -> None:
+        self.emit(opcode, index >> 8, index & 0xFF)
+
+    # Global indexes are handed out for the whole program, not per chunk.
+    def global_index(self, slot: int) -> int:
+        if slot >= MAX_GLOBALS:
+            raise RuntimeError("Too many global variables")
+        return slot
+
+    # The opcode and operand for a resolved variable: its global index, or
+    # its stack index.
+    def variable_access(
+        self, node: expr.Expr | stmt.Stmt, global_op: OpCode, local_op: OpCode
+    ) -> tuple[OpCode, int]:
+        depth, slot = self.resolver.slots[id(node)]
+        if depth == GLOBAL:
+            return global_op, self.global_index(slot)
+        return local_op, self.bases[len(self.bases) - 1 - depth] + slot
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> None:
+        expr.value.accept(self)
+        self.line = expr.name.line
+        self.emit_indexed(
+            *self.variable_access(expr, OpCode.SET_GLOBAL, OpCode.SET_LOCAL)
+        )
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> None:
+        match expr.value:
+            case None:
+                self.emit(OpCode.NIL)
+            case True:
+                self.emit(OpCode.TRUE)
+            case False:
+                self.emit(OpCode.FALSE)
+            case _:
+                self.emit_constant(expr.value)
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> None:
+        expr.expr.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> None:
+        expr.right.accept(self)
+        self.line = expr.operator.line
+        self.emit(UNARY_OPCODES[expr.operator.token_type])
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+        self.line = expr.operator.line
+        self.emit(BINARY_OPCODES[expr.operator.token_type])
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> None:
+        self.line = expr.name.line
+        self.emit_indexed(
+            *self.variable_access(expr, OpCode.GET_GLOBAL, OpCode.GET_LOCAL)
+        )
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> None:
+        self.bases.append(self.local_count)
+        for statement in stmt.statements:
+            statement.accept(self)
+        size = self.resolver.frame_sizes[id(stmt)]
+        _ = self.bases.pop()
+        self.local_count -= size
+        for _ in range(size):
+            self.emit(OpCode.POP)
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> None:
+        stmt.expr.accept(self)
+        self.emit(OpCode.POP)
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> None:
+        stmt.expr.accept(self)
+        self.emit(OpCode.PRINT)
+
+    # A local is just its initializer's value left on the stack.
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> None:
+        if stmt.initializer is None:
+            self.emit(OpCode.NIL)
+        else:
+            stmt.initializer.accept(self)
+        self.line = stmt.name.line
+        depth, slot = self.resolver.slots[id(stmt)]
+        if depth == GLOBAL:
+            self.emit_indexed(OpCode.DEFINE_GLOBAL, self.global_index(slot))
+            return
+        if self.local_count >= MAX_LOCALS:
+            raise RuntimeError("Too many local variables in one chunk")
+        self.local_count += 1
+
+
+def disassemble(chunk: Chunk) -> list[str]:
+    lines: list[str] = []
+    offset = 0
+    previous_line = -1
+    while offset < len(chunk.code):
+        opcode = OpCode(chunk.code[offset])
+        line = chunk.line_at(offset)
+        prefix = f"{offset:04d} {'   |' if line == previous_line else f'{line:4d}'}"
+        previous_line = line
+        if opcode == OpCode.CONSTANT:
+            index = chunk.code[offset + 1] << 8 | chunk.code[offset + 2]
+            lines.append(
+                f"{prefix} {opcode.name:<16} {index:4d} {chunk.constants[index]!r}"
+            )
+            offset += 3
+        elif opcode in INDEXED_OPCODES:
+            index = chunk.code[offset + 1] << 8 | chunk.code[offset + 2]
+            lines.append(f"{prefix} {opcode.name:<16} {index:4d}")
+            offset += 3
+        else:
+            lines.append(f"{prefix} {opcode.name}")
+            offset += 1
+    return lines
@@ -0,0 +1,134 @@
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TextIO, override
+
+from pylox import expr, stmt
+from pylox.hashcons import InterningFactory, children_of
+from pylox.interpreter import Interpreter
+from pylox.output import Sink
+from pylox.resolver import Resolver
+
+# Nodes worth remembering: looking these up again costs less than evaluating.
+COMPOUND_NODES = (expr.Binary, expr.Unary)
+
+
+# The compound subexpressions that occur more than once in a statement's
+# expression, by id(). With hash-consed trees, identical subexpressions are
+# the same node. Any assignment can change what a shared subexpression
+# evaluates to the second time, so statements with one get no common
+# subexpressions at all. Blocks are planned statement by statement.
+def common_subexpressions(statement: stmt.Stmt) -> frozenset[int]:
+    match statement:
+        case stmt.Print(root) | stmt.Expression(root) | stmt.Var(_, root):
+            pass
+        case _:
+            return frozenset()
+    if root is None:
+        return frozenset()
+    seen: set[int] = set()
+    common: set[int] = set()
+    pending: list[expr.Expr] = [root]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, expr.Assign):
+            return frozenset()
+        if id(node) in seen:
+            # Its children were counted the first time round, and are
+            # only evaluated once along with it. A repeated grouping is
+            # not remembered itself, so look through it.
+            if isinstance(node, COMPOUND_NODES):
+                common.add(id(node))
+            else:
+                pending += children_of(node)
+            continue
+        seen.add(id(node))
+        pending += children_of(node)
+    return frozenset(common)
+
+
+# Resolver for hash-consed statements. Within one statement a shared node
+# resolves the same way every time it occurs, since the factory never shares
+# a node that mentions a variable across a scope change, so it is walked once.
+class SharingResolver(Resolver):
+    def __init__(self) -> None:
+        super().__init__()
+        self.walked: set[int] = set()
+
+    @override
+    def resolve(self, node: expr.Expr | stmt.Stmt) -> None:
+        try:
+            super().resolve(node)
+        finally:
+            self.walked.clear()
+
+    def walk(self, *children: expr.Expr) -> None:
+        for child in children:
+            if id(child) not in self.walked:
+                self.walked.add(id(child))
+                self.pending.append(child)
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> None:
+        self.walk(expr.right, expr.left)
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> None:
+        self.walk(expr.expr)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> None:
+        self.walk(expr.right)
+
+
+# Tree-walking interpreter that evaluates each repeated pure subexpression
+# once per statement. Statements are hash-consed first, so this works on
+# trees from any parser or from the cache. Given the factory the parser
+# built them with, it takes them as they are.
+class MemoizingInterpreter(Interpreter):
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+        resolver: Resolver | None = None,
+        factory: InterningFactory | None = None,
+    ) -> None:
+        super().__init__(
+            globals, stdout, SharingResolver() if resolver is None else resolver
+        )
+        self.shared: bool = factory is not None
+        self.factory: InterningFactory = (
+            InterningFactory() if factory is None else factory
+        )
+        self.common: frozenset[int] = frozenset()
+        self.memo: dict[int, object] = {}
+
+    @override
+    def interpret(self, statements: Iterable[stmt.Stmt]) -> bool:
+        return super().interpret(self.prepare(statements))
+
+    # Between top-level statements no tree is half built, so that is where
+    # the factory's tables are trimmed.
+    def prepare(self, statements: Iterable[stmt.Stmt]) -> Iterator[stmt.Stmt]:
+        for statement in statements:
+            yield statement if self.shared else self.factory.share(statement)
+            self.factory.trim()
+
+    # Planning is a walk like resolving, and a statement runs once, so plans
+    # are not kept.
+    @override
+    def execute(self, stmt: stmt.Stmt) -> None:
+        outer = self.common, self.memo
+        self.common, self.memo = common_subexpressions(stmt), {}
+        try:
+            super().execute(stmt)
+        finally:
+            self.common, self.memo = outer
+
+    @override
+    def evaluate(self, expr: expr.Expr) -> object:
+        if id(expr) not in self.common:
+            return expr.accept(self)
+        try:
+            return self.memo[id(expr)]
+        except KeyError:
+            value = self.memo[id(expr)] = expr.accept(self)
+            return value
@@ -0,0 +1,105 @@
+from collections.abc import Iterator, Mapping, MutableMapping
+
+
+def undefined_variable(name: str) -> RuntimeError:
+    return RuntimeError(f"Undefined variable '{name}'.")
+
+
+# Marks a global slot whose name is known to the resolver but which has not
+# been defined yet, as distinct from a variable holding nil.
+class Undefined:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNDEFINED"
+
+
+UNDEFINED = Undefined()
+
+
+# The locals of one block: a fixed-size list indexed by the slots the
+# resolver assigned, plus the frame of the enclosing block.
+class Frame:
+    __slots__ = ("enclosing", "values")
+
+    def __init__(self, size: int, enclosing: "Frame | None" = None) -> None:
+        self.enclosing: Frame | None = enclosing
+        self.values: list[object] = [None] * size
+
+    def ancestor(self, depth: int) -> "Frame":
+        frame = self
+        for _ in range(depth):
+            assert frame.enclosing is not None
+            frame = frame.enclosing
+        return frame
+
+
+# Global variables, stored in a list at the indexes the resolver hands out.
+# `names` is shared with the resolver, so names it meets after the table was
+# built still get a slot. Reads and writes by name go through the same list,
+# `cells`, which engines index directly.
+class GlobalTable(MutableMapping[str, object]):
+    def __init__(
+        self, names: dict[str, int] | None = None, values: Mapping[str, object] = {}
+    ) -> None:
+        self.names: dict[str, int] = {} if names is None else names
+        self.cells: list[object] = [UNDEFINED] * len(self.names)
+        for name, value in values.items():
+            self.cells[self.index(name)] = value
+
+    def index(self, name: str) -> int:
+        index = self.names.get(name)
+        if index is None:
+            index = self.names[name] = len(self.names)
+        self.reserve(index)
+        return index
+
+    def reserve(self, index: int) -> None:
+        if index >= len(self.cells):
+            self.cells.extend([UNDEFINED] * (index + 1 - len(self.cells)))
+
+    # Makes room for every name the resolver has handed out so far.
+    def grow(self) -> None:
+        self.reserve(len(self.names) - 1)
+
+    def name(self, index: int) -> str:
+        return next(name for name, i in self.names.items() if i == index)
+
+    def get_at(self, index: int) -> object:
+        if index < len(self.cells):
+            value = self.cells[index]
+            if value is not UNDEFINED:
+                return value
+        raise undefined_variable(self.name(index))
+
+    def define(self, index: int, value: object) -> None:
+        self.reserve(index)
+        self.cells[index] = value
+
+    def assign(self, index: int, value: object) -> None:
+        if index >= len(self.cells) or self.cells[index] is UNDEFINED:
+            raise undefined_variable(self.name(index))
+        self.cells[index] = value
+
+    def __getitem__(self, name: str) -> object:
+        index = self.names.get(name)
+        if index is None or index >= len(self.cells):
+            raise KeyError(name)
+        value = self.cells[index]
+        if value is UNDEFINED:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name: str, value: object) -> None:
+        self.cells[self.index(name)] = value
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.cells[self.names[name]] = UNDEFINED
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.names if name in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, override
-
-from rich.tree import Tree
+from typing import TYPE_CHECKING, Any, override
 
 from pylox.token import Token
 
+if TYPE_CHECKING:
+    from rich.tree import Tree
+
 
 class Expr(ABC):
     @abstractmethod
@@ -13,6 +14,16 @@ class Expr(ABC):
         pass
 
 
+@dataclass(frozen=True, slots=True)
+class Assign(Expr):
+    name: Token
+    value: Expr
+
+    @override
+    def accept[T](self, visitor: "Visitor[T]") -> T:
+        return visitor.visit_assign_expr(self)
+
+
 @dataclass(frozen=True, slots=True)
 class Binary(Expr):
     left: Expr
@@ -52,7 +63,20 @@ class Unary(Expr):
         return visitor.visit_unary_expr(self)
 
 
+@dataclass(frozen=True, slots=True)
+class Variable(Expr):
+    name: Token
+
+    @override
+    def accept[T](self, visitor: "Visitor[T]") -> T:
+        return visitor.visit_variable_expr(self)
+
+
 class Visitor[T](ABC):
+    @abstractmethod
+    def visit_assign_expr(self, expr: Assign) -> T:
+        pass
+
     @abstractmethod
     def visit_binary_expr(self, expr: Binary) -> T:
         pass
@@ -69,6 +93,10 @@ class Visitor[T](ABC):
     def visit_unary_expr(self, expr: Unary) -> T:
         pass
 
+    @abstractmethod
+    def visit_variable_expr(self, expr: Variable) -> T:
+        pass
+
 
 class AstPrinter(Visitor[str]):
     def print(self, expr: Expr) -> str:
@@ -77,6 +105,10 @@ class AstPrinter(Visitor[str]):
     def parenthesize(self, name: str, *exprs: Expr) -> str:
         return f"({name} {" ".join(expr.accept(self) for expr in exprs)})"
 
+    @override
+    def visit_assign_expr(self, expr: Assign) -> str:
+        return self.parenthesize(f"= {expr.name.lexeme}", expr.value)
+
     @override
     def visit_binary_expr(self, expr: Binary) -> str:
         return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
@@ -101,38 +133,62 @@ class AstPrinter(Visitor[str]):
     def visit_unary_expr(self, expr: Unary) -> str:
         return self.parenthesize(expr.operator.lexeme, expr.right)
 
+    @override
+    def visit_variable_expr(self, expr: Variable) -> str:
+        return expr.name.lexeme
+
+
+# rich is only imported once a tree is actually printed.
+def new_tree(label: str) -> "Tree":
+    from rich.tree import Tree
 
-class RichTreePrinter(Visitor[Tree]):
-    def print(self, expr: Expr) -> Tree:
+    return Tree(label)
+
+
+class RichTreePrinter(Visitor["Tree"]):
+    def print(self, expr: Expr) -> "Tree":
         return expr.accept(self)
 
     @override
-    def visit_binary_expr(self, expr: Binary) -> Tree:
-        tree = Tree("BinaryExpr")
+    def visit_assign_expr(self, expr: Assign) -> "Tree":
+        tree = new_tree("AssignExpr")
+        name = tree.add(expr.name.lexeme)
+        _ = name.add(expr.value.accept(self))
+        return tree
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> "Tree":
+        tree = new_tree("BinaryExpr")
         operator = tree.add(expr.operator.token_type.name)
         _ = operator.add(expr.left.accept(self))
         _ = operator.add(expr.right.accept(self))
         return tree
 
     @override
-    def visit_grouping_expr(self, expr: Grouping) -> Tree:
-        tree = Tree("GroupingExpr")
+    def visit_grouping_expr(self, expr: Grouping) -> "Tree":
+        tree = new_tree("GroupingExpr")
         _ = tree.add(expr.expr.accept(self))
         return tree
 
     @override
-    def visit_literal_expr(self, expr: Literal) -> Tree:
-        tree = Tree("LiteralExpr")
+    def visit_literal_expr(self, expr: Literal) -> "Tree":
+        tree = new_tree("LiteralExpr")
         _ = tree.add("nil" if expr.value is None else str(expr.value))
         return tree
 
     @override
-    def visit_unary_expr(self, expr: Unary) -> Tree:
-        tree = Tree("UnaryExpr")
+    def visit_unary_expr(self, expr: Unary) -> "Tree":
+        tree = new_tree("UnaryExpr")
         operator = tree.add(expr.operator.token_type.name)
         _ = operator.add(expr.right.accept(self))
         return tree
 
+    @override
+    def visit_variable_expr(self, expr: Variable) -> "Tree":
+        tree = new_tree("VariableExpr")
+        _ = tree.add(expr.name.lexeme)
+        return tree
+
 
 if __name__ == "__main__":
     from pylox.token import TokenType
@@ -0,0 +1,232 @@
+from collections.abc import Callable
+from typing import Any, override
+
+from pylox import expr, stmt
+from pylox.expr import Assign, Binary, Expr, Grouping, Literal, Unary, Variable
+from pylox.stmt import Block, Expression, Print, Var
+from pylox.token import Token
+
+# Shared nodes an InterningFactory keeps before trim() forgets them.
+TABLE_LIMIT: int = 1 << 16
+
+
+# How the Parser builds expression nodes. This one just calls the node
+# classes; InterningFactory shares identical subtrees instead.
+class NodeFactory:
+    assign: Callable[[Token, Expr], Expr] = Assign
+    binary: Callable[[Expr, Token, Expr], Expr] = Binary
+    grouping: Callable[[Expr], Expr] = Grouping
+    literal: Callable[[Any], Expr] = Literal
+    unary: Callable[[Token, Expr], Expr] = Unary
+    variable: Callable[[Token], Expr] = Variable
+
+    # Called by the Parser wherever what a name refers to may change: before
+    # and after a `var` declaration's initializer, and on entering or leaving
+    # a block.
+    def new_scope(self) -> None:
+        pass
+
+
+def literal_key(value: object) -> tuple[object, ...]:
+    # repr tells -0.0 from 0.0, which compare and hash equal.
+    return (Literal, type(value), repr(value) if type(value) is float else value)
+
+
+# Hash-consing factory: structurally identical subtrees become one node.
+# Keys ignore token positions, so a shared node keeps the tokens of its first
+# occurrence and the lines of later occurrences go to the `lines` side table.
+#
+# The resolver gives each Variable node one slot, so nodes that contain a
+# variable are only shared between places where its name means the same
+# thing: that table is emptied whenever the scope changes. Variable-free
+# nodes are shared across the whole program. Assignments are never shared,
+# as evaluating one is a side effect.
+class InterningFactory(NodeFactory):
+    def __init__(self) -> None:
+        self.constant: dict[tuple[object, ...], Expr] = {}
+        self.scoped: dict[tuple[object, ...], Expr] = {}
+        # ids of the variable-free nodes, all of which live in `constant`.
+        self.variable_free: set[int] = set()
+        self.lines: dict[int, list[int]] = {}
+
+    def intern(
+        self, key: tuple[object, ...], make: Callable[[], Expr], *children: Expr
+    ) -> Expr:
+        variable_free = all(id(child) in self.variable_free for child in children)
+        table = self.constant if variable_free else self.scoped
+        node = table.get(key)
+        if node is None:
+            node = table[key] = make()
+            if variable_free:
+                self.variable_free.add(id(node))
+        return node
+
+    def record_line(self, node: Expr, first: Token, token: Token) -> None:
+        if token.line != first.line:
+            self.lines.setdefault(id(node), []).append(token.line)
+
+    def lines_of(self, node: Expr) -> list[int]:
+        first = next((token.line for token in tokens_of(node)), None)
+        return ([] if first is None else [first]) + self.lines.get(id(node), [])
+
+    @override
+    def new_scope(self) -> None:
+        self.scoped.clear()
+
+    # Forgets every shared node once the tables hold more than `limit`, so a
+    # long stream of statements does not keep all of its nodes alive. Only
+    # safe between top-level statements, when no tree is half built; nodes
+    # made before are just not shared with the ones made after.
+    def trim(self, limit: int = TABLE_LIMIT) -> None:
+        if len(self.constant) + len(self.scoped) + len(self.lines) <= limit:
+            return
+        self.constant.clear()
+        self.scoped.clear()
+        self.variable_free.clear()
+        self.lines.clear()
+
+    @override
+    def assign(self, name: Token, value: Expr) -> Expr:
+        return Assign(name, value)
+
+    @override
+    def binary(self, left: Expr, operator: Token, right: Expr) -> Expr:
+        key = (Binary, id(left), operator.token_type, id(right))
+        node = self.intern(key, lambda: Binary(left, operator, right), left, right)
+        assert isinstance(node, Binary)
+        self.record_line(node, node.operator, operator)
+        return node
+
+    @override
+    def grouping(self, expr: Expr) -> Expr:
+        return self.intern((Grouping, id(expr)), lambda: Grouping(expr), expr)
+
+    @override
+    def literal(self, value: Any) -> Expr:
+        return self.intern(literal_key(value), lambda: Literal(value))
+
+    @override
+    def unary(self, operator: Token, right: Expr) -> Expr:
+        key = (Unary, operator.token_type, id(right))
+        node = self.intern(key, lambda: Unary(operator, right), right)
+        assert isinstance(node, Unary)
+        self.record_line(node, node.operator, operator)
+        return node
+
+    @override
+    def variable(self, name: Token) -> Expr:
+        node = self.scoped.get((Variable, name.lexeme))
+        if node is None:
+            node = self.scoped[(Variable, name.lexeme)] = Variable(name)
+        assert isinstance(node, Variable)
+        self.record_line(node, node.name, name)
+        return node
+
+    # Rebuilds already parsed statements with shared subtrees, replaying the
+    # scope changes the Parser would have reported. Nodes that are already
+    # shared are visited once.
+    def share(self, statement: stmt.Stmt) -> stmt.Stmt:
+        return Sharer(self).share(statement)
+
+
+def tokens_of(node: Expr) -> list[Token]:
+    match node:
+        case Binary(operator=operator) | Unary(operator=operator):
+            return [operator]
+        case Variable(name) | Assign(name):
+            return [name]
+        case _:
+            return []
+
+
+class Sharer(expr.Visitor[Expr], stmt.Visitor[stmt.Stmt]):
+    def __init__(self, factory: InterningFactory) -> None:
+        self.factory: InterningFactory = factory
+        self.rebuilt: dict[int, Expr] = {}
+
+    def share(self, statement: stmt.Stmt) -> stmt.Stmt:
+        return statement.accept(self)
+
+    # Post-order walk with an explicit stack, so deep expressions are fine.
+    def rebuild(self, root: Expr) -> Expr:
+        rebuilt = self.rebuilt
+        pending: list[tuple[Expr, bool]] = [(root, False)]
+        while pending:
+            node, children_done = pending.pop()
+            if id(node) in rebuilt:
+                continue
+            children = children_of(node)
+            if not children_done and children:
+                pending.append((node, True))
+                pending += ((child, False) for child in reversed(children))
+                continue
+            rebuilt[id(node)] = node.accept(self)
+        return rebuilt[id(root)]
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> Expr:
+        return self.factory.assign(expr.name, self.rebuilt[id(expr.value)])
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> Expr:
+        left, right = self.rebuilt[id(expr.left)], self.rebuilt[id(expr.right)]
+        return self.factory.binary(left, expr.operator, right)
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> Expr:
+        return self.factory.grouping(self.rebuilt[id(expr.expr)])
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> Expr:
+        return self.factory.literal(expr.value)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> Expr:
+        return self.factory.unary(expr.operator, self.rebuilt[id(expr.right)])
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> Expr:
+        return self.factory.variable(expr.name)
+
+    def new_scope(self) -> None:
+        # Rebuilt nodes that mention a variable must not be reused either.
+        self.factory.new_scope()
+        self.rebuilt = {
+            key: node
+            for key, node in self.rebuilt.items()
+            if id(node) in self.factory.variable_free
+        }
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> stmt.Stmt:
+        self.new_scope()
+        statements = tuple(statement.accept(self) for statement in stmt.statements)
+        self.new_scope()
+        return Block(statements)
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> stmt.Stmt:
+        return Expression(self.rebuild(stmt.expr))
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> stmt.Stmt:
+        return Print(self.rebuild(stmt.expr))
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> stmt.Stmt:
+        self.new_scope()
+        initializer = (
+            None if stmt.initializer is None else self.rebuild(stmt.initializer)
+        )
+        self.new_scope()
+        return Var(stmt.name, initializer)
+
+
+def children_of(node: Expr) -> tuple[Expr, ...]:
+    match node:
+        case Binary(left, _, right):
+            return (left, right)
+        case Unary(_, right) | Grouping(right) | Assign(_, right):
+            return (right,)
+        case _:
+            return ()
@@ -1,23 +1,105 @@
-from typing import override
+from collections.abc import Iterable, Mapping
+from typing import TextIO, override
 
 import pylox.expr as expr
 import pylox.stmt as stmt
+from pylox.environment import Frame, GlobalTable
+from pylox.output import Sink, sink
+from pylox.resolver import GLOBAL, Resolver
+from pylox.rope import Rope, concat
 from pylox.token import TokenType
 
 
+def unary_op(operator: TokenType, right: object) -> object:
+    match (operator, right):
+        case (TokenType.MINUS, float() | int()):
+            return -(float(right))
+        case (TokenType.BANG, None):
+            return True
+        case (TokenType.BANG, bool()):
+            return not right
+        case (TokenType.BANG, _):
+            return False
+        case _:
+            return None
+
+
+def binary_op(operator: TokenType, left: object, right: object) -> object:
+    match (operator, left, right):
+        case (TokenType.MINUS, int() | float(), int() | float()):
+            return float(left) - float(right)
+        case (TokenType.SLASH, int() | float(), int() | float()):
+            return float(left) / float(right)
+        case (TokenType.STAR, int() | float(), int() | float()):
+            return float(left) * float(right)
+        case (TokenType.PLUS, int() | float(), int() | float()):
+            return float(left) + float(right)
+        case (TokenType.PLUS, str() | Rope(), str() | Rope()):
+            return concat(left, right)
+        case (TokenType.GREATER, int() | float(), int() | float()):
+            return float(left) > float(right)
+        case (TokenType.GREATER_EQUAL, int() | float(), int() | float()):
+            return float(left) >= float(right)
+        case (TokenType.LESS, int() | float(), int() | float()):
+            return float(left) < float(right)
+        case (TokenType.LESS_EQUAL, int() | float(), int() | float()):
+            return float(left) <= float(right)
+        case (TokenType.BANG_EQUAL, None, None):
+            return False
+        case (TokenType.BANG_EQUAL, _, _):
+            return left != right
+        case (TokenType.EQUAL_EQUAL, None, None):
+            return True
+        case (TokenType.EQUAL_EQUAL, _, _):
+            return left == right
+        case _:
+            return None
+
+
+# `globals` holds the initial values of global variables. Output goes to
+# `stdout`, a text stream or a Sink, or to whatever `sys.stdout` is when the
+# output is flushed if it is None. It is flushed when interpret() returns,
+# which it does with whether every statement ran; an error is written to the
+# output and stops the rest.
+# Statements are resolved before they run, and variables are then read
+# straight from the frame and slot the resolver picked. A resolver can be
+# passed in for statements that were already resolved.
 class Interpreter(expr.Visitor[object], stmt.Visitor[object]):
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+        resolver: Resolver | None = None,
+    ) -> None:
+        self.resolver: Resolver = Resolver() if resolver is None else resolver
+        self.slots: dict[int, tuple[int, int]] = self.resolver.slots
+        self.globals: GlobalTable = GlobalTable(
+            self.resolver.global_names, globals or {}
+        )
+        # Globals live in the table, so the outermost frame holds nothing.
+        self.frame: Frame = Frame(0)
+        self.stdout: TextIO | Sink | None = stdout
+        self.output: Sink = sink(stdout)
+
     def evaluate(self, expr: expr.Expr) -> object:
         return expr.accept(self)
 
     def execute(self, stmt: stmt.Stmt) -> None:
         _ = stmt.accept(self)
 
-    def interpret(self, statements: list[stmt.Stmt]) -> None:
+    def interpret(self, statements: Iterable[stmt.Stmt]) -> bool:
         try:
             for statement in statements:
+                self.resolver.resolve(statement)
                 self.execute(statement)
+                self.resolver.release()
         except Exception as e:
-            print(e)
+            self.output.write(e)
+            return False
+        finally:
+            self.resolver.release()
+            self.output.flush()
+        return True
 
     @override
     def visit_literal_expr(self, expr: expr.Literal) -> object:
@@ -30,52 +112,59 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[object]):
     @override
     def visit_unary_expr(self, expr: expr.Unary) -> object:
         right = self.evaluate(expr.right)
-        match (expr.operator.token_type, right):
-            case (TokenType.MINUS, float() | int()):
-                return -(float(right))
-            case (TokenType.BANG, None):
-                return True
-            case (TokenType.BANG, bool()):
-                return not right
-            case (TokenType.BANG, _):
-                return False
-            case _:
-                return None
+        return unary_op(expr.operator.token_type, right)
+
+    # Nodes evaluated without going through the resolver are globals.
+    def locate(self, node: expr.Variable | expr.Assign) -> tuple[int, int]:
+        location = self.slots.get(id(node))
+        if location is None:
+            return GLOBAL, self.globals.index(node.name.lexeme)
+        return location
+
+    def assign(self, node: expr.Assign, value: object) -> None:
+        depth, slot = self.locate(node)
+        if depth == GLOBAL:
+            self.globals.assign(slot, value)
+        else:
+            self.frame.ancestor(depth).values[slot] = value
+
+    def define(self, node: stmt.Var, value: object) -> None:
+        depth, slot = self.slots[id(node)]
+        if depth == GLOBAL:
+            self.globals.define(slot, value)
+        else:
+            self.frame.values[slot] = value
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> object:
+        value = self.evaluate(expr.value)
+        self.assign(expr, value)
+        return value
 
     @override
     def visit_binary_expr(self, expr: expr.Binary) -> object:
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
+        return binary_op(expr.operator.token_type, left, right)
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> object:
+        depth, slot = self.locate(expr)
+        if depth == GLOBAL:
+            return self.globals.get_at(slot)
+        if depth:
+            return self.frame.ancestor(depth).values[slot]
+        return self.frame.values[slot]
 
-        match (expr.operator.token_type, left, right):
-            case (TokenType.MINUS, int() | float(), int() | float()):
-                return float(left) - float(right)
-            case (TokenType.SLASH, int() | float(), int() | float()):
-                return float(left) / float(right)
-            case (TokenType.STAR, int() | float(), int() | float()):
-                return float(left) * float(right)
-            case (TokenType.PLUS, int() | float(), int() | float()):
-                return float(left) + float(right)
-            case (TokenType.PLUS, str(), str()):
-                return str(left) + str(right)
-            case (TokenType.GREATER, int() | float(), int() | float()):
-                return float(left) > float(right)
-            case (TokenType.GREATER_EQUAL, int() | float(), int() | float()):
-                return float(left) >= float(right)
-            case (TokenType.LESS, int() | float(), int() | float()):
-                return float(left) < float(right)
-            case (TokenType.LESS_EQUAL, int() | float(), int() | float()):
-                return float(left) <= float(right)
-            case (TokenType.BANG_EQUAL, None, None):
-                return False
-            case (TokenType.BANG_EQUAL, _, _):
-                return left != right
-            case (TokenType.EQUAL_EQUAL, None, None):
-                return True
-            case (TokenType.EQUAL_EQUAL, _, _):
-                return left == right
-            case _:
-                return None
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> None:
+        enclosing = self.frame
+        self.frame = Frame(self.resolver.frame_sizes[id(stmt)], enclosing)
+        try:
+            for statement in stmt.statements:
+                self.execute(statement)
+        finally:
+            self.frame = enclosing
 
     @override
     def visit_expression_stmt(self, stmt: stmt.Expression) -> None:
@@ -83,5 +172,9 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[object]):
 
     @override
     def visit_print_stmt(self, stmt: stmt.Print) -> None:
-        value = self.evaluate(stmt.expr)
-        print(str(value))
+        self.output.write(self.evaluate(stmt.expr))
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> None:
+        value = None if stmt.initializer is None else self.evaluate(stmt.initializer)
+        self.define(stmt, value)
@@ -0,0 +1,92 @@
+from typing import Any, override
+
+from pylox import expr, stmt
+from pylox.environment import Frame
+from pylox.interpreter import Interpreter, binary_op, unary_op
+
+# Continuation tags. A continuation is a `(tag, operand)` work item that runs
+# once the values it needs are on top of the value stack.
+UNARY = 0
+BINARY = 1
+ASSIGN = 2
+PRINT = 3
+POP = 4
+DEFINE = 5
+END_BLOCK = 6
+
+
+# Tree-walking interpreter that never recurses in Python. Nodes are taken off
+# an explicit work stack and either produce a value directly or push their
+# children followed by a continuation that combines the children's values.
+# Nesting depth is therefore limited by memory alone.
+class IterativeInterpreter(Interpreter):
+    @override
+    def evaluate(self, expr: expr.Expr) -> object:
+        return self.run(expr)
+
+    @override
+    def execute(self, stmt: stmt.Stmt) -> None:
+        _ = self.run(stmt)
+
+    def run(self, node: expr.Expr | stmt.Stmt) -> object:
+        # Nodes and continuations, popped from the end.
+        work: list[Any] = [node]
+        values: list[object] = []
+        push = values.append
+        pop = values.pop
+        frame = self.frame
+        try:
+            while work:
+                item = work.pop()
+                kind = type(item)
+                if kind is tuple:
+                    tag, operand = item
+                    if tag == BINARY:
+                        right = pop()
+                        values[-1] = binary_op(operand, values[-1], right)
+                    elif tag == UNARY:
+                        values[-1] = unary_op(operand, values[-1])
+                    elif tag == PRINT:
+                        self.output.write(pop())
+                    elif tag == POP:
+                        _ = pop()
+                    elif tag == ASSIGN:
+                        self.assign(operand, values[-1])
+                    elif tag == DEFINE:
+                        self.define(operand, pop())
+                    else:
+                        self.frame = operand
+                elif kind is expr.Binary:
+                    operator = item.operator.token_type
+                    work += ((BINARY, operator), item.right, item.left)
+                elif kind is expr.Literal:
+                    push(item.value)
+                elif kind is expr.Variable:
+                    push(self.visit_variable_expr(item))
+                elif kind is expr.Grouping:
+                    work.append(item.expr)
+                elif kind is expr.Unary:
+                    operator = item.operator.token_type
+                    work += ((UNARY, operator), item.right)
+                elif kind is expr.Assign:
+                    work += ((ASSIGN, item), item.value)
+                elif kind is stmt.Print:
+                    work += ((PRINT, None), item.expr)
+                elif kind is stmt.Expression:
+                    work += ((POP, None), item.expr)
+                elif kind is stmt.Var:
+                    if item.initializer is None:
+                        self.define(item, None)
+                    else:
+                        work += ((DEFINE, item), item.initializer)
+                elif kind is stmt.Block:
+                    work.append((END_BLOCK, self.frame))
+                    size = self.resolver.frame_sizes[id(item)]
+                    self.frame = Frame(size, self.frame)
+                    work += reversed(item.statements)
+                else:
+                    raise TypeError(f"Cannot interpret {kind.__name__}")
+        finally:
+            # Leave any blocks an error unwound out of.
+            self.frame = frame
+        return pop() if values else None
@@ -0,0 +1,159 @@
+def undefined_property(name: str) -> RuntimeError:
+    return RuntimeError(f"Undefined property '{name}'.")
+
+
+# Hidden class: the field layout shared by every instance that gained the
+# same fields in the same order. `slots` maps a field name to its index in
+# the instance's values. Shapes never change once made; adding a field moves
+# an instance to the next shape along a transition, and transitions are
+# cached, so instances built the same way end up sharing one shape. Each
+# class has its own root shape, so a shape also tells an instance's class.
+class Shape:
+    __slots__ = ("klass", "parent", "slots", "transitions")
+
+    def __init__(
+        self, klass: "LoxClass", parent: "Shape | None" = None, field: str | None = None
+    ) -> None:
+        self.klass: LoxClass = klass
+        self.parent: Shape | None = parent
+        self.slots: dict[str, int] = {} if parent is None else dict(parent.slots)
+        if field is not None:
+            self.slots[field] = len(self.slots)
+        self.transitions: dict[str, Shape] = {}
+
+    def add(self, field: str) -> "Shape":
+        shape = self.transitions.get(field)
+        if shape is None:
+            shape = self.transitions[field] = Shape(self.klass, self, field)
+        return shape
+
+    def __repr__(self) -> str:
+        return f"Shape({', '.join(self.slots)})"
+
+
+# Methods are whatever the engine calls with the receiver as first argument.
+# `version` changes whenever a method is defined or removed here or in a
+# superclass, which is what inline caches check to stay valid.
+class LoxClass:
+    __slots__ = ("methods", "name", "shape", "subclasses", "superclass", "version")
+
+    def __init__(
+        self,
+        name: str,
+        superclass: "LoxClass | None" = None,
+        methods: dict[str, object] | None = None,
+    ) -> None:
+        self.name: str = name
+        self.superclass: LoxClass | None = superclass
+        self.methods: dict[str, object] = {} if methods is None else methods
+        self.subclasses: list[LoxClass] = []
+        self.version: int = 0
+        if superclass is not None:
+            superclass.subclasses.append(self)
+        # Every instance starts out with this shape, so instances of one class
+        # share shapes with each other and never with another class's.
+        self.shape: Shape = Shape(self)
+
+    def find_method(self, name: str) -> object | None:
+        klass: LoxClass | None = self
+        while klass is not None:
+            method = klass.methods.get(name)
+            if method is not None:
+                return method
+            klass = klass.superclass
+        return None
+
+    def define_method(self, name: str, method: object) -> None:
+        self.methods[name] = method
+        self.invalidate()
+
+    def remove_method(self, name: str) -> None:
+        del self.methods[name]
+        self.invalidate()
+
+    # Subclasses inherit the change, so their versions move too.
+    def invalidate(self) -> None:
+        pending = [self]
+        while pending:
+            klass = pending.pop()
+            klass.version += 1
+            pending += klass.subclasses
+
+    def __str__(self) -> str:
+        return self.name
+
+
+# A method read off an instance, with the instance it was read from.
+class BoundMethod:
+    __slots__ = ("method", "receiver")
+
+    def __init__(self, receiver: "LoxInstance", method: object) -> None:
+        self.receiver: LoxInstance = receiver
+        self.method: object = method
+
+
+# An instance holds only its shape and a list of field values in slot
+# order, instead of a class reference and a dict per instance.
+class LoxInstance:
+    __slots__ = ("shape", "values")
+
+    def __init__(self, klass: LoxClass) -> None:
+        self.shape: Shape = klass.shape
+        self.values: list[object] = []
+
+    @property
+    def klass(self) -> LoxClass:
+        return self.shape.klass
+
+    def get(self, name: str) -> object:
+        slot = self.shape.slots.get(name)
+        if slot is None:
+            raise undefined_property(name)
+        return self.values[slot]
+
+    def set(self, name: str, value: object) -> None:
+        slot = self.shape.slots.get(name)
+        if slot is None:
+            self.shape = self.shape.add(name)
+            self.values.append(value)
+        else:
+            self.values[slot] = value
+
+    def __str__(self) -> str:
+        return f"{self.klass.name} instance"
+
+
+# Per-site cache for a field read or write, one per site: the last shape
+# seen there and the field's slot in it. A store that added the field also
+# remembers the shape it moved the instance to, so instances built by the
+# same code take the transition without looking anything up.
+class FieldCache:
+    __slots__ = ("added", "name", "shape", "slot")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.shape: Shape | None = None
+        self.slot: int = -1
+        self.added: Shape | None = None
+
+    def get(self, instance: LoxInstance) -> object:
+        if instance.shape is self.shape:
+            return instance.values[self.slot]
+        slot = instance.shape.slots.get(self.name)
+        if slot is None:
+            raise undefined_property(self.name)
+        self.shape, self.slot = instance.shape, slot
+        return instance.values[slot]
+
+    def set(self, instance: LoxInstance, value: object) -> None:
+        if instance.shape is self.shape:
+            if self.added is None:
+                instance.values[self.slot] = value
+            else:
+                instance.shape = self.added
+                instance.values.append(value)
+            return
+        before = instance.shape
+        instance.set(self.name, value)
+        self.shape, self.slot = before, instance.shape.slots[self.name]
+        self.added = None if instance.shape is before else instance.shape
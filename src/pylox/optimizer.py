@@ -0,0 +1,214 @@
+from typing import override
+
+from pylox import expr, stmt
+from pylox.expr import Assign, Binary, Literal, Unary
+from pylox.hashcons import children_of
+from pylox.interpreter import binary_op, unary_op
+from pylox.rope import flatten
+from pylox.stmt import Block, Expression, Print, Var
+from pylox.token import TokenType
+
+# Binary operators that always produce a float, or `nil` on a type mismatch.
+NUMERIC_BINARY: frozenset[TokenType] = frozenset(
+    {TokenType.MINUS, TokenType.STAR, TokenType.SLASH}
+)
+# Binary operators that always produce a bool.
+BOOLEAN_BINARY: frozenset[TokenType] = frozenset(
+    {TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL}
+)
+
+
+def is_number_or_nil(node: expr.Expr) -> bool:
+    match node:
+        case Literal(value):
+            return value is None or type(value) is float
+        case Binary(_, operator, _):
+            return operator.token_type in NUMERIC_BINARY
+        case Unary(operator, _):
+            return operator.token_type == TokenType.MINUS
+        case _:
+            return False
+
+
+def is_bool(node: expr.Expr) -> bool:
+    match node:
+        case Literal(value):
+            return type(value) is bool
+        case Binary(_, operator, _):
+            return operator.token_type in BOOLEAN_BINARY
+        case Unary(operator, _):
+            return operator.token_type == TokenType.BANG
+        case _:
+            return False
+
+
+def is_float(node: expr.Expr, value: float) -> bool:
+    return (
+        isinstance(node, Literal)
+        and type(node.value) is float
+        and (node.value == value)
+    )
+
+
+def children(node: expr.Expr | stmt.Stmt) -> tuple[expr.Expr | stmt.Stmt, ...]:
+    match node:
+        case Block(statements):
+            return statements
+        case Expression(value) | Print(value) | Var(_, value) if value is not None:
+            return (value,)
+        case expr.Expr():
+            return children_of(node)
+        case _:
+            return ()
+
+
+# Counts with an explicit stack, so it copes with whatever the parser does.
+def count_nodes(statements: list[stmt.Stmt]) -> int:
+    pending: list[expr.Expr | stmt.Stmt] = list(statements)
+    total = 0
+    while pending:
+        total += 1
+        pending += children(pending.pop())
+    return total
+
+
+# Level 1 folds constant operators, strips groupings and drops expression
+# statements that reduce to a bare literal. Level 2 adds algebraic identities
+# and double negations that are exact for every value the operand can have.
+#
+# Expressions are folded bottom-up from an explicit stack: each visit reads
+# its operands' results from `folded` rather than recursing, so nesting
+# depth is bounded by memory, as in the parser and resolver. Blocks still
+# recurse; a statement nested too deeply for that is left unoptimized.
+class Optimizer(expr.Visitor[expr.Expr], stmt.Visitor[stmt.Stmt | None]):
+    def __init__(self, level: int = 1) -> None:
+        self.level: int = level
+        # Folded nodes by id() of the original, for the expression being folded.
+        self.folded: dict[int, expr.Expr] = {}
+
+    def optimize(self, statements: list[stmt.Stmt]) -> list[stmt.Stmt]:
+        if self.level <= 0:
+            return statements
+        optimized: list[stmt.Stmt] = []
+        for statement in statements:
+            try:
+                result = statement.accept(self)
+            except RecursionError:
+                result = statement
+            if result is not None:
+                optimized.append(result)
+        return optimized
+
+    def fold(self, root: expr.Expr) -> expr.Expr:
+        folded = self.folded = {}
+        pending: list[tuple[expr.Expr, bool]] = [(root, False)]
+        while pending:
+            node, children_done = pending.pop()
+            if id(node) in folded:
+                continue
+            operands = children_of(node)
+            if operands and not children_done:
+                pending.append((node, True))
+                pending += ((operand, False) for operand in operands)
+                continue
+            folded[id(node)] = node.accept(self)
+        self.folded = {}
+        return folded[id(root)]
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> expr.Expr:
+        value = self.folded[id(expr.value)]
+        return expr if value is expr.value else Assign(expr.name, value)
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> expr.Expr:
+        return expr
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> expr.Expr:
+        return self.folded[id(expr.expr)]
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> expr.Expr:
+        right = self.folded[id(expr.right)]
+        token_type = expr.operator.token_type
+        if isinstance(right, Literal):
+            return Literal(unary_op(token_type, right.value))
+        if (
+            self.level >= 2
+            and isinstance(right, Unary)
+            and right.operator.token_type == token_type
+        ):
+            inner = right.right
+            if token_type == TokenType.MINUS and is_number_or_nil(inner):
+                return inner
+            if token_type == TokenType.BANG and is_bool(inner):
+                return inner
+        if right is expr.right:
+            return expr
+        return Unary(expr.operator, right)
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> expr.Expr:
+        left = self.folded[id(expr.left)]
+        right = self.folded[id(expr.right)]
+        token_type = expr.operator.token_type
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            try:
+                value = binary_op(token_type, left.value, right.value)
+                return Literal(flatten(value))
+            except ArithmeticError:
+                # Leave the failure to runtime so it is reported in order.
+                pass
+        if self.level >= 2:
+            match token_type:
+                case TokenType.STAR if is_float(right, 1.0) and is_number_or_nil(left):
+                    return left
+                case TokenType.STAR if is_float(left, 1.0) and is_number_or_nil(right):
+                    return right
+                case TokenType.SLASH if is_float(right, 1.0) and is_number_or_nil(left):
+                    return left
+                case TokenType.MINUS if is_float(right, 0.0) and is_number_or_nil(left):
+                    return left
+                case _:
+                    pass
+        if left is expr.left and right is expr.right:
+            return expr
+        return Binary(left, expr.operator, right)
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> expr.Expr:
+        return expr
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> stmt.Stmt | None:
+        statements = tuple(self.optimize(list(stmt.statements)))
+        if statements == stmt.statements:
+            return stmt
+        return Block(statements)
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> stmt.Stmt | None:
+        value = self.fold(stmt.expr)
+        if isinstance(value, Literal):
+            return None
+        return stmt if value is stmt.expr else Expression(value)
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> stmt.Stmt | None:
+        value = self.fold(stmt.expr)
+        return stmt if value is stmt.expr else Print(value)
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> stmt.Stmt | None:
+        if stmt.initializer is None:
+            return stmt
+        value = self.fold(stmt.initializer)
+        return stmt if value is stmt.initializer else Var(stmt.name, value)
+
+
+def optimize(
+    statements: list[stmt.Stmt], level: int = 1
+) -> tuple[list[stmt.Stmt], int]:
+    optimized = Optimizer(level).optimize(statements)
+    return optimized, count_nodes(statements) - count_nodes(optimized)
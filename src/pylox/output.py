@@ -0,0 +1,107 @@
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import TextIO, override
+
+# Values held before a sink writes them out on its own.
+BUFFER_LINES: int = 4096
+
+
+# Where `print` output goes. A sink holds on to the printed values themselves
+# and converts them all with one map(str) when it flushes, then writes one
+# string; per print that is a list append. Engines flush when a run ends,
+# and anyone reading the output while a script runs flushes first.
+class Sink(ABC):
+    def __init__(self, buffer_lines: int = BUFFER_LINES) -> None:
+        self.buffer_lines: int = buffer_lines
+        self.pending: list[object] = []
+
+    # One line of output: str(value) followed by a newline.
+    def write(self, value: object) -> None:
+        pending = self.pending
+        pending.append(value)
+        if len(pending) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending = self.pending
+        self.pending = []
+        self.emit("\n".join(map(str, pending)) + "\n")
+
+    @abstractmethod
+    def emit(self, text: str) -> None:
+        pass
+
+
+# Writes to a text stream, or to whatever `sys.stdout` is at flush time when
+# the stream is None, so redirect_stdout() still catches the output.
+class StreamSink(Sink):
+    def __init__(
+        self, stream: TextIO | None = None, buffer_lines: int = BUFFER_LINES
+    ) -> None:
+        super().__init__(buffer_lines)
+        self.stream: TextIO | None = stream
+
+    @override
+    def emit(self, text: str) -> None:
+        _ = (sys.stdout if self.stream is None else self.stream).write(text)
+
+
+# Keeps the output in memory, for embedding pylox in another program.
+class MemorySink(Sink):
+    def __init__(self, buffer_lines: int = BUFFER_LINES) -> None:
+        super().__init__(buffer_lines)
+        self.chunks: list[str] = []
+
+    @override
+    def emit(self, text: str) -> None:
+        self.chunks.append(text)
+
+    def getvalue(self) -> str:
+        self.flush()
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+
+# Encodes and writes straight to a file descriptor, skipping the text and
+# buffered layers of sys.stdout.
+class FdSink(Sink):
+    def __init__(
+        self,
+        fd: int,
+        encoding: str = "utf-8",
+        errors: str = "strict",
+        buffer_lines: int = BUFFER_LINES,
+    ) -> None:
+        super().__init__(buffer_lines)
+        self.fd: int = fd
+        self.encoding: str = encoding
+        self.errors: str = errors
+
+    @override
+    def emit(self, text: str) -> None:
+        data = memoryview(text.encode(self.encoding, self.errors))
+        while data:
+            data = data[os.write(self.fd, data) :]
+
+
+def sink(stdout: TextIO | Sink | None) -> Sink:
+    return stdout if isinstance(stdout, Sink) else StreamSink(stdout)
+
+
+# The fastest sink for the process's standard output: its file descriptor,
+# unless sys.stdout has been replaced or has none.
+def standard_output() -> Sink:
+    stdout = sys.stdout
+    if stdout is None or stdout is not sys.__stdout__:
+        return StreamSink()
+    try:
+        fd = stdout.fileno()
+    except (OSError, ValueError):
+        return StreamSink()
+    # Text already written through sys.stdout goes first.
+    stdout.flush()
+    return FdSink(fd, stdout.encoding, stdout.errors or "strict")
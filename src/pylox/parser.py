@@ -1,48 +1,203 @@
-from pylox.expr import Binary, Expr, Grouping, Literal, Unary
-from pylox.stmt import Expression, Print, Stmt
+from collections.abc import Iterator
+from typing import Protocol, override
+
+from pylox.expr import Expr, Variable
+from pylox.hashcons import NodeFactory
+from pylox.stmt import Block, Expression, Print, Stmt, Var
 from pylox.token import Token, TokenType
 
+# Assignment binds loosest and is right-associative, so it is handled apart
+# from the binary operators.
+ASSIGN_POWER: int = 1
+BINARY_POWERS: dict[TokenType, int] = {
+    TokenType.BANG_EQUAL: 2,
+    TokenType.EQUAL_EQUAL: 2,
+    TokenType.GREATER: 3,
+    TokenType.GREATER_EQUAL: 3,
+    TokenType.LESS: 3,
+    TokenType.LESS_EQUAL: 3,
+    TokenType.MINUS: 4,
+    TokenType.PLUS: 4,
+    TokenType.SLASH: 5,
+    TokenType.STAR: 5,
+}
+UNARY_POWER: int = 6
+
+
+class TokenSource(Protocol):
+    def __getitem__(self, index: int, /) -> Token: ...
+
+    def token_type(self, index: int, /) -> TokenType: ...
+
+    def literal(self, index: int, /) -> str | float | int | None: ...
+
+
+class TokenList(list[Token]):
+    def token_type(self, index: int) -> TokenType:
+        return self[index].token_type
 
+    def literal(self, index: int) -> str | float | int | None:
+        return self[index].literal
+
+
+# Expression nodes are built through `nodes`; pass an InterningFactory to
+# share identical subtrees.
 class Parser:
-    def __init__(self, tokens: list[Token]) -> None:
-        self.tokens: list[Token] = tokens
+    def __init__(
+        self, tokens: TokenSource | list[Token], nodes: NodeFactory | None = None
+    ) -> None:
+        self.tokens: TokenSource = (
+            TokenList(tokens) if isinstance(tokens, list) else tokens
+        )
         self.current: int = 0
+        self.nodes: NodeFactory = NodeFactory() if nodes is None else nodes
 
     @property
     def peek(self) -> Token:
         return self.tokens[self.current]
 
+    @property
+    def peek_type(self) -> TokenType:
+        return self.tokens.token_type(self.current)
+
     @property
     def is_at_end(self) -> bool:
-        return self.peek.token_type == TokenType.EOF
+        return self.peek_type == TokenType.EOF
 
-    def advance(self) -> Token:
+    def skip(self) -> None:
         if not self.is_at_end:
             self.current += 1
+
+    def advance(self) -> Token:
+        self.skip()
         return self.tokens[self.current - 1]
 
     def check(self, token_type: TokenType) -> bool:
         if self.is_at_end:
             return False
-        return self.peek.token_type == token_type
+        return self.peek_type == token_type
 
     def consume(self, token_type: TokenType, message: str) -> Token:
         if self.check(token_type):
             return self.advance()
         raise RuntimeError(message)
 
+    # Operator-precedence parsing with explicit operand and operator stacks, so
+    # nesting depth is bounded by memory rather than the Python call stack.
     def expression(self) -> Expr:
-        return self.equality()
+        operands: list[Expr] = []
+        # Pending operators with their binding power; open groupings use 0.
+        operators: list[tuple[int, Token]] = []
+        nodes = self.nodes
+
+        def reduce(power: int) -> None:
+            while operators and operators[-1][0] >= power:
+                binding_power, operator = operators.pop()
+                right = operands.pop()
+                if binding_power == UNARY_POWER:
+                    operands.append(nodes.unary(operator, right))
+                elif binding_power == ASSIGN_POWER:
+                    target = operands.pop()
+                    assert isinstance(target, Variable)
+                    operands.append(nodes.assign(target.name, right))
+                else:
+                    operands.append(nodes.binary(operands.pop(), operator, right))
+
+        token_type_at = self.tokens.token_type
+        binary_powers = BINARY_POWERS
+        while True:
+            # Operators are never EOF, so the cursor is advanced directly.
+            match token_type_at(self.current):
+                case TokenType.BANG | TokenType.MINUS:
+                    operators.append((UNARY_POWER, self.peek))
+                    self.current += 1
+                    continue
+                case TokenType.LEFT_PAREN:
+                    operators.append((0, self.peek))
+                    self.current += 1
+                    continue
+                case _:
+                    operands.append(self.primary())
+            while True:
+                token_type = token_type_at(self.current)
+                if (power := binary_powers.get(token_type)) is not None:
+                    reduce(power)
+                    operators.append((power, self.peek))
+                    self.current += 1
+                    break
+                if token_type == TokenType.EQUAL:
+                    # Leave pending assignments on the stack: `a = b = c`
+                    # assigns c to b first.
+                    reduce(ASSIGN_POWER + 1)
+                    if not isinstance(operands[-1], Variable):
+                        raise RuntimeError("Invalid assignment target.")
+                    operators.append((ASSIGN_POWER, self.peek))
+                    self.current += 1
+                    break
+                reduce(ASSIGN_POWER)
+                if operators and token_type == TokenType.RIGHT_PAREN:
+                    _ = operators.pop()
+                    operands.append(nodes.grouping(operands.pop()))
+                    self.current += 1
+                    continue
+                if operators:
+                    raise RuntimeError("Expected ')' after expression")
+                return operands.pop()
+
+    def declaration(self) -> Stmt:
+        match self.peek_type:
+            case TokenType.VAR:
+                self.skip()
+                return self.var_declaration()
+            case _:
+                return self.statement()
+
+    def var_declaration(self) -> Var:
+        name = self.consume(TokenType.IDENTIFIER, "Expect variable name.")
+        # The name is declared, though not yet defined, in the initializer.
+        self.nodes.new_scope()
+        initializer = None
+        if self.check(TokenType.EQUAL):
+            self.skip()
+            initializer = self.expression()
+        _ = self.consume(TokenType.SEMICOLON, "Expect `;` after variable declaration")
+        self.nodes.new_scope()
+        return Var(name, initializer)
 
     def statement(self) -> Stmt:
-        token = self.tokens[self.current]
-        match token.token_type:
+        match self.peek_type:
             case TokenType.PRINT:
-                _ = self.advance()
+                self.skip()
                 return self.print_statement()
+            case TokenType.LEFT_BRACE:
+                self.skip()
+                self.nodes.new_scope()
+                return Block(tuple(self.block()))
             case _:
                 return self.expression_statement()
 
+    # Directly nested blocks are kept on an explicit stack rather than parsed
+    # recursively, like the operators in expression().
+    def block(self) -> list[Stmt]:
+        open_blocks: list[list[Stmt]] = [[]]
+        while True:
+            match self.peek_type:
+                case TokenType.RIGHT_BRACE:
+                    self.skip()
+                    self.nodes.new_scope()
+                    statements = open_blocks.pop()
+                    if not open_blocks:
+                        return statements
+                    open_blocks[-1].append(Block(tuple(statements)))
+                case TokenType.LEFT_BRACE:
+                    self.skip()
+                    self.nodes.new_scope()
+                    open_blocks.append([])
+                case TokenType.EOF:
+                    raise RuntimeError("Expect '}' after block.")
+                case _:
+                    open_blocks[-1].append(self.declaration())
+
     def print_statement(self) -> Print:
         value = self.expression()
         _ = self.consume(TokenType.SEMICOLON, "Expect `;` after value")
@@ -53,16 +208,82 @@ class Parser:
         _ = self.consume(TokenType.SEMICOLON, "Expect `;` after expression")
         return Expression(expr)
 
+    def primary(self) -> Expr:
+        match self.peek_type:
+            case TokenType.FALSE:
+                self.skip()
+                return self.nodes.literal(False)
+            case TokenType.TRUE:
+                self.skip()
+                return self.nodes.literal(True)
+            case TokenType.NIL:
+                self.skip()
+                return self.nodes.literal(None)
+            case TokenType.NUMBER | TokenType.STRING:
+                literal_expr = self.nodes.literal(self.tokens.literal(self.current))
+                self.skip()
+                return literal_expr
+            case TokenType.IDENTIFIER:
+                return self.nodes.variable(self.advance())
+            case _:
+                raise RuntimeError("No token found")
+
+    def synchronize(self):
+        previous = self.tokens[self.current - 1]
+        token = self.tokens[self.current]
+        while not self.is_at_end:
+            match [previous.token_type, token.token_type]:
+                case [TokenType.SEMICOLON, _]:
+                    return
+                case [
+                    _,
+                    TokenType.CLASS
+                    | TokenType.FUN
+                    | TokenType.VAR
+                    | TokenType.FOR
+                    | TokenType.IF
+                    | TokenType.WHILE
+                    | TokenType.PRINT
+                    | TokenType.RETURN,
+                ]:
+                    return
+                case _:
+                    self.skip()
+
+    def statements(self) -> Iterator[Stmt]:
+        while not self.is_at_end:
+            yield self.declaration()
+
+    def parse(self) -> list[Stmt]:
+        return list(self.statements())
+
+
+# The original six-level recursive descent chain, kept as the reference the
+# precedence parser is tested and benchmarked against.
+class RecursiveDescentParser(Parser):
+    @override
+    def expression(self) -> Expr:
+        return self.assignment()
+
+    def assignment(self) -> Expr:
+        expr = self.equality()
+        if self.check(TokenType.EQUAL):
+            self.skip()
+            value = self.assignment()
+            if not isinstance(expr, Variable):
+                raise RuntimeError("Invalid assignment target.")
+            return self.nodes.assign(expr.name, value)
+        return expr
+
     def equality(self) -> Expr:
         expr = self.comparison()
         while True:
-            token = self.tokens[self.current]
-            match token.token_type:
+            match self.peek_type:
                 case TokenType.BANG_EQUAL | TokenType.EQUAL_EQUAL:
-                    operator = token
-                    _ = self.advance()
+                    operator = self.peek
+                    self.skip()
                     right = self.comparison()
-                    expr = Binary(expr, operator, right)
+                    expr = self.nodes.binary(expr, operator, right)
                 case _:
                     break
         return expr
@@ -71,18 +292,17 @@ class Parser:
         expr = self.term()
 
         while True:
-            token = self.tokens[self.current]
-            match token.token_type:
+            match self.peek_type:
                 case (
                     TokenType.GREATER
                     | TokenType.GREATER_EQUAL
                     | TokenType.LESS
                     | TokenType.LESS_EQUAL
                 ):
-                    operator = token
-                    _ = self.advance()
+                    operator = self.peek
+                    self.skip()
                     right = self.term()
-                    expr = Binary(expr, operator, right)
+                    expr = self.nodes.binary(expr, operator, right)
                 case _:
                     break
         return expr
@@ -91,13 +311,12 @@ class Parser:
         expr = self.factor()
 
         while True:
-            token = self.tokens[self.current]
-            match token.token_type:
+            match self.peek_type:
                 case TokenType.MINUS | TokenType.PLUS:
-                    operator = token
-                    _ = self.advance()
+                    operator = self.peek
+                    self.skip()
                     right = self.factor()
-                    expr = Binary(expr, operator, right)
+                    expr = self.nodes.binary(expr, operator, right)
                 case _:
                     break
         return expr
@@ -106,76 +325,31 @@ class Parser:
         expr = self.unary()
 
         while True:
-            token = self.tokens[self.current]
-            match token.token_type:
+            match self.peek_type:
                 case TokenType.SLASH | TokenType.STAR:
-                    operator = token
-                    _ = self.advance()
+                    operator = self.peek
+                    self.skip()
                     right = self.unary()
-                    expr = Binary(expr, operator, right)
+                    expr = self.nodes.binary(expr, operator, right)
                 case _:
                     break
         return expr
 
     def unary(self) -> Expr:
-        token = self.tokens[self.current]
-        match token.token_type:
+        match self.peek_type:
             case TokenType.BANG | TokenType.MINUS:
-                operator = token
-                _ = self.advance()
+                operator = self.peek
+                self.skip()
                 right = self.unary()
-                return Unary(operator, right)
+                return self.nodes.unary(operator, right)
             case _:
                 return self.primary()
 
+    @override
     def primary(self) -> Expr:
-        token: Token = self.tokens[self.current]
-        match token.token_type:
-            case TokenType.FALSE:
-                _ = self.advance()
-                return Literal(False)
-            case TokenType.TRUE:
-                _ = self.advance()
-                return Literal(True)
-            case TokenType.NIL:
-                _ = self.advance()
-                return Literal(None)
-            case TokenType.NUMBER | TokenType.STRING:
-                literal_expr = Literal(token.literal)
-                _ = self.advance()
-                return literal_expr
-            case TokenType.LEFT_PAREN:
-                _ = self.advance()
-                expr = self.expression()
-                _ = self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression")
-                return Grouping(expr)
-            case _:
-                raise RuntimeError("No token found")
-
-    def synchronize(self):
-        previous = self.tokens[self.current - 1]
-        token = self.tokens[self.current]
-        while not self.is_at_end:
-            match [previous.token_type, token.token_type]:
-                case [TokenType.SEMICOLON, _]:
-                    return
-                case [
-                    _,
-                    TokenType.CLASS
-                    | TokenType.FUN
-                    | TokenType.VAR
-                    | TokenType.FOR
-                    | TokenType.IF
-                    | TokenType.WHILE
-                    | TokenType.PRINT
-                    | TokenType.RETURN,
-                ]:
-                    return
-                case _:
-                    _ = self.advance()
-
-    def parse(self) -> list[Stmt]:
-        statements: list[Stmt] = []
-        while not self.is_at_end:
-            statements.append(self.statement())
-        return statements
+        if self.peek_type == TokenType.LEFT_PAREN:
+            self.skip()
+            expr = self.expression()
+            _ = self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression")
+            return self.nodes.grouping(expr)
+        return super().primary()
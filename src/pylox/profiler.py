@@ -0,0 +1,148 @@
+from collections import defaultdict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, TextIO, override
+
+from pylox import expr, stmt
+from pylox.caches import LIVE_CACHES, InlineCache
+from pylox.interpreter import Interpreter
+from pylox.output import Sink
+from pylox.token import TokenType
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+OPERATOR_NODES = (expr.Binary, expr.Unary)
+
+
+@dataclass(slots=True)
+class Stats:
+    count: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+
+    def add(self, total: float, self_time: float) -> None:
+        self.count += 1
+        self.total += total
+        self.self_time += self_time
+
+
+# Literals and groupings carry no token, so a statement is attributed to the
+# line of its first operator or variable, and operands to the line of their
+# operator. A block is attributed to its first statement with a line.
+def first_line(node: expr.Expr | stmt.Stmt) -> int | None:
+    pending: list[expr.Expr | stmt.Stmt] = [node]
+    while pending:
+        match pending.pop():
+            case expr.Binary(operator=operator) | expr.Unary(operator=operator):
+                return operator.line
+            case expr.Variable(name) | expr.Assign(name) | stmt.Var(name):
+                return name.line
+            case expr.Grouping(inner) | stmt.Print(inner) | stmt.Expression(inner):
+                pending.append(inner)
+            case stmt.Block(statements):
+                pending += reversed(statements)
+            case _:
+                pass
+    return None
+
+
+def stats_table[K](title: str, stats: Mapping[K, Stats]) -> "Table":
+    from rich.table import Table
+
+    table = Table(title=title)
+    table.add_column(title)
+    table.add_column("Count", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Self ms", justify="right")
+    for key, entry in sorted(stats.items(), key=lambda item: -item[1].self_time):
+        table.add_row(
+            str(key),
+            str(entry.count),
+            f"{entry.total * 1000:.3f}",
+            f"{entry.self_time * 1000:.3f}",
+        )
+    return table
+
+
+def cache_table(caches: list[InlineCache]) -> "Table":
+    from rich.table import Table
+
+    table = Table(title="Inline caches")
+    table.add_column("Site")
+    table.add_column("State")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit rate", justify="right")
+    for cache in sorted(caches, key=lambda cache: -cache.misses):
+        lookups = cache.hits + cache.misses
+        table.add_row(
+            cache.site,
+            cache.state,
+            str(cache.hits),
+            str(cache.misses),
+            f"{cache.hits / lookups:.1%}" if lookups else "-",
+        )
+    return table
+
+
+# Interpreter that counts and times every node it visits, by node type,
+# operator and source line. Only evaluate and execute are overridden, so the
+# plain Interpreter keeps its hook-free accept path.
+class ProfilingInterpreter(Interpreter):
+    def __init__(
+        self,
+        globals: dict[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> None:
+        super().__init__(globals, stdout)
+        self.node_types: defaultdict[str, Stats] = defaultdict(Stats)
+        self.operators: defaultdict[TokenType, Stats] = defaultdict(Stats)
+        self.lines: defaultdict[int | None, Stats] = defaultdict(Stats)
+        self.line: int | None = None
+        # Time spent in the children of the node currently being visited.
+        self.children: float = 0.0
+
+    def record[N: (expr.Expr, stmt.Stmt)](
+        self, node: N, visit: Callable[[N], object]
+    ) -> object:
+        outer_children, self.children = self.children, 0.0
+        start = perf_counter()
+        try:
+            return visit(node)
+        finally:
+            elapsed = perf_counter() - start
+            self_time = elapsed - self.children
+            self.children = outer_children + elapsed
+            self.node_types[type(node).__name__].add(elapsed, self_time)
+            self.lines[self.line].add(elapsed, self_time)
+            if isinstance(node, OPERATOR_NODES):
+                self.operators[node.operator.token_type].add(elapsed, self_time)
+
+    @override
+    def evaluate(self, expr: expr.Expr) -> object:
+        outer_line = self.line
+        if isinstance(expr, OPERATOR_NODES):
+            self.line = expr.operator.line
+        try:
+            return self.record(expr, super().evaluate)
+        finally:
+            self.line = outer_line
+
+    @override
+    def execute(self, stmt: stmt.Stmt) -> None:
+        self.line = first_line(stmt)
+        _ = self.record(stmt, super().execute)
+
+    # Inline caches are reported when there are any in use.
+    def tables(self) -> list["Table"]:
+        caches = list(LIVE_CACHES)
+        return [
+            stats_table("Node type", self.node_types),
+            stats_table("Operator", {op.name: s for op, s in self.operators.items()}),
+            stats_table(
+                "Line",
+                {"?" if line is None else line: s for line, s in self.lines.items()},
+            ),
+        ] + ([cache_table(caches)] if caches else [])
@@ -0,0 +1,56 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TextIO
+
+from pylox.interpreter import Interpreter
+from pylox.optimizer import Optimizer
+from pylox.output import Sink
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+
+
+# A parsed, optimized and resolved script that can be run any number of
+# times. The statements are immutable, the resolver is only read once
+# compile() returns, and each run gets its own Interpreter, so runs share no
+# mutable state and may happen on several threads at once.
+@dataclass(frozen=True, slots=True)
+class Program:
+    statements: tuple[Stmt, ...]
+    resolver: Resolver
+
+    # A fresh interpreter for one run. Only names the program refers to are
+    # copied in, so a run never adds a name to the shared resolver.
+    def bind(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> Interpreter:
+        names = self.resolver.global_names
+        bound = {
+            name: value for name, value in (globals or {}).items() if name in names
+        }
+        return Interpreter(bound, stdout, self.resolver)
+
+    # Unlike Interpreter.interpret, errors propagate to the caller.
+    def run(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> None:
+        interpreter = self.bind(globals, stdout)
+        try:
+            for statement in self.statements:
+                interpreter.execute(statement)
+        finally:
+            interpreter.output.flush()
+
+
+def compile(source: str, opt_level: int = 1) -> Program:
+    statements = Parser(RegexScanner(source).scan_buffer()).parse()
+    optimized = tuple(Optimizer(opt_level).optimize(statements))
+    resolver = Resolver()
+    for statement in optimized:
+        resolver.resolve(statement)
+    return Program(optimized, resolver)
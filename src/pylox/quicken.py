@@ -0,0 +1,170 @@
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, TextIO, override
+
+from pylox import expr
+from pylox.closures import FLOAT_OPERATIONS
+from pylox.interpreter import Interpreter, binary_op, unary_op
+from pylox.output import Sink
+from pylox.rope import Rope, concat
+from pylox.token import TokenType
+
+# A site is specialized after seeing the same operand types this many times
+# in a row, and left generic for good after this many failed guesses.
+QUICKEN_AFTER: int = 2
+MAX_DEOPTIMIZATIONS: int = 4
+
+
+# binary_op treats bools as numbers, converting both operands to float.
+def numeric(operation: Callable[[float, float], object]) -> Callable[..., object]:
+    return lambda left, right: operation(float(left), float(right))
+
+
+# Handlers that agree with binary_op/unary_op for exactly these operand types.
+BINARY_HANDLERS: dict[tuple[TokenType, type, type], Callable[[Any, Any], object]] = {
+    **{
+        (token_type, float, float): operation
+        for token_type, operation in FLOAT_OPERATIONS.items()
+    },
+    (TokenType.EQUAL_EQUAL, float, float): operator.eq,
+    (TokenType.BANG_EQUAL, float, float): operator.ne,
+    **{
+        (token_type, left_type, right_type): numeric(operation)
+        for token_type, operation in FLOAT_OPERATIONS.items()
+        for left_type, right_type in ((bool, float), (float, bool), (bool, bool))
+    },
+    **{
+        (TokenType.PLUS, left_type, right_type): concat
+        for left_type in (str, Rope)
+        for right_type in (str, Rope)
+    },
+    (TokenType.EQUAL_EQUAL, str, str): operator.eq,
+    (TokenType.BANG_EQUAL, str, str): operator.ne,
+}
+UNARY_HANDLERS: dict[tuple[TokenType, type], Callable[[Any], object]] = {
+    (TokenType.MINUS, float): operator.neg,
+    (TokenType.BANG, bool): operator.not_,
+}
+
+
+# Equality is Python equality for every pair of operand types.
+EQUALITY_HANDLERS: dict[TokenType, Callable[[Any, Any], object]] = {
+    TokenType.EQUAL_EQUAL: operator.eq,
+    TokenType.BANG_EQUAL: operator.ne,
+}
+
+
+# Warm-up state of a node that is not running a specialized handler.
+# The operator and operand types of one evaluation of a site: one operand
+# type for a Unary site, two for a Binary one.
+type SiteKey = tuple[TokenType, type] | tuple[TokenType, type, type]
+
+
+@dataclass(slots=True)
+class Site:
+    key: SiteKey | None = None
+    streak: int = 0
+    deoptimizations: int = 0
+    generic: bool = False
+
+
+# Specialized entry: the node itself (guarding against a recycled id() of a
+# freed node), the operand types the handler was chosen for, and the handler.
+type Quickened = tuple[expr.Expr, type, type | None, Callable[..., object]]
+
+
+# Tree-walking interpreter that rewrites each Binary and Unary site to a
+# handler for the operand types it keeps seeing, and falls back to the
+# generic binary_op/unary_op when a guess turns out wrong. Sites live as long
+# as the interpreter, so re-running the same statements (a REPL session, a
+# benchmark loop) runs the specialized handlers.
+class SpecializingInterpreter(Interpreter):
+    def __init__(
+        self,
+        globals: dict[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> None:
+        super().__init__(globals, stdout)
+        self.quickened: dict[int, Quickened] = {}
+        self.sites: dict[int, tuple[expr.Expr, Site]] = {}
+        self.specializations: int = 0
+        self.deoptimizations: int = 0
+
+    # Slow path, for sites without a handler or whose guard just failed.
+    def observe(
+        self,
+        node: expr.Expr,
+        key: SiteKey,
+        handlers: dict[Any, Callable[..., object]],
+    ) -> None:
+        entry = self.sites.get(id(node))
+        if entry is None or entry[0] is not node:
+            entry = self.sites[id(node)] = (node, Site())
+        site = entry[1]
+        quickened = self.quickened.get(id(node))
+        if quickened is not None and quickened[0] is node:
+            del self.quickened[id(node)]
+            site.deoptimizations += 1
+            self.deoptimizations += 1
+            site.generic = site.deoptimizations >= MAX_DEOPTIMIZATIONS
+            site.streak = 0
+        if site.generic:
+            return
+        if site.key == key:
+            site.streak += 1
+        else:
+            site.key, site.streak = key, 1
+        if site.streak < QUICKEN_AFTER:
+            return
+        handler = handlers.get(key) or EQUALITY_HANDLERS.get(key[0])
+        if handler is None:
+            # No fast path for these types, but a stable site still skips the
+            # warm-up bookkeeping by binding the generic operation.
+            generic = binary_op if len(key) == 3 else unary_op
+            handler = partial(generic, key[0])
+        else:
+            self.specializations += 1
+        right_type = key[2] if len(key) == 3 else None
+        self.quickened[id(node)] = (node, key[1], right_type, handler)
+
+    def counters(self) -> dict[str, int]:
+        return {
+            "sites": len(self.sites),
+            "specialized": sum(
+                not isinstance(handler, partial)
+                for _, _, _, handler in self.quickened.values()
+            ),
+            "generic": sum(site.generic for _, site in self.sites.values()),
+            "specializations": self.specializations,
+            "deoptimizations": self.deoptimizations,
+        }
+
+    # Operands are visited through accept() directly: this class replaces the
+    # evaluate() hook rather than extending it.
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> object:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        entry = self.quickened.get(id(expr))
+        if (
+            entry is not None
+            and entry[0] is expr
+            and type(left) is entry[1]
+            and type(right) is entry[2]
+        ):
+            return entry[3](left, right)
+        token_type = expr.operator.token_type
+        self.observe(expr, (token_type, type(left), type(right)), BINARY_HANDLERS)
+        return binary_op(token_type, left, right)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> object:
+        right = expr.right.accept(self)
+        entry = self.quickened.get(id(expr))
+        if entry is not None and entry[0] is expr and type(right) is entry[1]:
+            return entry[3](right)
+        token_type = expr.operator.token_type
+        self.observe(expr, (token_type, type(right)), UNARY_HANDLERS)
+        return unary_op(token_type, right)
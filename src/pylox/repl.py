@@ -0,0 +1,78 @@
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from configparser import ParsingError
+from typing import TextIO
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Stmt
+
+DEFAULT_CACHE_SIZE: int = 1024
+# A line whose first token is the `exit` keyword.
+EXIT_PATTERN: re.Pattern[str] = re.compile(r"\s*exit(?![A-Za-z_])")
+
+
+# One interpreter for the whole REPL, so anything a line defines is still
+# there for the next one. Parsed lines are cached by their text, which makes
+# re-entering a line (or replaying a history) skip scanning and parsing.
+class ReplSession:
+    def __init__(
+        self,
+        interpreter: Interpreter | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.interpreter: Interpreter = interpreter or Interpreter()
+        self.cache_size: int = cache_size
+        self.parsed: dict[str, list[Stmt]] = {}
+
+    def parse(self, line: str) -> list[Stmt]:
+        statements = self.parsed.pop(line, None)
+        if statements is None:
+            statements = Parser(RegexScanner(line).scan_buffer()).parse()
+            if len(self.parsed) >= self.cache_size:
+                # Dicts keep insertion order, and hits are re-inserted below,
+                # so the first key is the least recently used line.
+                del self.parsed[next(iter(self.parsed))]
+        self.parsed[line] = statements
+        return statements
+
+    def load(self, statements: Iterable[Stmt]) -> None:
+        _ = self.interpreter.interpret(statements)
+
+    def run(self, line: str) -> list[Stmt]:
+        statements = self.parse(line)
+        _ = self.interpreter.interpret(statements)
+        return statements
+
+
+def is_exit(line: str) -> bool:
+    return EXIT_PATTERN.match(line) is not None
+
+
+def read_lines(stdin: TextIO, prompt: str) -> Iterator[str]:
+    while True:
+        if prompt:
+            print(prompt, end="", flush=True)
+        line = stdin.readline()
+        if not line:
+            return
+        yield line.rstrip("\n")
+
+
+# Plain text driver: no prompt decoration or panels, just each line's output,
+# so it can sit behind a pipe.
+def run_plain(session: ReplSession, stdin: TextIO) -> None:
+    prompt = ">> " if stdin.isatty() else ""
+    for line in read_lines(stdin, prompt):
+        if not line.strip():
+            continue
+        if is_exit(line):
+            return
+        # Scan errors are ParsingErrors, not RuntimeErrors; neither ends the
+        # session.
+        try:
+            _ = session.run(line)
+        except (RuntimeError, ParsingError) as e:
+            print(e, file=sys.stderr)
@@ -0,0 +1,137 @@
+from collections.abc import Callable
+from functools import partial
+from typing import override
+
+from pylox import expr, stmt
+
+# Depth recorded for variables that live in the global table.
+GLOBAL: int = -1
+
+
+# Static pass run before execution that works out where every variable lives.
+# Each Variable, Assign and Var node is mapped, by id(), to a (depth, slot)
+# pair: how many blocks out its frame is and its index in that frame, or
+# (GLOBAL, index) for the global table. Blocks get the size of their frame.
+#
+# Visitors never recurse: they push child nodes, and the steps to run once
+# the children are resolved, onto `pending`, which resolve() drains. Nesting
+# depth is therefore bounded by memory, not the Python stack.
+class Resolver(expr.Visitor[None], stmt.Visitor[None]):
+    def __init__(self) -> None:
+        self.slots: dict[int, tuple[int, int]] = {}
+        self.frame_sizes: dict[int, int] = {}
+        self.global_names: dict[str, int] = {}
+        # Innermost block last, mapping each declared name to its slot.
+        self.scopes: list[dict[str, int]] = []
+        # The local whose initializer is being resolved. Initializers never
+        # open a block, so it is always declared in the innermost scope.
+        self.initializing: str | None = None
+        self.pending: list[expr.Expr | stmt.Stmt | Callable[[], None]] = []
+
+    def resolve(self, node: expr.Expr | stmt.Stmt) -> None:
+        pending = self.pending
+        pending.append(node)
+        try:
+            while pending:
+                item = pending.pop()
+                if isinstance(item, expr.Expr | stmt.Stmt):
+                    item.accept(self)
+                else:
+                    item()
+        finally:
+            # After an error, drop the rest of the walk and the scopes it
+            # opened.
+            pending.clear()
+            self.scopes.clear()
+            self.initializing = None
+
+    # Forgets everything resolved so far. Engines call it once what they
+    # resolved has run or been compiled, so the tables do not grow with a
+    # streamed script, and a node reusing the id of a freed one is never
+    # taken for it.
+    def release(self) -> None:
+        self.slots.clear()
+        self.frame_sizes.clear()
+
+    def global_index(self, name: str) -> int:
+        index = self.global_names.get(name)
+        if index is None:
+            index = self.global_names[name] = len(self.global_names)
+        return index
+
+    def resolve_local(self, node: expr.Variable | expr.Assign) -> None:
+        name = node.name.lexeme
+        for depth, scope in enumerate(reversed(self.scopes)):
+            slot = scope.get(name)
+            if slot is not None:
+                self.slots[id(node)] = (depth, slot)
+                return
+        self.slots[id(node)] = (GLOBAL, self.global_index(name))
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> None:
+        self.pending.append(expr.value)
+        self.resolve_local(expr)
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> None:
+        self.pending += (expr.right, expr.left)
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> None:
+        self.pending.append(expr.expr)
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> None:
+        pass
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> None:
+        self.pending.append(expr.right)
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> None:
+        if expr.name.lexeme == self.initializing:
+            raise RuntimeError("Can't read local variable in its own initializer.")
+        self.resolve_local(expr)
+
+    def end_block(self, block: stmt.Block) -> None:
+        self.frame_sizes[id(block)] = len(self.scopes.pop())
+
+    def define(self, var: stmt.Var, slot: int) -> None:
+        self.initializing = None
+        self.slots[id(var)] = (0, slot)
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> None:
+        self.scopes.append({})
+        self.pending.append(partial(self.end_block, stmt))
+        self.pending += reversed(stmt.statements)
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> None:
+        self.pending.append(stmt.expr)
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> None:
+        self.pending.append(stmt.expr)
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> None:
+        name = stmt.name.lexeme
+        if not self.scopes:
+            self.slots[id(stmt)] = (GLOBAL, self.global_index(name))
+            if stmt.initializer is not None:
+                self.pending.append(stmt.initializer)
+            return
+        scope = self.scopes[-1]
+        if name in scope:
+            raise RuntimeError("Already a variable with this name in this scope.")
+        # Slots are handed out in declaration order, so the slot is fixed
+        # before the initializer is resolved, and an assignment to the name
+        # inside it resolves to that slot.
+        slot = scope[name] = len(scope)
+        self.initializing = name
+        self.pending.append(partial(self.define, stmt, slot))
+        if stmt.initializer is not None:
+            self.pending.append(stmt.initializer)
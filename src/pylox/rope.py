@@ -0,0 +1,78 @@
+import sys
+from itertools import islice
+
+# Concatenations up to this many characters produce a plain str: copying a
+# short string is cheaper than keeping a rope around.
+FLAT_LIMIT: int = 256
+# Source strings and identifiers up to this long are interned, so repeated
+# names and literals share one object and compare by identity first.
+INTERN_LIMIT: int = 64
+
+
+def intern(text: str) -> str:
+    return sys.intern(text) if len(text) <= INTERN_LIMIT else text
+
+
+# A Lox string built by concatenation. The pieces live in a list shared by
+# every rope built from the same chain of appends; each rope sees the first
+# `count` of them. Appending to the rope that ends the list extends it in
+# place, so building a string with `s = s + piece` in a loop takes linear
+# time. The text is joined once, when the value is printed, compared or
+# hashed, and kept for later uses.
+class Rope:
+    __slots__ = ("count", "flat", "length", "parts")
+
+    def __init__(self, parts: list[str], count: int, length: int) -> None:
+        self.parts: list[str] = parts
+        self.count: int = count
+        self.length: int = length
+        self.flat: str | None = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __str__(self) -> str:
+        if self.flat is None:
+            self.flat = "".join(islice(self.parts, self.count))
+        return self.flat
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, str | Rope):
+            return NotImplemented
+        return len(self) == len(other) and str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def pieces(self) -> list[str]:
+        return self.parts[: self.count]
+
+
+type LoxString = str | Rope
+
+
+def concat(left: LoxString, right: LoxString) -> LoxString:
+    length = len(left) + len(right)
+    if length <= FLAT_LIMIT:
+        return str(left) + str(right)
+    if isinstance(left, Rope):
+        parts = left.parts
+        if left.count != len(parts):
+            # Another rope already appended to this list; branch off a copy.
+            parts = left.pieces()
+    else:
+        parts = [left]
+    if isinstance(right, Rope):
+        parts.extend(islice(right.parts, right.count))
+    else:
+        parts.append(right)
+    return Rope(parts, len(parts), length)
+
+
+# Values stored outside the interpreter (folded literals, cache entries) are
+# plain strs.
+def flatten(value: object) -> object:
+    return str(value) if isinstance(value, Rope) else value
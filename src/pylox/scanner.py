@@ -1,6 +1,10 @@
+import re
+from collections.abc import Iterable, Iterator
 from configparser import ParsingError
 from typing import Any
-from pylox.token import Token, TokenType
+
+from pylox.rope import intern
+from pylox.token import Token, TokenBuffer, TokenType
 
 KEYWORDS: dict[str, TokenType] = {
     "and": TokenType.AND,
@@ -22,6 +26,44 @@ KEYWORDS: dict[str, TokenType] = {
     "exit": TokenType.EXIT,
 }
 
+PUNCTUATION: dict[str, TokenType] = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
+# ASCII-only master pattern. Anything it leaves to `other` (non-ASCII
+# identifiers and numerals, unterminated strings, unexpected characters) is
+# handed to `Scanner.scan_token`, so both scanners agree on every input.
+TOKEN_PATTERN: re.Pattern[str] = re.compile(
+    r"""
+    (?P<whitespace>[ \t\r\n]+)
+    | (?P<comment>//[^\n]*)
+    | (?P<identifier>[A-Za-z_]+)
+    | (?P<punctuation>[!=<>]=?|[(){},.\-+;*/])
+    | (?P<number>[0-9]+(?:\.[0-9]+)?)
+    | (?P<string>"[^"]*")
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
 
 class Scanner:
     def __init__(self, source: str) -> None:
@@ -41,7 +83,7 @@ class Scanner:
         return self.current >= len(self.source)
 
     def add_token(self, token_type: TokenType, literal: Any | None = None) -> None:
-        text: str = self.source[self.start : self.current]
+        text: str = intern(self.source[self.start : self.current])
         self.tokens.append(
             Token(token_type=token_type, lexeme=text, literal=literal, line=self.line)
         )
@@ -62,19 +104,19 @@ class Scanner:
 
     @property
     def next_next(self) -> str:
-        if self.current + 1 > len(self.source):
+        if self.current + 1 >= len(self.source):
             return "\0"
         return self.source[self.current + 1]
 
     def string(self) -> None:
         while self.next != '"' and not self.is_at_end:
-            if self.next_is("\n"):
+            if self.next == "\n":
                 self.line += 1
             _ = next(self)
         if self.is_at_end:
             raise ParsingError("Unterminated string")
         _ = next(self)
-        literal = self.source[self.start + 1 : self.current - 1]
+        literal = intern(self.source[self.start + 1 : self.current - 1])
         self.add_token(token_type=TokenType.STRING, literal=literal)
 
     def number(self) -> None:
@@ -160,3 +202,124 @@ class Scanner:
             Token(token_type=TokenType.EOF, lexeme="", literal=None, line=self.line)
         )
         return self.tokens
+
+
+class RegexScanner:
+    def __init__(self, source: str = "") -> None:
+        self.source: str = source
+        self.tokens: list[Token] = []
+        self.position: int = 0
+        self.line: int = 1
+
+    def scan_fallback(self, start: int, final: bool) -> list[Token] | None:
+        if not final and self.source[start] == '"':
+            # The string may be closed by input that has not arrived yet.
+            return None
+        scanner = Scanner(self.source)
+        scanner.start = scanner.current = start
+        scanner.line = self.line
+        scanner.scan_token()
+        if not final and scanner.current >= len(self.source):
+            return None
+        self.line = scanner.line
+        self.position = scanner.current
+        return scanner.tokens
+
+    # Yields `(token_type, start, end, line)` for every token of `self.source`
+    # from `self.position` on. Unless `final`, a token touching the end of the
+    # source may still grow, so scanning stops in front of it and
+    # `self.position` marks where to resume.
+    def scan_spans(
+        self, final: bool = True
+    ) -> Iterator[tuple[TokenType, int, int, int]]:
+        source = self.source
+        length = len(source)
+        keywords = KEYWORDS
+        punctuation = PUNCTUATION
+        position = self.position
+        line = self.line
+        # A match ending at `horizon` may continue in the next chunk.
+        horizon = -1 if final else length
+        while position < length:
+            for match in TOKEN_PATTERN.finditer(source, position):
+                kind = match.lastgroup
+                end = match.end()
+                if end == horizon:
+                    self.position, self.line = position, line
+                    return
+                if kind == "whitespace":
+                    line += source.count("\n", position, end)
+                elif kind == "identifier":
+                    if end < length and source[end] >= "\x80":
+                        break
+                    token_type = keywords.get(match.group(), TokenType.IDENTIFIER)
+                    yield token_type, position, end, line
+                elif kind == "punctuation":
+                    yield punctuation[match.group()], position, end, line
+                elif kind == "number":
+                    if end < length and source[end] >= "\x80":
+                        break
+                    if end + 1 < length and source[end] == ".":
+                        if source[end + 1] >= "\x80":
+                            break
+                    elif end + 1 == horizon:
+                        self.position, self.line = position, line
+                        return
+                    yield TokenType.NUMBER, position, end, line
+                elif kind == "string":
+                    line += source.count("\n", position, end)
+                    yield TokenType.STRING, position, end, line
+                elif kind == "comment":
+                    pass
+                else:
+                    break
+                position = end
+            else:
+                break
+            self.line = line
+            tokens = self.scan_fallback(position, final)
+            if tokens is None:
+                self.position = position
+                return
+            for token in tokens:
+                yield token.token_type, position, self.position, token.line
+            position = self.position
+            line = self.line
+        self.position, self.line = position, line
+
+    def scan(self, final: bool = True) -> Iterator[Token]:
+        source = self.source
+        for token_type, start, end, line in self.scan_spans(final):
+            text = intern(source[start:end])
+            match token_type:
+                case TokenType.NUMBER:
+                    yield Token(token_type, text, float(text), line)
+                case TokenType.STRING:
+                    yield Token(token_type, text, intern(text[1:-1]), line)
+                case _:
+                    yield Token(token_type, text, None, line)
+
+    def scan_tokens(self) -> list[Token]:
+        self.tokens.extend(self.scan())
+        self.tokens.append(
+            Token(token_type=TokenType.EOF, lexeme="", literal=None, line=self.line)
+        )
+        return self.tokens
+
+    def scan_buffer(self) -> TokenBuffer:
+        buffer = TokenBuffer(self.source)
+        append = buffer.append
+        for token_type, start, end, line in self.scan_spans():
+            append(token_type, start, end, line)
+        append(TokenType.EOF, len(self.source), len(self.source), self.line)
+        return buffer
+
+    def scan_stream(self, chunks: Iterable[str]) -> Iterator[Token]:
+        for chunk in chunks:
+            self.source = self.source[self.position :] + chunk
+            self.position = 0
+            yield from self.scan(final=False)
+        self.source = self.source[self.position :]
+        self.position = 0
+        yield from self.scan()
+        yield Token(token_type=TokenType.EOF, lexeme="", literal=None, line=self.line)
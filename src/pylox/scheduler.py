@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+
+from pylox import stmt
+from pylox.environment import Frame
+from pylox.interpreter import Interpreter
+from pylox.output import MemorySink
+from pylox.program import Program, compile
+
+# Script states.
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+OUT_OF_BUDGET = "out of budget"
+CANCELLED = "cancelled"
+
+
+class BudgetExceeded(RuntimeError):
+    pass
+
+
+# Runs already resolved statements one at a time. Each statement is yielded
+# just before it executes, which happens when the generator is resumed, so
+# the consumer can stop between any two statements. Blocks are entered and
+# left on an explicit stack, so the statements inside them are steps too.
+def steps(
+    interpreter: Interpreter, statements: Iterable[stmt.Stmt]
+) -> Iterator[stmt.Stmt]:
+    pending: list[Iterator[stmt.Stmt]] = [iter(statements)]
+    enclosing: list[Frame] = []
+    frame = interpreter.frame
+    try:
+        while pending:
+            statement = next(pending[-1], None)
+            if statement is None:
+                _ = pending.pop()
+                if enclosing:
+                    interpreter.frame = enclosing.pop()
+            elif type(statement) is stmt.Block:
+                size = interpreter.resolver.frame_sizes[id(statement)]
+                enclosing.append(interpreter.frame)
+                interpreter.frame = Frame(size, interpreter.frame)
+                pending.append(iter(statement.statements))
+            else:
+                yield statement
+                interpreter.execute(statement)
+    finally:
+        interpreter.frame = frame
+
+
+@dataclass(slots=True)
+class Cost:
+    steps: int = 0
+    # Time spent running, not waiting for other scripts.
+    seconds: float = 0.0
+    slices: int = 0
+    # The longest a script held the event loop, which bounds how long every
+    # other script can be kept waiting by it.
+    longest_slice: float = 0.0
+
+    def add_slice(self, seconds: float) -> None:
+        self.seconds += seconds
+        self.slices += 1
+        self.longest_slice = max(self.longest_slice, seconds)
+
+
+@dataclass(slots=True)
+class Script:
+    name: str
+    source: str | Program
+    globals: Mapping[str, object] | None = None
+    max_steps: int | None = None
+    max_seconds: float | None = None
+    stdout: MemorySink = field(default_factory=MemorySink)
+    status: str = PENDING
+    error: str | None = None
+    cost: Cost = field(default_factory=Cost)
+    task: "asyncio.Task[None] | None" = None
+
+
+# Cooperative scheduler that multiplexes many scripts on one event loop.
+# A script runs for at most `slice_steps` statements, or up to its next
+# print, then yields. asyncio resumes ready tasks first come first served,
+# so slices go round-robin. Scripts are stopped once they use up their step
+# or time budget; the time budget is checked at the end of each slice.
+class Scheduler:
+    def __init__(
+        self,
+        slice_steps: int = 100,
+        max_steps: int | None = None,
+        max_seconds: float | None = None,
+    ) -> None:
+        self.slice_steps: int = slice_steps
+        self.max_steps: int | None = max_steps
+        self.max_seconds: float | None = max_seconds
+        self.scripts: dict[str, Script] = {}
+
+    # Must be called with the event loop running; the script starts at the
+    # loop's next turn. Budgets default to the scheduler's.
+    def submit(
+        self,
+        name: str,
+        source: str | Program,
+        globals: Mapping[str, object] | None = None,
+        max_steps: int | None = None,
+        max_seconds: float | None = None,
+    ) -> Script:
+        if name in self.scripts:
+            raise ValueError(f"A script named {name!r} was already submitted.")
+        script = self.scripts[name] = Script(
+            name,
+            source,
+            globals,
+            self.max_steps if max_steps is None else max_steps,
+            self.max_seconds if max_seconds is None else max_seconds,
+        )
+        script.task = asyncio.create_task(self.execute(script), name=name)
+        return script
+
+    def cancel(self, name: str) -> bool:
+        script = self.scripts[name]
+        if script.task is None or not script.task.cancel():
+            return False
+        # A task cancelled before its first turn never enters execute().
+        if script.status == PENDING:
+            script.status = CANCELLED
+        return True
+
+    # Waits for every submitted script, including ones submitted meanwhile.
+    async def wait(self) -> list[Script]:
+        while tasks := [
+            script.task
+            for script in self.scripts.values()
+            if script.task is not None and not script.task.done()
+        ]:
+            _ = await asyncio.wait(tasks)
+        return list(self.scripts.values())
+
+    async def execute(self, script: Script) -> None:
+        script.status = RUNNING
+        cost = script.cost
+        start = time.perf_counter()
+        try:
+            program = script.source
+            if isinstance(program, str):
+                program = compile(program)
+            interpreter = program.bind(script.globals, script.stdout)
+            taken = 0
+            for statement in steps(interpreter, program.statements):
+                if taken == self.slice_steps:
+                    script.stdout.flush()
+                    cost.add_slice(time.perf_counter() - start)
+                    self.check_time(script)
+                    await asyncio.sleep(0)
+                    start = time.perf_counter()
+                    taken = 0
+                if cost.steps == script.max_steps:
+                    cost.add_slice(time.perf_counter() - start)
+                    raise BudgetExceeded(f"Step budget of {script.max_steps} exceeded.")
+                cost.steps += 1
+                taken += 1
+                # Output ends the slice, so it reaches readers promptly.
+                if type(statement) is stmt.Print:
+                    taken = self.slice_steps
+            cost.add_slice(time.perf_counter() - start)
+            script.status = DONE
+        except BudgetExceeded as e:
+            script.status, script.error = OUT_OF_BUDGET, str(e)
+        except asyncio.CancelledError:
+            # Only raised while waiting, after the slice was accounted for.
+            script.status = CANCELLED
+            raise
+        except Exception as e:  # noqa: BLE001
+            # Reported the way Interpreter.interpret reports it; scan errors
+            # and Python errors such as division by zero included.
+            script.stdout.write(e)
+            script.status, script.error = ERROR, str(e)
+        finally:
+            script.stdout.flush()
+
+    def check_time(self, script: Script) -> None:
+        if script.max_seconds is not None and script.cost.seconds > script.max_seconds:
+            raise BudgetExceeded(
+                f"Time budget of {script.max_seconds} seconds exceeded."
+            )
+
+
+# Runs the scripts by name to completion on a new event loop.
+def run_all(
+    sources: Mapping[str, str | Program],
+    slice_steps: int = 100,
+    max_steps: int | None = None,
+    max_seconds: float | None = None,
+) -> list[Script]:
+    async def main() -> list[Script]:
+        scheduler = Scheduler(slice_steps, max_steps, max_seconds)
+        for name, source in sources.items():
+            _ = scheduler.submit(name, source)
+        return await scheduler.wait()
+
+    return asyncio.run(main())
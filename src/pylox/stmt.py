@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Any, override
 
 from pylox.expr import Expr
+from pylox.token import Token
 
 
 class Stmt(ABC):
@@ -11,6 +12,15 @@ class Stmt(ABC):
         pass
 
 
+@dataclass(frozen=True, slots=True)
+class Block(Stmt):
+    statements: tuple[Stmt, ...]
+
+    @override
+    def accept[T](self, visitor: "Visitor[T]") -> T:
+        return visitor.visit_block_stmt(self)
+
+
 @dataclass(frozen=True, slots=True)
 class Print(Stmt):
     expr: Expr
@@ -29,7 +39,21 @@ class Expression(Stmt):
         return visitor.visit_expression_stmt(self)
 
 
+@dataclass(frozen=True, slots=True)
+class Var(Stmt):
+    name: Token
+    initializer: Expr | None
+
+    @override
+    def accept[T](self, visitor: "Visitor[T]") -> T:
+        return visitor.visit_var_stmt(self)
+
+
 class Visitor[T](ABC):
+    @abstractmethod
+    def visit_block_stmt(self, stmt: Block) -> T:
+        pass
+
     @abstractmethod
     def visit_expression_stmt(self, stmt: Expression) -> T:
         pass
@@ -37,3 +61,7 @@ class Visitor[T](ABC):
     @abstractmethod
     def visit_print_stmt(self, stmt: Print) -> T:
         pass
+
+    @abstractmethod
+    def visit_var_stmt(self, stmt: Var) -> T:
+        pass
@@ -0,0 +1,90 @@
+import codecs
+import io
+import mmap
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from pylox.output import Sink
+from pylox.token import Token, TokenType
+
+CHUNK_SIZE: int = 1 << 16
+
+
+def read_chunks(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    try:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # Pipes, terminals, in-memory streams and empty files.
+        yield from read_available(file, chunk_size)
+        return
+    decoder = newline_decoder(file)
+    with mapped:
+        for offset in range(0, len(mapped), chunk_size):
+            if chunk := decoder.decode(mapped[offset : offset + chunk_size]):
+                yield chunk
+        if chunk := decoder.decode(b"", final=True):
+            yield chunk
+
+
+def newline_decoder(file: TextIO) -> io.IncrementalNewlineDecoder:
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(file.encoding)(), translate=True
+    )
+
+
+# file.read(n) on a pipe waits for n characters or the end of input. read1()
+# returns whatever has arrived, so statements run as their lines come in.
+# In-memory streams have no binary buffer, and never wait anyway.
+def read_available(file: TextIO, chunk_size: int) -> Iterator[str]:
+    buffer = getattr(file, "buffer", None)
+    if not isinstance(buffer, io.BufferedReader):
+        while chunk := file.read(chunk_size):
+            yield chunk
+        return
+    decoder = newline_decoder(file)
+    while data := buffer.read1(chunk_size):
+        if chunk := decoder.decode(data):
+            yield chunk
+    if chunk := decoder.decode(b"", final=True):
+        yield chunk
+
+
+# Output sinks only write when their buffer fills or a run ends. Streamed
+# input may never end, so whatever the statements read so far printed is
+# written before the next chunk is read, which may wait on the input.
+def flush_before_reading(chunks: Iterable[str], output: Sink) -> Iterator[str]:
+    for chunk in chunks:
+        yield chunk
+        output.flush()
+
+
+# Lazily pulls tokens for the `Parser`, which only ever looks back at the
+# previous token, so everything before that is released as parsing advances.
+class TokenStream:
+    def __init__(self, tokens: Iterator[Token], keep: int = 64) -> None:
+        self.tokens: Iterator[Token] = tokens
+        self.window: list[Token] = []
+        self.offset: int = 0
+        self.keep: int = keep
+
+    def __getitem__(self, index: int) -> Token:
+        position = index - self.offset
+        if position < 0:
+            raise IndexError(f"Token {index} has already been released")
+        window = self.window
+        while position >= len(window):
+            try:
+                window.append(next(self.tokens))
+            except StopIteration:
+                raise IndexError(f"Token {index} is past the end of input") from None
+        if position > self.keep:
+            del window[: position - 1]
+            self.offset += position - 1
+            position = 1
+        return window[position]
+
+    def token_type(self, index: int) -> TokenType:
+        return self[index].token_type
+
+    def literal(self, index: int) -> str | float | int | None:
+        return self[index].literal
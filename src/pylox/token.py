@@ -1,8 +1,13 @@
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import override
+from typing import TYPE_CHECKING, override
 
-import rich.repr
+from pylox.rope import intern
+
+if TYPE_CHECKING:
+    import rich.repr
 
 
 class TokenType(Enum):
@@ -69,8 +74,62 @@ class Token:
     def __str__(self) -> str:
         return f"{self.token_type.name} {self.lexeme} {self.literal}"
 
-    def __rich_repr__(self) -> rich.repr.Result:
+    def __rich_repr__(self) -> "rich.repr.Result":
         yield self.lexeme
         yield f"<{self.token_type.name}>"
         if self.literal is not None:
             yield f"({self.literal})"
+
+
+# Indexed by `TokenType.value`, which `auto()` numbers from 1.
+TOKEN_TYPES: tuple[TokenType | None, ...] = (None, *TokenType)
+
+
+# Struct-of-arrays token storage: one type code, source span and line per
+# token. Lexemes and literals are only sliced out of the source on demand, and
+# indexing hands out `Token` objects for code that still wants them.
+class TokenBuffer:
+    def __init__(self, source: str) -> None:
+        self.source: str = source
+        self.types: array[int] = array("B")
+        self.starts: array[int] = array("I")
+        self.ends: array[int] = array("I")
+        self.lines: array[int] = array("I")
+
+    def append(self, token_type: TokenType, start: int, end: int, line: int) -> None:
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(
+            self.token_type(index),
+            self.lexeme(index),
+            self.literal(index),
+            self.lines[index],
+        )
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]  # pyright: ignore[reportReturnType]
+
+    def lexeme(self, index: int) -> str:
+        return intern(self.source[self.starts[index] : self.ends[index]])
+
+    def literal(self, index: int) -> str | float | None:
+        match TOKEN_TYPES[self.types[index]]:
+            case TokenType.NUMBER:
+                return float(self.lexeme(index))
+            case TokenType.STRING:
+                return intern(
+                    self.source[self.starts[index] + 1 : self.ends[index] - 1]
+                )
+            case _:
+                return None
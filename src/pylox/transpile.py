@@ -0,0 +1,561 @@
+import ast
+import gc
+import marshal
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cache, partial
+from itertools import batched
+from types import CodeType, TracebackType
+from typing import TYPE_CHECKING, TextIO, TypedDict, cast, override
+
+from pylox import expr, stmt
+from pylox.environment import UNDEFINED, GlobalTable, undefined_variable
+from pylox.interpreter import binary_op, unary_op
+from pylox.iterative import IterativeInterpreter
+from pylox.output import Sink, sink
+from pylox.profiler import first_line
+from pylox.resolver import GLOBAL, Resolver
+from pylox.token import TokenType
+
+if TYPE_CHECKING:
+    from pylox.cache import ProgramCache
+
+# Name of the function a program is compiled into.
+ENTRY: str = "__lox__"
+# Bumped whenever the generated code changes shape, so cached code objects
+# from an older pylox are not run. The Python version is part of it, as
+# bytecode and marshal formats differ between versions.
+CODE_VERSION: str = f"2-{sys.implementation.cache_tag}"
+# Top-level statements lowered into one function. Python compiles a large
+# function more slowly per statement than a small one, and the syntax trees
+# of a whole script take far more memory than the script itself.
+CHUNK_STATEMENTS: int = 128
+
+# Operators whose float/float case is the Python operator of the same name.
+FLOAT_OPERATORS: dict[TokenType, ast.operator | ast.cmpop] = {
+    TokenType.PLUS: ast.Add(),
+    TokenType.MINUS: ast.Sub(),
+    TokenType.STAR: ast.Mult(),
+    TokenType.SLASH: ast.Div(),
+    TokenType.GREATER: ast.Gt(),
+    TokenType.GREATER_EQUAL: ast.GtE(),
+    TokenType.LESS: ast.Lt(),
+    TokenType.LESS_EQUAL: ast.LtE(),
+}
+# binary_op compares any two values with Python equality.
+EQUALITY_OPERATORS: dict[TokenType, ast.cmpop] = {
+    TokenType.EQUAL_EQUAL: ast.Eq(),
+    TokenType.BANG_EQUAL: ast.NotEq(),
+}
+
+
+def undefined(name: str) -> object:
+    raise undefined_variable(name)
+
+
+def assign_global(values: list[object], slot: int, value: object, name: str) -> object:
+    if values[slot] is UNDEFINED:
+        raise undefined_variable(name)
+    values[slot] = value
+    return value
+
+
+# What generated code can see besides its arguments. Operators are passed to
+# the slow paths by name, since enum members cannot be code constants.
+RUNTIME: dict[str, object] = {
+    "binary_op": binary_op,
+    "unary_op": unary_op,
+    "undefined": undefined,
+    "assign_global": assign_global,
+    "float": float,
+    "type": type,
+    **{token_type.name: token_type for token_type in TokenType},
+}
+
+
+LOAD = ast.Load()
+STORE = ast.Store()
+
+
+# Location attributes for a node on a Lox line, passed to the node's
+# constructor as keywords. Nodes are given them when they are made; filling
+# them in afterwards with ast.fix_missing_locations took longer than
+# lowering the program.
+class Position(TypedDict):
+    lineno: int
+    end_lineno: int
+    col_offset: int
+    end_col_offset: int
+
+
+@cache
+def position(line: int) -> Position:
+    return Position(lineno=line, end_lineno=line, col_offset=0, end_col_offset=0)
+
+
+def name(identifier: str, at: Position, store: bool = False) -> ast.Name:
+    return ast.Name(identifier, STORE if store else LOAD, **at)
+
+
+def call(function: str, at: Position, *args: ast.expr) -> ast.Call:
+    return ast.Call(name(function, at), list(args), [], **at)
+
+
+# A float literal, whose type the generated code need not check.
+def is_float(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and type(node.value) is float
+
+
+# Lowers resolved statements into the body of one Python function,
+# `__lox__(G, write, UNDEFINED)`, where G is the global table's value list.
+# Lox locals become Python locals named after the depth of their block, so
+# a declaration shadowing one in an enclosing block gets a name of its own,
+# while sibling blocks share names; CPython compiles a function with many
+# thousands of locals very slowly. Arithmetic and comparisons run the Python operator
+# inline when both operands are floats and call binary_op otherwise, so the
+# Lox semantics are kept exactly. Operands are held in temporaries named
+# after their nesting depth, which is all it takes to keep them apart.
+#
+# Every node gets the line of its nearest token, or of its statement, so
+# line numbers in tracebacks are Lox lines.
+class Transpiler(expr.Visitor[ast.expr], stmt.Visitor[list[ast.stmt]]):
+    def __init__(self, resolver: Resolver) -> None:
+        self.resolver: Resolver = resolver
+        # Python names of the locals of each open block, by slot.
+        self.scopes: list[dict[int, str]] = []
+        self.depth: int = 0
+        self.line: int = 1
+        # Assignments to locals lowered so far.
+        self.assignments: int = 0
+
+    def transpile(self, statements: Iterable[stmt.Stmt]) -> ast.Module:
+        body = [node for statement in statements for node in self.statement(statement)]
+        at = position(1)
+        arguments = [
+            ast.arg(argument, **at) for argument in ("G", "write", "UNDEFINED")
+        ]
+        function = ast.FunctionDef(
+            ENTRY, ast.arguments(args=arguments), body or [ast.Pass(**at)], **at
+        )
+        return ast.Module([function], [])
+
+    def statement(self, statement: stmt.Stmt) -> list[ast.stmt]:
+        return statement.accept(self)
+
+    def expression(self, expr: expr.Expr, line: int | None = None) -> ast.expr:
+        outer_line, outer_depth = self.line, self.depth
+        if line is not None:
+            self.line = line
+        self.depth += 1
+        try:
+            return expr.accept(self)
+        finally:
+            self.line, self.depth = outer_line, outer_depth
+
+    def local(self, node: expr.Variable | expr.Assign) -> tuple[int, int]:
+        return self.resolver.slots.get(id(node)) or (
+            GLOBAL,
+            self.resolver.global_index(node.name.lexeme),
+        )
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> ast.expr:
+        return ast.Constant(expr.value, **position(self.line))
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> ast.expr:
+        return self.expression(expr.expr)
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> ast.expr:
+        line = expr.operator.line
+        right = self.expression(expr.right, line)
+        at = position(line)
+        self.line = line
+        if expr.operator.token_type == TokenType.MINUS and is_float(right):
+            return ast.UnaryOp(ast.USub(), right, **at)
+        temp = f"t{self.depth}"
+        held = ast.NamedExpr(name(temp, at, store=True), right, **at)
+        if expr.operator.token_type == TokenType.BANG:
+            # nil and false are the only falsey values.
+            return ast.BoolOp(
+                ast.Or(),
+                [
+                    ast.Compare(held, [ast.Is()], [ast.Constant(None, **at)], **at),
+                    ast.Compare(
+                        name(temp, at), [ast.Is()], [ast.Constant(False, **at)], **at
+                    ),
+                ],
+                **at,
+            )
+        return ast.IfExp(
+            ast.Compare(call("type", at, held), [ast.Is()], [name("float", at)], **at),
+            ast.UnaryOp(ast.USub(), name(temp, at), **at),
+            call(
+                "unary_op", at, name(expr.operator.token_type.name, at), name(temp, at)
+            ),
+            **at,
+        )
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> ast.expr:
+        line = expr.operator.line
+        token_type = expr.operator.token_type
+        left = self.expression(expr.left, line)
+        assignments = self.assignments
+        right = self.expression(expr.right, line)
+        assigned = self.assignments != assignments
+        at = position(line)
+        self.line = line
+        equality = EQUALITY_OPERATORS.get(token_type)
+        if equality is not None:
+            return ast.Compare(left, [equality], [right], **at)
+        operator = FLOAT_OPERATORS.get(token_type)
+        operation = name(token_type.name, at)
+        if operator is None:
+            return call("binary_op", at, operation, left, right)
+        # Float literals are used as they are, and locals are read again
+        # rather than held in temporaries, unless the right operand assigns
+        # to a local after the left one was read.
+        checks: list[ast.expr] = []
+        operands: list[ast.expr] = []
+        reread = (
+            isinstance(left, ast.Name) and not assigned,
+            isinstance(right, ast.Name),
+        )
+        for operand, temp, local in zip(
+            (left, right), (f"l{self.depth}", f"r{self.depth}"), reread, strict=True
+        ):
+            if is_float(operand):
+                operands.append(operand)
+            elif local:
+                checks.append(call("type", at, operand))
+                operands.append(name(cast(ast.Name, operand).id, at))
+            else:
+                held = ast.NamedExpr(name(temp, at, store=True), operand, **at)
+                checks.append(call("type", at, held))
+                operands.append(name(temp, at))
+        fast = (
+            ast.BinOp(operands[0], operator, operands[1], **at)
+            if isinstance(operator, ast.operator)
+            else ast.Compare(operands[0], [operator], [operands[1]], **at)
+        )
+        if not checks:
+            return fast
+        # A chained `is` evaluates both operands before giving up, which
+        # the slow path needs.
+        test = ast.Compare(
+            checks[0],
+            [ast.Is()] * len(checks),
+            [*checks[1:], name("float", at)],
+            **at,
+        )
+        slow = call("binary_op", at, operation, *operands)
+        return ast.IfExp(test, fast, slow, **at)
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> ast.expr:
+        self.line = expr.name.line
+        at = position(self.line)
+        depth, slot = self.local(expr)
+        if depth != GLOBAL:
+            return name(self.scopes[-1 - depth][slot], at)
+        temp = f"g{self.depth}"
+        read = ast.Subscript(name("G", at), ast.Constant(slot, **at), LOAD, **at)
+        return ast.IfExp(
+            ast.Compare(
+                ast.NamedExpr(name(temp, at, store=True), read, **at),
+                [ast.IsNot()],
+                [name("UNDEFINED", at)],
+                **at,
+            ),
+            name(temp, at),
+            call("undefined", at, ast.Constant(expr.name.lexeme, **at)),
+            **at,
+        )
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> ast.expr:
+        line = expr.name.line
+        value = self.expression(expr.value, line)
+        at = position(line)
+        self.line = line
+        depth, slot = self.local(expr)
+        if depth != GLOBAL:
+            self.assignments += 1
+            target = self.scopes[-1 - depth][slot]
+            return ast.NamedExpr(name(target, at, store=True), value, **at)
+        return call(
+            "assign_global",
+            at,
+            name("G", at),
+            ast.Constant(slot, **at),
+            value,
+            ast.Constant(expr.name.lexeme, **at),
+        )
+
+    @override
+    def visit_expression_stmt(self, stmt: stmt.Expression) -> list[ast.stmt]:
+        self.line = first_line(stmt.expr) or self.line
+        value = self.expression(stmt.expr)
+        return [ast.Expr(value, **position(self.line))]
+
+    @override
+    def visit_print_stmt(self, stmt: stmt.Print) -> list[ast.stmt]:
+        self.line = first_line(stmt.expr) or self.line
+        value = self.expression(stmt.expr)
+        at = position(self.line)
+        return [ast.Expr(call("write", at, value), **at)]
+
+    @override
+    def visit_var_stmt(self, stmt: stmt.Var) -> list[ast.stmt]:
+        self.line = stmt.name.line
+        at = position(self.line)
+        depth, slot = self.resolver.slots[id(stmt)]
+        if depth == GLOBAL:
+            target: ast.expr = ast.Subscript(
+                name("G", at), ast.Constant(slot, **at), STORE, **at
+            )
+        else:
+            # Named before the initializer is lowered, which may assign to it.
+            local = self.scopes[-1][slot] = f"{stmt.name.lexeme}_{len(self.scopes)}"
+            target = name(local, at, store=True)
+        value = (
+            ast.Constant(None, **at)
+            if stmt.initializer is None
+            else self.expression(stmt.initializer)
+        )
+        return [ast.Assign([target], value, **at)]
+
+    @override
+    def visit_block_stmt(self, stmt: stmt.Block) -> list[ast.stmt]:
+        self.scopes.append({})
+        try:
+            return [
+                node
+                for statement in stmt.statements
+                for node in self.statement(statement)
+            ]
+        finally:
+            _ = self.scopes.pop()
+
+
+# Defines the function `code` was compiled to and returns it.
+def entry(
+    code: CodeType,
+) -> Callable[[list[object], Callable[[object], None], object], None]:
+    namespace = dict(RUNTIME)
+    exec(code, namespace)  # noqa: S102
+    return namespace[ENTRY]  # pyright: ignore[reportReturnType]
+
+
+# A program compiled to Python code objects, one per chunk of top-level
+# statements, along with the global names their slots refer to, so it can be
+# marshalled and run without pylox parsing it.
+@dataclass(frozen=True, slots=True)
+class CompiledProgram:
+    codes: tuple[CodeType, ...]
+    global_names: tuple[str, ...]
+
+    # Errors propagate to the caller, as with Program.run.
+    def run(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+    ) -> None:
+        names = {name: index for index, name in enumerate(self.global_names)}
+        table = GlobalTable(
+            names,
+            {name: value for name, value in (globals or {}).items() if name in names},
+        )
+        output = sink(stdout)
+        try:
+            for code in self.codes:
+                entry(code)(table.cells, output.write, UNDEFINED)
+        finally:
+            output.flush()
+
+    def dumps(self) -> bytes:
+        return marshal.dumps((CODE_VERSION, self.global_names, self.codes))
+
+    @staticmethod
+    def loads(data: bytes) -> "CompiledProgram":
+        version, global_names, codes = marshal.loads(data)
+        if version != CODE_VERSION:
+            raise ValueError(f"Code compiled by another pylox ({version})")
+        return CompiledProgram(tuple(codes), tuple(global_names))
+
+
+# Lowers resolved statements into one `__lox__` function. The syntax trees
+# built along the way hold no cycles, so the cyclic garbage collector is
+# paused while they are built; its passes over a large tree otherwise take as
+# long as building it.
+def compile_chunk(
+    statements: Iterable[stmt.Stmt], resolver: Resolver, filename: str = "<lox>"
+) -> CodeType:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return compile(Transpiler(resolver).transpile(statements), filename, "exec")
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# Statements are resolved here, a chunk at a time, unless `resolver` has
+# resolved them already.
+def transpile(
+    statements: Iterable[stmt.Stmt],
+    resolver: Resolver | None = None,
+    filename: str = "<lox>",
+) -> CompiledProgram:
+    resolve = resolver is None
+    resolver = Resolver() if resolver is None else resolver
+    codes: list[CodeType] = []
+    for chunk in batched(statements, CHUNK_STATEMENTS):
+        if resolve:
+            for statement in chunk:
+                resolver.resolve(statement)
+        codes.append(compile_chunk(chunk, resolver, filename))
+        if resolve:
+            resolver.release()
+    names = sorted(resolver.global_names, key=resolver.global_names.__getitem__)
+    return CompiledProgram(tuple(codes), tuple(names))
+
+
+# The Lox line an error was raised on, from the generated function's frame.
+def error_line(traceback: TracebackType | None) -> int | None:
+    line = None
+    while traceback is not None:
+        if traceback.tb_frame.f_code.co_name == ENTRY:
+            line = traceback.tb_lineno
+        traceback = traceback.tb_next
+    return line
+
+
+# Errors raised by generated code are reported with their line, like the VM
+# reports them.
+def describe(error: Exception) -> object:
+    line = error_line(error.__traceback__)
+    return error if line is None else f"{error}\n[line {line}] in script"
+
+
+# Engine that compiles scripts to Python bytecode and lets CPython run them.
+# Statements are resolved, compiled and run a chunk at a time, so memory use
+# does not grow with the script; on an error, the statements before it still
+# run, as they would have in the tree interpreter. Python's compiler
+# recurses, so a chunk nested too deeply for it runs on the iterative
+# interpreter, which does not.
+class TranspilingInterpreter:
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+        resolver: Resolver | None = None,
+    ) -> None:
+        self.resolver: Resolver = Resolver() if resolver is None else resolver
+        self.globals: GlobalTable = GlobalTable(
+            self.resolver.global_names, globals or {}
+        )
+        self.output: Sink = sink(stdout)
+
+    # Statements a parser is still producing are run one at a time, as the
+    # VM compiles them, since the next one may be waiting on input.
+    def interpret(self, statements: Iterable[stmt.Stmt]) -> bool:
+        size = CHUNK_STATEMENTS if isinstance(statements, Sequence) else 1
+        try:
+            for chunk in self.resolved(statements, size):
+                self.run(chunk)
+        except Exception as e:  # noqa: BLE001
+            self.output.write(describe(e))
+            return False
+        finally:
+            self.output.flush()
+        return True
+
+    # Groups statements into resolved chunks of up to `size`. A statement
+    # that does not resolve ends the last chunk, and its error is raised once
+    # the statements before it have run.
+    def resolved(
+        self, statements: Iterable[stmt.Stmt], size: int
+    ) -> Iterator[list[stmt.Stmt]]:
+        chunk: list[stmt.Stmt] = []
+        try:
+            for statement in statements:
+                self.resolver.resolve(statement)
+                chunk.append(statement)
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+        except Exception:
+            if chunk:
+                yield chunk
+            raise
+        if chunk:
+            yield chunk
+
+    def run(self, statements: list[stmt.Stmt]) -> None:
+        try:
+            code = compile_chunk(statements, self.resolver)
+        except RecursionError:
+            self.fallback(statements)
+            return
+        finally:
+            self.resolver.release()
+        self.globals.grow()
+        entry(code)(self.globals.cells, self.output.write, UNDEFINED)
+
+    def fallback(self, statements: list[stmt.Stmt]) -> None:
+        interpreter = IterativeInterpreter(None, self.output, self.resolver)
+        interpreter.globals = self.globals
+        for statement in statements:
+            interpreter.execute(statement)
+
+
+# Runs a compiled program, reporting a runtime error as the engine does.
+def run_program(program: CompiledProgram, stdout: TextIO | Sink | None) -> bool:
+    output = sink(stdout)
+    try:
+        program.run(None, output)
+    except Exception as e:  # noqa: BLE001
+        output.write(describe(e))
+        output.flush()
+        return False
+    return True
+
+
+# Runs a script file, taking its code object from `cache` when there is one
+# for this source and otherwise parsing it with `parse` and storing the code.
+# Returns whether the script ran without an error, as engines do.
+def run_source(
+    source: str,
+    mtime_ns: int | None,
+    parse: Callable[[], list[stmt.Stmt]],
+    opt_level: int = 0,
+    cache: "ProgramCache | None" = None,
+    stdout: TextIO | Sink | None = None,
+) -> bool:
+    # Sources without an mtime, such as stdin, are never cached.
+    store: Callable[[bytes], None] | None = None
+    if cache is not None and mtime_ns is not None:
+        key = cache.key(source, opt_level, CODE_VERSION)
+        data = cache.read(key, mtime_ns)
+        if data is not None:
+            try:
+                program = CompiledProgram.loads(data)
+            except (ValueError, EOFError, TypeError):
+                pass
+            else:
+                return run_program(program, stdout)
+        store = partial(cache.write, key, mtime_ns)
+    statements = parse()
+    try:
+        program = transpile(statements)
+    except RuntimeError:
+        # The script does not resolve, or is nested too deeply for Python's
+        # compiler; the engine runs what it can and reports why it stopped.
+        return TranspilingInterpreter(None, stdout).interpret(statements)
+    if store is not None:
+        store(program.dumps())
+    return run_program(program, stdout)
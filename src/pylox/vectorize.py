@@ -0,0 +1,220 @@
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, override
+
+import numpy as np
+import numpy.typing as npt
+
+from pylox import expr
+from pylox.environment import undefined_variable
+from pylox.token import TokenType
+
+# Per-row type tags. Bools take part in arithmetic as 0.0 and 1.0.
+NIL = 0
+BOOL = 1
+NUMBER = 2
+STRING = 3
+
+ARITHMETIC: dict[TokenType, Callable[..., npt.NDArray[Any]]] = {
+    TokenType.PLUS: np.add,
+    TokenType.MINUS: np.subtract,
+    TokenType.STAR: np.multiply,
+    TokenType.SLASH: np.true_divide,
+}
+COMPARISONS: dict[TokenType, Callable[..., npt.NDArray[Any]]] = {
+    TokenType.GREATER: np.greater,
+    TokenType.GREATER_EQUAL: np.greater_equal,
+    TokenType.LESS: np.less,
+    TokenType.LESS_EQUAL: np.less_equal,
+}
+
+
+# A column of Lox values: a type tag per row, the numeric value of numbers
+# and bools, and the strings (an object array, only when any row is one).
+@dataclass(frozen=True, slots=True)
+class Column:
+    tags: npt.NDArray[np.uint8]
+    numbers: npt.NDArray[np.float64]
+    strings: npt.NDArray[np.object_] | None = None
+
+    def is_numeric(self) -> npt.NDArray[np.bool_]:
+        return (self.tags == BOOL) | (self.tags == NUMBER)
+
+    def to_array(self) -> npt.NDArray[Any]:
+        if (self.tags == NUMBER).all():
+            return self.numbers
+        if (self.tags == BOOL).all():
+            return self.numbers.astype(np.bool_)
+        values = np.empty(len(self.tags), dtype=object)
+        values[:] = None
+        numbers = self.tags == NUMBER
+        values[numbers] = self.numbers[numbers].tolist()
+        bools = self.tags == BOOL
+        values[bools] = self.numbers[bools].astype(np.bool_).tolist()
+        if self.strings is not None:
+            strings = self.tags == STRING
+            values[strings] = self.strings[strings]
+        return values
+
+
+def constant(value: object, rows: int) -> Column:
+    match value:
+        case None:
+            return Column(np.zeros(rows, np.uint8), np.zeros(rows))
+        case bool():
+            return Column(np.full(rows, BOOL, np.uint8), np.full(rows, float(value)))
+        case int() | float():
+            return Column(np.full(rows, NUMBER, np.uint8), np.full(rows, float(value)))
+        case str():
+            strings = np.empty(rows, dtype=object)
+            strings[:] = value
+            return Column(np.full(rows, STRING, np.uint8), np.zeros(rows), strings)
+        case _:
+            raise TypeError(f"Unsupported Lox value {value!r}")
+
+
+# Float, integer and bool arrays map straight onto tags; object arrays are
+# classified row by row, the same way the interpreter's match statements do.
+def column(values: object, rows: int) -> Column:
+    if not isinstance(values, np.ndarray):
+        return constant(values, rows)
+    if values.shape != (rows,):
+        raise ValueError(f"Expected a column of {rows} rows, got {values.shape}")
+    if values.dtype == np.bool_:
+        return Column(np.full(rows, BOOL, np.uint8), values.astype(np.float64))
+    if np.issubdtype(values.dtype, np.number):
+        return Column(np.full(rows, NUMBER, np.uint8), values.astype(np.float64))
+    tags = np.zeros(rows, np.uint8)
+    numbers = np.zeros(rows)
+    strings = np.empty(rows, dtype=object)
+    for row, value in enumerate(values.tolist()):
+        match value:
+            case None:
+                pass
+            case bool():
+                tags[row], numbers[row] = BOOL, value
+            case int() | float():
+                tags[row], numbers[row] = NUMBER, value
+            case str():
+                tags[row], strings[row] = STRING, value
+            case _:
+                raise TypeError(f"Unsupported Lox value {value!r} in row {row}")
+    return Column(tags, numbers, strings if (tags == STRING).any() else None)
+
+
+def where(mask: npt.NDArray[np.bool_], tag: int) -> npt.NDArray[np.uint8]:
+    return np.where(mask, np.uint8(tag), np.uint8(NIL))
+
+
+# Evaluates an expression for every row at once. Rows where the interpreter
+# would produce nil on a type mismatch are masked to NIL instead of raising.
+class VectorEvaluator(expr.Visitor[Column]):
+    def __init__(self, columns: Mapping[str, object], rows: int) -> None:
+        self.rows: int = rows
+        self.columns: dict[str, Column] = {
+            name: column(values, rows) for name, values in columns.items()
+        }
+
+    def evaluate(self, expr: expr.Expr) -> Column:
+        return expr.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: expr.Assign) -> Column:
+        raise RuntimeError("Assignment is not supported in vectorized expressions.")
+
+    @override
+    def visit_literal_expr(self, expr: expr.Literal) -> Column:
+        return constant(expr.value, self.rows)
+
+    @override
+    def visit_grouping_expr(self, expr: expr.Grouping) -> Column:
+        return self.evaluate(expr.expr)
+
+    @override
+    def visit_variable_expr(self, expr: expr.Variable) -> Column:
+        try:
+            return self.columns[expr.name.lexeme]
+        except KeyError:
+            raise undefined_variable(expr.name.lexeme) from None
+
+    @override
+    def visit_unary_expr(self, expr: expr.Unary) -> Column:
+        right = self.evaluate(expr.right)
+        match expr.operator.token_type:
+            case TokenType.MINUS:
+                numeric = right.is_numeric()
+                return Column(
+                    where(numeric, NUMBER), np.where(numeric, -right.numbers, 0.0)
+                )
+            case TokenType.BANG:
+                truth = (right.tags == NIL) | (
+                    (right.tags == BOOL) & (right.numbers == 0.0)
+                )
+                return Column(
+                    np.full(self.rows, BOOL, np.uint8), truth.astype(np.float64)
+                )
+            case _:
+                return constant(None, self.rows)
+
+    @override
+    def visit_binary_expr(self, expr: expr.Binary) -> Column:
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        token_type = expr.operator.token_type
+        numeric = left.is_numeric() & right.is_numeric()
+        if (operation := ARITHMETIC.get(token_type)) is not None:
+            if (
+                token_type == TokenType.SLASH
+                and (numeric & (right.numbers == 0.0)).any()
+            ):
+                raise ZeroDivisionError("float division by zero")
+            with np.errstate(all="ignore"):
+                numbers = np.where(numeric, operation(left.numbers, right.numbers), 0.0)
+            if (
+                token_type == TokenType.PLUS
+                and left.strings is not None
+                and right.strings is not None
+            ):
+                strings = (left.tags == STRING) & (right.tags == STRING)
+                if strings.any():
+                    concatenated = np.empty(self.rows, dtype=object)
+                    concatenated[strings] = (
+                        left.strings[strings] + right.strings[strings]
+                    )
+                    tags = where(numeric, NUMBER) | where(strings, STRING)
+                    return Column(tags, numbers, concatenated)
+            return Column(where(numeric, NUMBER), numbers)
+        if (comparison := COMPARISONS.get(token_type)) is not None:
+            result = numeric & comparison(left.numbers, right.numbers)
+            return Column(where(numeric, BOOL), result.astype(np.float64))
+        if token_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            equal = self.equal(left, right)
+            if token_type == TokenType.BANG_EQUAL:
+                equal = ~equal
+            return Column(np.full(self.rows, BOOL, np.uint8), equal.astype(np.float64))
+        return constant(None, self.rows)
+
+    # Python equality: numbers and bools compare numerically, strings by
+    # value, nil only equals nil, and values of other types never match.
+    def equal(self, left: Column, right: Column) -> npt.NDArray[np.bool_]:
+        equal = left.is_numeric() & right.is_numeric() & (left.numbers == right.numbers)
+        equal |= (left.tags == NIL) & (right.tags == NIL)
+        if left.strings is not None and right.strings is not None:
+            strings = (left.tags == STRING) & (right.tags == STRING)
+            equal[strings] = left.strings[strings] == right.strings[strings]
+        return equal
+
+
+def evaluate(
+    expression: expr.Expr, columns: Mapping[str, object], rows: int | None = None
+) -> npt.NDArray[Any]:
+    if rows is None:
+        rows = next(
+            (
+                len(values)
+                for values in columns.values()
+                if isinstance(values, np.ndarray)
+            ),
+            1,
+        )
+    return VectorEvaluator(columns, rows).evaluate(expression).to_array()
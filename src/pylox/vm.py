@@ -0,0 +1,178 @@
+from collections.abc import Iterable, Mapping
+from typing import TextIO
+
+from pylox import stmt
+from pylox.compiler import Chunk, Compiler, OpCode
+from pylox.environment import UNDEFINED, GlobalTable, undefined_variable
+from pylox.interpreter import binary_op, unary_op
+from pylox.output import Sink, sink
+from pylox.resolver import Resolver
+from pylox.token import TokenType
+
+# Plain ints so the dispatch loop compares against globals, not enum members.
+CONSTANT = OpCode.CONSTANT.value
+NIL = OpCode.NIL.value
+TRUE = OpCode.TRUE.value
+FALSE = OpCode.FALSE.value
+POP = OpCode.POP.value
+NEGATE = OpCode.NEGATE.value
+NOT = OpCode.NOT.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+PRINT = OpCode.PRINT.value
+RETURN = OpCode.RETURN.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+
+# Opcodes without a dedicated branch in the dispatch loop.
+GENERIC_BINARY: dict[int, TokenType] = {
+    GREATER: TokenType.GREATER,
+    GREATER_EQUAL: TokenType.GREATER_EQUAL,
+    LESS: TokenType.LESS,
+    LESS_EQUAL: TokenType.LESS_EQUAL,
+}
+
+
+class VM:
+    def __init__(
+        self,
+        globals: Mapping[str, object] | None = None,
+        stdout: TextIO | Sink | None = None,
+        resolver: Resolver | None = None,
+    ) -> None:
+        self.resolver: Resolver = Resolver() if resolver is None else resolver
+        self.globals: GlobalTable = GlobalTable(
+            self.resolver.global_names, globals or {}
+        )
+        self.output: Sink = sink(stdout)
+
+    def interpret(self, statements: Iterable[stmt.Stmt]) -> bool:
+        try:
+            for statement in statements:
+                self.run(Compiler(self.resolver).compile([statement]))
+        except Exception as e:  # noqa: BLE001
+            self.output.write(e)
+            return False
+        finally:
+            self.output.flush()
+        return True
+
+    def run(self, chunk: Chunk) -> None:
+        code = chunk.code
+        constants = chunk.constants
+        self.globals.grow()
+        globals = self.globals.cells
+        write = self.output.write
+        stack: list[object] = []
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+        try:
+            while True:
+                op = code[ip]
+                ip += 1
+                if op == CONSTANT:
+                    push(constants[code[ip] << 8 | code[ip + 1]])
+                    ip += 2
+                elif op == ADD:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is float and type(right) is float:
+                        stack[-1] = left + right
+                    else:
+                        stack[-1] = binary_op(TokenType.PLUS, left, right)
+                elif op == SUBTRACT:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is float and type(right) is float:
+                        stack[-1] = left - right
+                    else:
+                        stack[-1] = binary_op(TokenType.MINUS, left, right)
+                elif op == MULTIPLY:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is float and type(right) is float:
+                        stack[-1] = left * right
+                    else:
+                        stack[-1] = binary_op(TokenType.STAR, left, right)
+                elif op == LESS:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is float and type(right) is float:
+                        stack[-1] = left < right
+                    else:
+                        stack[-1] = binary_op(TokenType.LESS, left, right)
+                elif op == DIVIDE:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is float and type(right) is float:
+                        stack[-1] = left / right
+                    else:
+                        stack[-1] = binary_op(TokenType.SLASH, left, right)
+                elif op == EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] == right
+                elif op == NOT_EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] != right
+                elif op == POP:
+                    _ = pop()
+                elif op == PRINT:
+                    write(pop())
+                elif op == NIL:
+                    push(None)
+                elif op == TRUE:
+                    push(True)
+                elif op == FALSE:
+                    push(False)
+                elif op == NEGATE:
+                    value = stack[-1]
+                    stack[-1] = (
+                        -value
+                        if type(value) is float
+                        else unary_op(TokenType.MINUS, value)
+                    )
+                elif op == NOT:
+                    stack[-1] = unary_op(TokenType.BANG, stack[-1])
+                elif op == GET_LOCAL:
+                    push(stack[code[ip] << 8 | code[ip + 1]])
+                    ip += 2
+                elif op == SET_LOCAL:
+                    stack[code[ip] << 8 | code[ip + 1]] = stack[-1]
+                    ip += 2
+                elif op == GET_GLOBAL:
+                    value = globals[code[ip] << 8 | code[ip + 1]]
+                    if value is UNDEFINED:
+                        raise self.undefined(code, ip)
+                    push(value)
+                    ip += 2
+                elif op == DEFINE_GLOBAL:
+                    globals[code[ip] << 8 | code[ip + 1]] = pop()
+                    ip += 2
+                elif op == SET_GLOBAL:
+                    index = code[ip] << 8 | code[ip + 1]
+                    if globals[index] is UNDEFINED:
+                        raise self.undefined(code, ip)
+                    globals[index] = stack[-1]
+                    ip += 2
+                elif op == RETURN:
+                    return
+                else:
+                    right = pop()
+                    stack[-1] = binary_op(GENERIC_BINARY[op], stack[-1], right)
+        except Exception as e:
+            raise RuntimeError(f"{e}\n[line {chunk.line_at(ip - 1)}] in script") from e
+
+    def undefined(self, code: bytearray, ip: int) -> RuntimeError:
+        return undefined_variable(self.globals.name(code[ip] << 8 | code[ip + 1]))
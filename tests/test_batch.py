@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pylox.batch import (
+    EXIT_DATA_ERROR,
+    EXIT_OK,
+    EXIT_SOFTWARE,
+    expand,
+    run_batch,
+    run_script,
+    summary,
+)
+
+
+@pytest.fixture
+def scripts(tmp_path: Path) -> list[Path]:
+    paths: list[Path] = []
+    for index in range(6):
+        path = tmp_path / f"job{index}.lox"
+        _ = path.write_text(f"print {index} * 2;")
+        paths.append(path)
+    bad = tmp_path / "job6.lox"
+    _ = bad.write_text("print (;")
+    _ = (tmp_path / "notes.txt").write_text("not a script")
+    return [*paths, bad]
+
+
+def test_expand_directory_and_glob(tmp_path: Path, scripts: list[Path]):
+    assert expand(str(tmp_path)) == scripts
+    assert expand(str(tmp_path / "job[12].lox")) == scripts[1:3]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_results_are_captured_in_input_order(scripts: list[Path], jobs: int):
+    results = run_batch(list(reversed(scripts)), jobs)
+    assert [result.path for result in results] == [
+        str(path) for path in reversed(scripts)
+    ]
+    assert [result.stdout for result in results] == [
+        "",
+        *(f"{index * 2:.1f}\n" for index in reversed(range(6))),
+    ]
+    assert results[0].status == EXIT_DATA_ERROR
+    assert results[0].stderr == "No token found\n"
+    assert all(result.status == EXIT_OK for result in results[1:])
+
+
+def test_summary_is_json(scripts: list[Path]):
+    report = json.loads(summary(run_batch(scripts), 1.5))
+    assert report["failed"] == 1
+    assert report["seconds"] == 1.5
+    assert [script["status"] for script in report["scripts"]] == [0] * 6 + [65]
+
+
+@pytest.mark.parametrize("engine", ["tree", "cse", "closure", "vm", "python"])
+@pytest.mark.parametrize(
+    ("source", "stdout"),
+    [
+        ("print 1; print 1 / 0; print 2;", "1.0\nfloat division by zero\n"),
+        ("print 1; print x;", "1.0\nUndefined variable 'x'.\n"),
+    ],
+)
+def test_runtime_errors_fail(tmp_path: Path, engine: str, source: str, stdout: str):
+    path = tmp_path / "error.lox"
+    _ = path.write_text(source)
+    result = run_script(path, engine)
+    assert result.status == EXIT_SOFTWARE
+    # The python engine also reports the line, as the VM does.
+    assert result.stdout.startswith(stdout)
+    assert result.stderr == ""
+
+
+def test_scan_errors_are_data_errors(tmp_path: Path):
+    path = tmp_path / "unterminated.lox"
+    _ = path.write_text('print "abc;')
+    result = run_script(path)
+    assert result.status == EXIT_DATA_ERROR
+    assert result.stdout == ""
+    assert result.stderr != ""
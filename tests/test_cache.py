@@ -0,0 +1,150 @@
+import io
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from pylox.__main__ import run_file
+from pylox.cache import (
+    HEADER,
+    STALE_TEMP_SECONDS,
+    ProgramCache,
+    decode,
+    encode,
+)
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+
+GENERATED_TEST_CASE_COUNT: int = 50
+OPERATORS: list[str] = ["==", "!=", "<", "<=", ">", ">=", "+", "-", "*", "/"]
+SOURCE: str = 'print (1 + 2) * -3;\nprint "a" + "b" == nil;\n!true;\n'
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.15:
+        return random.choice(["1", "2.5", '"s"', "true", "false", "nil"])
+    match random.randint(0, 3):
+        case 0:
+            return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+        case 1:
+            return f"({generate_expression(depth - 1)})"
+        case _:
+            left = generate_expression(depth - 1)
+            right = generate_expression(depth - 1)
+            return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def parse(source: str):
+    return Parser(RegexScanner(source).scan_buffer()).parse()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        SOURCE,
+        "print price * (1 + rate);\nname;",
+        "var a;\nvar b = 1;\n{ var a = b = 2; { } print a; }\na = b;",
+    ]
+    + [
+        f"print {generate_expression(6)};\n{generate_expression(4)};"
+        for _ in range(GENERATED_TEST_CASE_COUNT)
+    ],
+)
+def test_decode_inverts_encode(source: str):
+    statements = parse(source)
+    assert decode(encode(statements)) == statements
+
+
+def test_deep_nesting_does_not_recurse():
+    depth = 5 * sys.getrecursionlimit()
+    code = encode(parse("(" * depth + "-1" + ")" * depth + ";"))
+    # Node equality itself recurses, so compare the flat encodings instead.
+    assert encode(decode(code)) == code
+
+
+def test_load_returns_stored_program(tmp_path: Path):
+    cache = ProgramCache(tmp_path)
+    key = cache.key(SOURCE)
+    assert cache.load(key, 1) is None
+    cache.store(key, 1, parse(SOURCE))
+    assert cache.load(key, 1) == parse(SOURCE)
+
+
+def test_key_depends_on_source_and_opt_level(tmp_path: Path):
+    cache = ProgramCache(tmp_path)
+    assert cache.key(SOURCE) != cache.key(SOURCE + " ")
+    assert cache.key(SOURCE, 0) != cache.key(SOURCE, 2)
+
+
+def test_mtime_mismatch_is_a_miss(tmp_path: Path):
+    cache = ProgramCache(tmp_path)
+    key = cache.key(SOURCE)
+    cache.store(key, 1, parse(SOURCE))
+    assert cache.load(key, 2) is None
+
+
+@pytest.mark.parametrize("contents", [b"", b"LOXC", b"garbage" * 10])
+def test_corrupted_entry_is_a_miss(tmp_path: Path, contents: bytes):
+    cache = ProgramCache(tmp_path)
+    key = cache.key(SOURCE)
+    cache.store(key, 1, parse(SOURCE))
+    path = cache.path(key)
+    _ = path.write_bytes(path.read_bytes()[: HEADER.size] + contents)
+    assert cache.load(key, 1) is None
+
+
+def test_eviction_keeps_cache_under_budget(tmp_path: Path):
+    cache = ProgramCache(tmp_path, max_bytes=1)
+    for index in range(3):
+        source = f"print {index};"
+        cache.store(cache.key(source), 1, parse(source))
+    assert list(tmp_path.glob("*.tmp")) == []
+    assert len(list(tmp_path.iterdir())) <= 1
+
+
+def test_failed_write_leaves_no_temporary_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    def fail(*_: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache = ProgramCache(tmp_path)
+    cache.store(cache.key(SOURCE), 1, parse(SOURCE))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_eviction_removes_stale_temporary_files(tmp_path: Path):
+    stale, fresh = tmp_path / "stale.tmp", tmp_path / "fresh.tmp"
+    for path in (stale, fresh):
+        _ = path.write_bytes(b"partial")
+    old = stale.stat().st_mtime - STALE_TEMP_SECONDS - 1
+    os.utime(stale, (old, old))
+    cache = ProgramCache(tmp_path)
+    cache.store(cache.key(SOURCE), 1, parse(SOURCE))
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".loxc", ".tmp"]
+    assert fresh.exists()
+
+
+def test_run_file_reuses_cached_program(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    script = tmp_path / "script.lox"
+    _ = script.write_text("print 1 + 2;\n")
+    cache = ProgramCache(tmp_path / "cache")
+    run_file(script.open(), cache=cache)
+    [entry] = (tmp_path / "cache").iterdir()
+    run_file(script.open(), cache=cache)
+    assert capsys.readouterr().out == "3.0\n3.0\n"
+    assert list((tmp_path / "cache").iterdir()) == [entry]
+
+
+def test_run_file_skips_cache_for_non_files(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    cache = ProgramCache(tmp_path)
+    run_file(io.StringIO("print 1;"), cache=cache)
+    assert capsys.readouterr().out == "1.0\n"
+    assert list(tmp_path.iterdir()) == []
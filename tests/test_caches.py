@@ -0,0 +1,134 @@
+from collections.abc import Callable
+
+import pytest
+
+from pylox.caches import (
+    MEGAMORPHIC,
+    MONOMORPHIC,
+    POLYMORPHIC,
+    POLYMORPHIC_LIMIT,
+    UNINITIALIZED,
+    PropertyCache,
+    SuperCache,
+)
+from pylox.objects import BoundMethod, LoxClass, LoxInstance
+from pylox.profiler import ProfilingInterpreter
+
+
+def method(result: str) -> Callable[[LoxInstance], str]:
+    return lambda this: result
+
+
+def call(callee: object, this: object) -> object:
+    assert callable(callee)
+    return callee(this)
+
+
+@pytest.fixture
+def brunch() -> LoxClass:
+    breakfast = LoxClass("Breakfast", methods={"serve": method("serve")})
+    return LoxClass("Brunch", breakfast, {"drink": method("drink")})
+
+
+def test_monomorphic_site(brunch: LoxClass):
+    cache = PropertyCache("serve")
+    assert cache.state == UNINITIALIZED
+    instances = [LoxInstance(brunch) for _ in range(3)]
+    callees = [cache.callee(instance) for instance in instances]
+    assert [(call(callee, this), this) for callee, this in callees] == [
+        ("serve", instance) for instance in instances
+    ]
+    assert (cache.state, cache.hits, cache.misses) == (MONOMORPHIC, 2, 1)
+
+
+def test_get_binds_methods_and_reads_fields(brunch: LoxClass):
+    instance = LoxInstance(brunch)
+    bound = PropertyCache("drink").get(instance)
+    assert isinstance(bound, BoundMethod)
+    assert bound.receiver is instance
+    instance.set("drink", "coffee")
+    assert PropertyCache("drink").get(instance) == "coffee"
+    assert PropertyCache("drink").callee(instance) == ("coffee", None)
+
+
+def test_new_shape_misses(brunch: LoxClass):
+    cache = PropertyCache("drink")
+    instance = LoxInstance(brunch)
+    _ = cache.get(instance)
+    # A field named like the method now shadows it.
+    instance.set("drink", "tea")
+    assert cache.get(instance) == "tea"
+    assert cache.get(LoxInstance(brunch)) != "tea"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_polymorphic_then_megamorphic():
+    cache = PropertyCache("x")
+    classes = [LoxClass(f"C{index}") for index in range(POLYMORPHIC_LIMIT + 1)]
+    instances: list[LoxInstance] = []
+    for index, klass in enumerate(classes):
+        instance = LoxInstance(klass)
+        instance.set("x", index)
+        instances.append(instance)
+    for instance in instances[:POLYMORPHIC_LIMIT]:
+        _ = cache.get(instance)
+    assert cache.state == POLYMORPHIC
+    assert [cache.get(instance) for instance in instances[:POLYMORPHIC_LIMIT]] == [
+        0,
+        1,
+        2,
+        3,
+    ]
+    assert cache.hits == POLYMORPHIC_LIMIT
+    assert cache.get(instances[-1]) == POLYMORPHIC_LIMIT
+    assert cache.state == MEGAMORPHIC
+    _ = cache.get(instances[-1])
+    assert cache.misses == POLYMORPHIC_LIMIT + 2
+
+
+def test_changing_a_superclass_invalidates(brunch: LoxClass):
+    breakfast = brunch.superclass
+    assert breakfast is not None
+    cache = PropertyCache("serve")
+    instance = LoxInstance(brunch)
+    callee, _ = cache.callee(instance)
+    breakfast.define_method("serve", method("served again"))
+    callee, this = cache.callee(instance)
+    assert call(callee, this) == "served again"
+    brunch.define_method("serve", method("overridden"))
+    callee, this = cache.callee(instance)
+    assert call(callee, this) == "overridden"
+    assert cache.misses == 3
+    brunch.remove_method("serve")
+    breakfast.remove_method("serve")
+    with pytest.raises(RuntimeError, match="Undefined property 'serve'."):
+        _ = cache.callee(instance)
+
+
+def test_super_cache(brunch: LoxClass):
+    breakfast = brunch.superclass
+    assert breakfast is not None
+    cache = SuperCache(breakfast, "serve")
+    assert cache.find() is cache.find()
+    breakfast.define_method("serve", method("again"))
+    assert call(cache.find(), None) == "again"
+    assert (cache.state, cache.hits, cache.misses) == (MONOMORPHIC, 1, 2)
+    with pytest.raises(RuntimeError, match="Undefined property 'drink'."):
+        _ = SuperCache(breakfast, "drink").find()
+
+
+def test_profiler_reports_caches_in_use(brunch: LoxClass):
+    cache = PropertyCache("serve", "line 3 .serve")
+    _ = cache.get(LoxInstance(brunch))
+    _ = cache.get(LoxInstance(brunch))
+    table = ProfilingInterpreter().tables()[-1]
+    assert table.title == "Inline caches"
+    assert [list(column.cells) for column in table.columns] == [
+        ["line 3 .serve"],
+        [MONOMORPHIC],
+        ["1"],
+        ["1"],
+        ["50.0%"],
+    ]
+    del cache
+    assert len(ProfilingInterpreter().tables()) == 3
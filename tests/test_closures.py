@@ -0,0 +1,36 @@
+import pytest
+
+from pylox.closures import ClosureInterpreter
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import Scanner
+
+PROGRAMS: list[str] = [
+    "print 1 + 2 * 3 - 4 / 2;",
+    "print -(3 * 2); print -nil; print -true;",
+    "print !nil; print !true; print !0;",
+    'print "a" + "b"; print "a" + 1; print true + 1;',
+    "print 1 < 2; print 2 <= 2; print 3 > 4; print 3 >= 4; print nil < 1;",
+    'print nil == nil; print nil != nil; print true == 1; print "a" == "a";',
+    "print 1; print 1 / 0; print 2;",
+]
+
+
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_closures_match_interpreter(source: str, capsys: pytest.CaptureFixture[str]):
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Interpreter().interpret(statements)
+    expected = capsys.readouterr().out
+    ClosureInterpreter().interpret(statements)
+    assert capsys.readouterr().out == expected
+
+
+# The value is assigned before the undefined target is reported.
+def test_assignment_evaluates_value_first(capsys: pytest.CaptureFixture[str]):
+    statements = Parser(Scanner("var b = 0; a = b = 1;").scan_tokens()).parse()
+    interpreter = Interpreter()
+    interpreter.interpret(statements)
+    closures = ClosureInterpreter()
+    closures.interpret(statements)
+    assert closures.compiler.globals["b"] == interpreter.globals["b"] == 1.0
+    assert capsys.readouterr().out == "Undefined variable 'a'.\n" * 2
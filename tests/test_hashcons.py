@@ -0,0 +1,174 @@
+import io
+import random
+
+import pytest
+
+from pylox import expr, stmt
+from pylox.cse import MemoizingInterpreter, common_subexpressions
+from pylox.hashcons import InterningFactory
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+
+GENERATED_TEST_CASE_COUNT: int = 50
+OPERATORS: list[str] = ["==", "!=", "<", "+", "-", "*"]
+
+
+def parse(source: str, factory: InterningFactory | None = None) -> list[stmt.Stmt]:
+    return Parser(RegexScanner(source).scan_buffer(), factory).parse()
+
+
+def printed(statement: stmt.Stmt) -> expr.Expr:
+    assert isinstance(statement, stmt.Print)
+    return statement.expr
+
+
+def run(engine: type[Interpreter], source: str) -> str:
+    stdout = io.StringIO()
+    engine(stdout=stdout).interpret(parse(source))
+    return stdout.getvalue()
+
+
+def generate_expression(pool: list[str], depth: int) -> str:
+    if depth == 0 or random.random() < 0.2:
+        return random.choice(pool)
+    left = generate_expression(pool, depth - 1)
+    right = generate_expression(pool, depth - 1)
+    return f"({left} {random.choice(OPERATORS)} {right})"
+
+
+def test_identical_subtrees_are_one_node():
+    factory = InterningFactory()
+    first, second = parse("print (1 + 2) * 3;\nprint (1 + 2) * 3;", factory)
+    assert printed(first) is printed(second)
+    assert factory.lines_of(printed(first)) == [1, 2]
+
+
+def test_signed_zero_is_not_shared():
+    statement = parse("print 0 - -0;", InterningFactory())[0]
+    node = printed(statement)
+    assert isinstance(node, expr.Binary)
+    assert node.left is not node.right
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "var x = 1;\nprint x + 1;\nvar x = 2;\nprint x + 1;",
+        "var x = 1;\nprint x + 1;\n{ var x = 2; print x + 1; }",
+        "var x = 1;\n{ print x + 1; }\nprint x + 1;",
+    ],
+)
+def test_variables_are_not_shared_across_scopes(source: str):
+    factory = InterningFactory()
+    prints: list[expr.Expr] = []
+    pending = parse(source, factory)
+    while pending:
+        match pending.pop(0):
+            case stmt.Print(node):
+                prints.append(node)
+            case stmt.Block(statements):
+                pending[:0] = statements
+            case _:
+                pass
+    assert prints[0] is not prints[1]
+
+
+# The initializer sees the name as declared but not yet defined, so it may
+# not reuse a node from before the declaration either.
+def test_initializers_do_not_share_variables_from_before():
+    (block,) = parse("var x = 1;\n{ print x + 1; var x = x + 1; }", InterningFactory())[
+        1:
+    ]
+    assert isinstance(block, stmt.Block)
+    before, declaration = block.statements
+    assert isinstance(declaration, stmt.Var)
+    assert printed(before) is not declaration.initializer
+
+
+def test_assignments_are_not_shared():
+    node = printed(parse("var a;\nprint (a = 1) + (a = 1);", InterningFactory())[1])
+    assert isinstance(node, expr.Binary)
+    assert node.left is not node.right
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("print (1 + 2) * (1 + 2);", 1),
+        ("print ((1 + 2) * 3) - ((1 + 2) * 3);", 1),
+        ("print 1 + 2;", 0),
+        ("var a = 1;\nprint (a + 1) * (a + 1);", 1),
+        ("var a = 1;\nprint (a + 1) * ((a = 2) + 1);", 0),
+    ],
+)
+def test_common_subexpressions(source: str, expected: int):
+    statement = parse(source, InterningFactory())[-1]
+    assert len(common_subexpressions(statement)) == expected
+
+
+def test_repeated_subexpression_is_evaluated_once(monkeypatch: pytest.MonkeyPatch):
+    stdout = io.StringIO()
+    interpreter = MemoizingInterpreter(stdout=stdout)
+    evaluated: list[expr.Binary] = []
+    visit = interpreter.visit_binary_expr
+
+    def counting(node: expr.Binary) -> object:
+        evaluated.append(node)
+        return visit(node)
+
+    monkeypatch.setattr(interpreter, "visit_binary_expr", counting)
+    interpreter.interpret(
+        parse("var x = 2;\nprint ((x * 3) + (x * 3)) * ((x * 3) + (x * 3));")
+    )
+    assert len(evaluated) == 3
+    assert stdout.getvalue() == "144.0\n"
+
+
+def test_statements_from_the_engines_factory_are_used_as_they_are(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    factory = InterningFactory()
+    statements = parse("var x = 2;\nprint (x * 3) + (x * 3);", factory)
+
+    def share(self: InterningFactory, statement: stmt.Stmt) -> stmt.Stmt:
+        raise AssertionError("shared again")
+
+    monkeypatch.setattr(InterningFactory, "share", share)
+    stdout = io.StringIO()
+    MemoizingInterpreter(None, stdout, factory=factory).interpret(statements)
+    assert stdout.getvalue() == "12.0\n"
+
+
+def test_trim_forgets_shared_nodes_past_the_limit():
+    factory = InterningFactory()
+    for value in range(10):
+        _ = factory.literal(float(value))
+    factory.trim(limit=10)
+    assert len(factory.constant) == 10
+    _ = factory.literal(10.0)
+    factory.trim(limit=10)
+    assert not factory.constant
+    assert not factory.variable_free
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "var x = 2;\nprint (x * 2) + (x * 2);\nx = 5;\nprint (x * 2) + (x * 2);",
+        "var x = 1;\nprint (x = x + 1) + (x = x + 1);\nprint x;",
+        "var x = 1;\n{ var y = x + 1; print (y + x) * (y + x); }\nprint x + 1;",
+        "{ var a = 1; print missing + a; }\nprint a;",
+        'var a = 5; { print "s" == (0) <= a; var a = !!"s" >= a; print a; }',
+    ]
+    + [
+        "var x = 3;\nvar y = true;\n"
+        + "".join(
+            f"print {generate_expression(['x', 'y', '1', '2.5', '(x + 1)', '(y == x)'], 5)};\n"
+            for _ in range(3)
+        )
+        for _ in range(GENERATED_TEST_CASE_COUNT)
+    ],
+)
+def test_matches_tree_interpreter(source: str):
+    assert run(MemoizingInterpreter, source) == run(Interpreter, source)
@@ -0,0 +1,84 @@
+import io
+import random
+import sys
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.iterative import IterativeInterpreter
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.scanner import RegexScanner
+
+GENERATED_TEST_CASE_COUNT: int = 50
+OPERATORS: list[str] = ["==", "!=", "<", "<=", ">", ">=", "+", "-", "*"]
+DEPTH: int = 5 * sys.getrecursionlimit()
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.15:
+        return random.choice(["1", "2.5", '"s"', "true", "false", "nil", "x"])
+    match random.randint(0, 3):
+        case 0:
+            return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+        case 1:
+            return f"({generate_expression(depth - 1)})"
+        case _:
+            left = generate_expression(depth - 1)
+            right = generate_expression(depth - 1)
+            return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def run(engine: type[Interpreter], source: str) -> str:
+    stdout = io.StringIO()
+    engine(stdout=stdout).interpret(Parser(RegexScanner(source).scan_buffer()).parse())
+    return stdout.getvalue()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "var x = 2;\n{ var y = x = x + 1; { print y * x; } }\nprint x;",
+        "{ var a = 1; print missing; }\nprint a;",
+        "var x = 1;\nprint -(x = 3) + x;",
+    ]
+    + [
+        f"var x = 3;\nprint {generate_expression(6)};\n{{ var x = {generate_expression(4)};"
+        f" print x; }}"
+        for _ in range(GENERATED_TEST_CASE_COUNT)
+    ],
+)
+def test_matches_recursive_interpreter(source: str):
+    assert run(IterativeInterpreter, source) == run(Interpreter, source)
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("print " + " + ".join(["1"] * DEPTH) + ";", f"{float(DEPTH)}\n"),
+        ("print " + "(" * DEPTH + "-2" + ")" * DEPTH + ";", "-2.0\n"),
+        ("print " + "!" * DEPTH + "true;", "True\n"),
+        ("var a;\n" + "a = " * DEPTH + '"deep";\nprint a;', "deep\n"),
+        ("{ " * DEPTH + "print 1;" + " }" * DEPTH, "1.0\n"),
+    ],
+    ids=["chain", "grouping", "not", "assignment", "blocks"],
+)
+def test_depth_is_not_limited_by_python_stack(source: str, expected: str):
+    assert run(IterativeInterpreter, source) == expected
+
+
+def test_resolver_handles_deep_blocks():
+    source = "{ var a = 1; " * DEPTH + "print a;" + " }" * DEPTH
+    resolver = Resolver()
+    for statement in Parser(RegexScanner(source).scan_buffer()).parse():
+        resolver.resolve(statement)
+    assert len(resolver.frame_sizes) == DEPTH
+
+
+def test_error_restores_frame():
+    interpreter = IterativeInterpreter(stdout=io.StringIO())
+    frame = interpreter.frame
+    interpreter.interpret(
+        Parser(RegexScanner("{ { var a = 1; a = missing; } }").scan_buffer()).parse()
+    )
+    assert interpreter.frame is frame
@@ -0,0 +1,80 @@
+import pytest
+
+from pylox.objects import FieldCache, LoxClass, LoxInstance
+
+
+def breakfast(klass: LoxClass, meat: str, bread: str) -> LoxInstance:
+    instance = LoxInstance(klass)
+    instance.set("meat", meat)
+    instance.set("bread", bread)
+    return instance
+
+
+def test_fields_live_in_slots():
+    instance = breakfast(LoxClass("Breakfast"), "sausage", "sourdough")
+    assert instance.values == ["sausage", "sourdough"]
+    assert instance.shape.slots == {"meat": 0, "bread": 1}
+    instance.set("meat", "bacon")
+    assert instance.get("meat") == "bacon"
+    assert instance.values == ["bacon", "sourdough"]
+    assert str(instance) == "Breakfast instance"
+
+
+def test_instances_built_alike_share_a_shape():
+    klass = LoxClass("Breakfast")
+    first = breakfast(klass, "sausage", "sourdough")
+    second = breakfast(klass, "bacon", "toast")
+    assert first.shape is second.shape
+    assert klass.shape.add("meat").add("bread") is first.shape
+
+
+@pytest.mark.parametrize(
+    ("fields", "shared"),
+    [(["bread", "meat"], False), (["meat"], False), (["meat", "bread"], True)],
+)
+def test_field_order_decides_shape(fields: list[str], shared: bool):
+    klass = LoxClass("Breakfast")
+    other = LoxInstance(klass)
+    for field in fields:
+        other.set(field, None)
+    assert (other.shape is breakfast(klass, "a", "b").shape) == shared
+
+
+def test_classes_do_not_share_shapes():
+    assert (
+        breakfast(LoxClass("A"), "a", "b").shape
+        is not breakfast(LoxClass("B"), "a", "b").shape
+    )
+
+
+def test_undefined_property():
+    instance = LoxInstance(LoxClass("Breakfast"))
+    with pytest.raises(RuntimeError, match="Undefined property 'meat'."):
+        _ = instance.get("meat")
+    with pytest.raises(RuntimeError, match="Undefined property 'meat'."):
+        _ = FieldCache("meat").get(instance)
+
+
+def test_field_cache_follows_shapes():
+    klass = LoxClass("Breakfast")
+    store_meat, store_bread = FieldCache("meat"), FieldCache("bread")
+    load_bread = FieldCache("bread")
+    instances = [LoxInstance(klass) for _ in range(3)]
+    for index, instance in enumerate(instances):
+        store_meat.set(instance, f"meat{index}")
+        store_bread.set(instance, f"bread{index}")
+    assert store_bread.added is instances[0].shape
+    assert len({id(instance.shape) for instance in instances}) == 1
+    assert [load_bread.get(instance) for instance in instances] == [
+        "bread0",
+        "bread1",
+        "bread2",
+    ]
+    assert load_bread.shape is instances[0].shape
+    # Another layout misses and is cached in its turn.
+    reordered = LoxInstance(klass)
+    reordered.set("bread", "rye")
+    assert load_bread.get(reordered) == "rye"
+    assert load_bread.slot == 0
+    store_bread.set(instances[0], "toast")
+    assert instances[0].values == ["meat0", "toast"]
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from pylox.expr import AstPrinter, Binary, Literal
+from pylox.interpreter import Interpreter
+from pylox.optimizer import optimize
+from pylox.parser import Parser
+from pylox.scanner import Scanner
+from pylox.stmt import Print, Stmt
+
+GENERATED_TEST_CASE_COUNT: int = 100
+OPERANDS: list[str] = ["0", "1", "2", "-0", '"a"', "true", "false", "nil"]
+OPERATORS: list[str] = ["+", "-", "*", "/", "<", ">=", "==", "!="]
+
+
+def parse(source: str) -> list[Stmt]:
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.2:
+        return random.choice(OPERANDS)
+    if random.random() < 0.2:
+        return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+    left = generate_expression(depth - 1)
+    right = generate_expression(depth - 1)
+    return f"({left} {random.choice(OPERATORS)} {right})"
+
+
+def output_of(statements: list[Stmt], capsys: pytest.CaptureFixture[str]) -> str:
+    Interpreter().interpret(statements)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("level", [1, 2])
+@pytest.mark.parametrize(
+    "source",
+    [f"print {generate_expression(4)};" for _ in range(GENERATED_TEST_CASE_COUNT)],
+)
+def test_optimizer_preserves_semantics(
+    source: str, level: int, capsys: pytest.CaptureFixture[str]
+):
+    statements = parse(source)
+    optimized, _ = optimize(statements, level)
+    assert output_of(optimized, capsys) == output_of(statements, capsys)
+
+
+def test_constant_folding():
+    optimized, removed = optimize(parse("print (60 * 60 * 24) * 2;"), 1)
+    assert optimized == [Print(Literal(172800.0))]
+    assert removed == 7
+
+
+def test_division_by_zero_is_left_to_runtime():
+    optimized, _ = optimize(parse("print 1 / 0;"), 1)
+    assert isinstance(optimized[0], Print)
+    assert isinstance(optimized[0].expr, Binary)
+
+
+def test_literal_expression_statements_are_dropped():
+    optimized, _ = optimize(parse('"some expression"; 1 + 2; print 3;'), 1)
+    assert optimized == [Print(Literal(3.0))]
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("print (1 / 0 - 2) * 1;", "(- (/ 1.0 0.0) 2.0)"),
+        ("print 1 * (1 / 0);", "(/ 1.0 0.0)"),
+        ("print --(1 / 0);", "(/ 1.0 0.0)"),
+        ("print !!(1 / 0 == 2);", "(== (/ 1.0 0.0) 2.0)"),
+        # A comparison may be `nil`, so `!!` must stay.
+        ("print !!(1 / 0 < 2);", "(! (! (< (/ 1.0 0.0) 2.0)))"),
+    ],
+)
+def test_algebraic_simplification(source: str, expected: str):
+    optimized, _ = optimize(parse(source), 2)
+    assert isinstance(optimized[0], Print)
+    assert AstPrinter().print(optimized[0].expr) == expected
+
+
+def test_deep_expressions_are_folded():
+    depth = 20_000
+    optimized, removed = optimize(parse("print " + "1 + " * depth + "1;"), 1)
+    assert optimized == [Print(Literal(depth + 1.0))]
+    assert removed == 2 * depth
+
+
+def test_blocks_too_deep_to_optimize_are_kept():
+    source = "{" * 3000 + "print 1 + 1;" + "}" * 3000
+    statements = parse(source)
+    optimized, removed = optimize(statements, 1)
+    assert optimized == statements
+    assert removed == 0
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from pylox.closures import ClosureInterpreter
+from pylox.interpreter import Interpreter
+from pylox.iterative import IterativeInterpreter
+from pylox.output import FdSink, MemorySink, StreamSink, sink, standard_output
+from pylox.parser import Parser
+from pylox.rope import concat
+from pylox.scanner import RegexScanner
+from pylox.vm import VM
+
+SOURCE: str = 'print 1;\nprint "a" + "b";\nprint 1 < 2;\nprint nil;\nprint missing;'
+EXPECTED: str = "1.0\nab\nTrue\nNone\nUndefined variable 'missing'.\n"
+
+
+def test_values_are_converted_at_flush():
+    output = MemorySink()
+    for value in [1.5, -0.0, True, None, "text", concat("a" * 300, "b")]:
+        output.write(value)
+    assert output.pending
+    assert output.getvalue() == f"1.5\n-0.0\nTrue\nNone\ntext\n{'a' * 300}b\n"
+    assert not output.pending
+
+
+def test_full_buffer_is_written():
+    stream = io.StringIO()
+    output = StreamSink(stream, buffer_lines=3)
+    for value in range(7):
+        output.write(value)
+    assert stream.getvalue() == "0\n1\n2\n3\n4\n5\n"
+    output.flush()
+    output.flush()
+    assert stream.getvalue() == "".join(f"{value}\n" for value in range(7))
+
+
+def test_stream_sink_follows_sys_stdout():
+    output = StreamSink()
+    output.write("before")
+    redirected = io.StringIO()
+    with contextlib.redirect_stdout(redirected):
+        output.flush()
+    assert redirected.getvalue() == "before\n"
+
+
+def test_fd_sink(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        output = FdSink(fd, buffer_lines=2)
+        for value in ["é", 2.0, "x" * 100_000]:
+            output.write(value)
+        output.flush()
+    finally:
+        os.close(fd)
+    assert path.read_text(encoding="utf-8") == f"é\n2.0\n{'x' * 100_000}\n"
+
+
+def test_sink_wraps_streams():
+    output = MemorySink()
+    assert sink(output) is output
+    assert isinstance(sink(io.StringIO()), StreamSink)
+    assert isinstance(sink(None), StreamSink)
+
+
+def test_standard_output_respects_redirection():
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert isinstance(standard_output(), StreamSink)
+
+
+@pytest.mark.parametrize(
+    "engine", [Interpreter, IterativeInterpreter, ClosureInterpreter, VM]
+)
+def test_engines_write_to_sink(
+    engine: type[Interpreter | ClosureInterpreter | VM],
+):
+    statements = Parser(RegexScanner(SOURCE).scan_buffer()).parse()
+    output = MemorySink()
+    engine(None, output).interpret(statements)
+    assert output.getvalue().startswith(EXPECTED)
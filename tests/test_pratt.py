@@ -0,0 +1,62 @@
+import random
+import sys
+
+import pytest
+
+from pylox.parser import Parser, RecursiveDescentParser
+from pylox.scanner import RegexScanner
+
+GENERATED_TEST_CASE_COUNT: int = 100
+OPERATORS: list[str] = ["==", "!=", "<", "<=", ">", ">=", "+", "-", "*", "/"]
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.15:
+        return random.choice(["1", "2.5", '"s"', "true", "false", "nil"])
+    match random.randint(0, 3):
+        case 0:
+            return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+        case 1:
+            return f"({generate_expression(depth - 1)})"
+        case _:
+            left = generate_expression(depth - 1)
+            right = generate_expression(depth - 1)
+            return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def outcome(parser: Parser) -> object:
+    try:
+        return parser.parse()
+    except RuntimeError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [f"print {generate_expression(6)};" for _ in range(GENERATED_TEST_CASE_COUNT)],
+)
+def test_matches_recursive_descent(source: str):
+    tokens = RegexScanner(source).scan_tokens()
+    assert Parser(tokens).parse() == RecursiveDescentParser(tokens).parse()
+
+
+@pytest.mark.parametrize(
+    "source", ["print (1 + 2;", "print 1 +;", "print );", "print (1));", "print ();"]
+)
+def test_errors_match_recursive_descent(source: str):
+    tokens = RegexScanner(source).scan_tokens()
+    assert outcome(Parser(tokens)) == outcome(RecursiveDescentParser(tokens))
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "(" * 5 * sys.getrecursionlimit() + "1" + ")" * 5 * sys.getrecursionlimit(),
+        "-" * 5 * sys.getrecursionlimit() + "1",
+        " + ".join(["1"] * 5 * sys.getrecursionlimit()),
+    ],
+    ids=["grouping", "unary", "binary"],
+)
+def test_deep_nesting_does_not_recurse(source: str):
+    statements = Parser(RegexScanner(f"{source};").scan_buffer()).parse()
+    assert len(statements) == 1
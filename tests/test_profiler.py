@@ -0,0 +1,55 @@
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.profiler import ProfilingInterpreter
+from pylox.scanner import RegexScanner
+from pylox.token import TokenType
+
+SOURCE: str = 'print 1 + 2 *\n3;\n-4 == 5;\nprint "a";\n'
+
+
+def parse(source: str):
+    return Parser(RegexScanner(source).scan_buffer()).parse()
+
+
+def test_output_matches_interpreter(capsys: pytest.CaptureFixture[str]):
+    Interpreter().interpret(parse(SOURCE))
+    expected = capsys.readouterr().out
+    ProfilingInterpreter().interpret(parse(SOURCE))
+    assert capsys.readouterr().out == expected
+
+
+def test_counts_per_node_type_operator_and_line():
+    profiler = ProfilingInterpreter()
+    profiler.interpret(parse(SOURCE))
+    counts = {name: stats.count for name, stats in profiler.node_types.items()}
+    assert counts == {
+        "Print": 2,
+        "Expression": 1,
+        "Binary": 3,
+        "Unary": 1,
+        "Literal": 6,
+    }
+    assert {op: stats.count for op, stats in profiler.operators.items()} == {
+        TokenType.PLUS: 1,
+        TokenType.STAR: 1,
+        TokenType.EQUAL_EQUAL: 1,
+        TokenType.MINUS: 1,
+    }
+    assert {line: stats.count for line, stats in profiler.lines.items()} == {
+        1: 6,
+        3: 5,
+        None: 2,
+    }
+
+
+def test_self_time_excludes_children():
+    profiler = ProfilingInterpreter()
+    profiler.interpret(parse("print ((1 + 2) * (3 - 4)) / 5;"))
+    for stats in profiler.node_types.values():
+        assert 0 <= stats.self_time <= stats.total
+    print_stats = profiler.node_types["Print"]
+    nested = sum(s.self_time for n, s in profiler.node_types.items() if n != "Print")
+    assert print_stats.total == pytest.approx(print_stats.self_time + nested)
+    assert len(profiler.tables()) == 3
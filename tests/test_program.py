@@ -0,0 +1,52 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pylox
+from pylox.closures import ClosureInterpreter
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.vm import VM
+
+
+def run(program: pylox.Program, **globals: object) -> str:
+    stdout = io.StringIO()
+    program.run(globals, stdout=stdout)
+    return stdout.getvalue()
+
+
+def test_program_runs_many_times_with_different_globals():
+    program = pylox.compile('print price * (1 + rate);\nprint name + "!";')
+    assert run(program, price=10.0, rate=0.5, name="a") == "15.0\na!\n"
+    assert run(program, price=2.0, rate=1.0, name="b") == "4.0\nb!\n"
+
+
+def test_program_writes_to_stdout_argument(capsys: pytest.CaptureFixture[str]):
+    program = pylox.compile("print 1 + 2;")
+    assert run(program) == "3.0\n"
+    program.run()
+    assert capsys.readouterr().out == "3.0\n"
+
+
+def test_undefined_variable_raises():
+    program = pylox.compile("print missing;")
+    with pytest.raises(RuntimeError, match="Undefined variable 'missing'."):
+        program.run()
+
+
+def test_runs_do_not_share_state():
+    program = pylox.compile("print x * x;")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(lambda x: run(program, x=float(x)), range(200)))
+    assert outputs == [f"{float(x * x)}\n" for x in range(200)]
+
+
+@pytest.mark.parametrize("engine", [Interpreter, ClosureInterpreter, VM])
+def test_engines_read_globals(engine: type[Interpreter | ClosureInterpreter | VM]):
+    statements = Parser(RegexScanner("print -x + y;\nprint z;").scan_buffer()).parse()
+    stdout = io.StringIO()
+    engine({"x": 2.0, "y": 5.0}, stdout).interpret(statements)
+    # The VM also reports the failing line.
+    assert stdout.getvalue().startswith("3.0\nUndefined variable 'z'.")
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.quicken import MAX_DEOPTIMIZATIONS, SpecializingInterpreter
+from pylox.scanner import RegexScanner
+
+GENERATED_TEST_CASE_COUNT: int = 50
+OPERATORS: list[str] = ["==", "!=", "<", "<=", ">", ">=", "+", "-", "*"]
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.15:
+        return random.choice(["1", "2.5", '"s"', "true", "false", "nil", "x"])
+    match random.randint(0, 3):
+        case 0:
+            return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+        case 1:
+            return f"({generate_expression(depth - 1)})"
+        case _:
+            left = generate_expression(depth - 1)
+            right = generate_expression(depth - 1)
+            return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def parse(source: str):
+    return Parser(RegexScanner(source).scan_buffer()).parse()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [f"print {generate_expression(5)};" for _ in range(GENERATED_TEST_CASE_COUNT)],
+)
+def test_matches_interpreter_as_types_change(
+    source: str, capsys: pytest.CaptureFixture[str]
+):
+    statements = parse(source)
+    bindings = [2.0, 2.0, 2.0, "s", "s", True, None, 3.0, 3.0]
+    expected = Interpreter({})
+    specializing = SpecializingInterpreter({})
+    for value in bindings:
+        expected.globals["x"] = value
+        expected.interpret(statements)
+    reference = capsys.readouterr().out
+    for value in bindings:
+        specializing.globals["x"] = value
+        specializing.interpret(statements)
+    assert capsys.readouterr().out == reference
+
+
+def test_counts_specialized_sites(capsys: pytest.CaptureFixture[str]):
+    statements = parse('print 1 + 2 * 3;\nprint "a" + "b";\nprint -(4 / 2);')
+    interpreter = SpecializingInterpreter()
+    for _ in range(3):
+        interpreter.interpret(statements)
+    assert interpreter.counters() == {
+        "sites": 5,
+        "specialized": 5,
+        "generic": 0,
+        "specializations": 5,
+        "deoptimizations": 0,
+    }
+    assert capsys.readouterr().out == "7.0\nab\n-2.0\n" * 3
+
+
+def test_wrong_guess_deoptimizes_then_gives_up(capsys: pytest.CaptureFixture[str]):
+    statements = parse("print x + x;")
+    interpreter = SpecializingInterpreter({})
+    for value in [1.0, 1.0, "a", "a"] * MAX_DEOPTIMIZATIONS + [1.0, 1.0, 1.0]:
+        interpreter.globals["x"] = value
+        interpreter.interpret(statements)
+    counters = interpreter.counters()
+    assert counters["deoptimizations"] == MAX_DEOPTIMIZATIONS
+    assert counters["generic"] == 1
+    assert counters["specialized"] == 0
+    assert capsys.readouterr().out.split() == (
+        ["2.0", "2.0", "aa", "aa"] * MAX_DEOPTIMIZATIONS + ["2.0"] * 3
+    )
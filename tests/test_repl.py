@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.repl import ReplSession, is_exit, run_plain
+
+
+def test_session_keeps_one_interpreter(capsys: pytest.CaptureFixture[str]):
+    interpreter = Interpreter()
+    session = ReplSession(interpreter)
+    _ = session.run("print 1 + 2;")
+    _ = session.run('print "a" + "b";')
+    assert session.interpreter is interpreter
+    assert capsys.readouterr().out == "3.0\nab\n"
+
+
+def test_repeated_lines_are_parsed_once():
+    session = ReplSession()
+    first = session.parse("print 1;")
+    assert session.parse("print 1;") is first
+
+
+def test_parse_cache_evicts_least_recently_used():
+    session = ReplSession(cache_size=2)
+    _ = session.parse("1;")
+    _ = session.parse("2;")
+    _ = session.parse("1;")
+    _ = session.parse("3;")
+    assert list(session.parsed) == ["1;", "3;"]
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [("exit", True), ("  exit;", True), ("exits;", False), ("print 1;", False)],
+)
+def test_is_exit(line: str, expected: bool):
+    assert is_exit(line) == expected
+
+
+def test_plain_mode_prints_only_program_output(capsys: pytest.CaptureFixture[str]):
+    stdin = io.StringIO("print 1;\n\nprint (;\nprint 2;\nexit\nprint 3;\n")
+    run_plain(ReplSession(), stdin)
+    captured = capsys.readouterr()
+    assert captured.out == "1.0\n2.0\n"
+    assert captured.err == "No token found\n"
+
+
+@pytest.mark.parametrize("bad", ['print "abc', "print @;"])
+def test_scan_errors_do_not_end_the_session(
+    bad: str, capsys: pytest.CaptureFixture[str]
+):
+    run_plain(ReplSession(), io.StringIO(f"print 1;\n{bad}\nprint 2;\n"))
+    captured = capsys.readouterr()
+    assert captured.out == "1.0\n2.0\n"
+    assert "parsing errors" in captured.err
@@ -0,0 +1,169 @@
+import io
+
+import pytest
+
+import pylox
+from pylox import expr, stmt
+from pylox.closures import ClosureInterpreter
+from pylox.environment import GlobalTable
+from pylox.interpreter import Interpreter
+from pylox.iterative import IterativeInterpreter
+from pylox.parser import Parser, RecursiveDescentParser
+from pylox.quicken import SpecializingInterpreter
+from pylox.resolver import GLOBAL, Resolver
+from pylox.scanner import RegexScanner
+from pylox.transpile import TranspilingInterpreter
+from pylox.vm import VM
+
+ENGINES = [Interpreter, SpecializingInterpreter, ClosureInterpreter, VM]
+SCOPES: str = """
+var a = "global a";
+var b = "global b";
+{
+  var a = "outer a";
+  {
+    var a = "inner a";
+    print a;
+    print b;
+    b = "changed";
+  }
+  print a;
+  var c = a = "again";
+  print c + a;
+}
+print a;
+print b;
+"""
+
+
+def parse(source: str) -> list[stmt.Stmt]:
+    return Parser(RegexScanner(source).scan_buffer()).parse()
+
+
+def run(engine: type, source: str) -> str:
+    stdout = io.StringIO()
+    engine(stdout=stdout).interpret(parse(source))
+    return stdout.getvalue()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_agree_on_scoping(engine: type):
+    assert run(engine, SCOPES) == (
+        "inner a\nglobal b\nouter a\nagainagain\nglobal a\nchanged\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigning_undefined_global_fails(engine: type):
+    assert run(engine, "x = 1;").startswith("Undefined variable 'x'.")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_locals_do_not_leak(engine: type):
+    assert run(engine, "{ var x = 1; }\nprint x;").startswith("Undefined variable 'x'.")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assignment_in_own_initializer_uses_its_slot(engine: type):
+    source = "{ var x = 1; { var y = 2; var a = a = 5; print x; print a + y; } }"
+    assert run(engine, source) == "1.0\n7.0\n"
+
+
+@pytest.mark.parametrize(
+    "engine", [*ENGINES, IterativeInterpreter, TranspilingInterpreter]
+)
+def test_resolutions_are_released_once_run(engine: type):
+    interpreter = engine(stdout=io.StringIO())
+    interpreter.interpret(parse(SCOPES))
+    resolver: Resolver = getattr(interpreter, "compiler", interpreter).resolver
+    assert resolver.slots == {}
+    assert resolver.frame_sizes == {}
+    assert set(resolver.global_names) == {"a", "b"}
+
+
+def test_slots_and_frame_sizes():
+    (block,) = parse("{ var a = 1; var b; { print a + b; } }")
+    resolver = Resolver()
+    resolver.resolve(block)
+    assert isinstance(block, stmt.Block)
+    first, second, inner = block.statements
+    assert resolver.slots[id(first)] == (0, 0)
+    assert resolver.slots[id(second)] == (0, 1)
+    assert resolver.frame_sizes[id(block)] == 2
+    assert resolver.frame_sizes[id(inner)] == 0
+    assert isinstance(inner, stmt.Block)
+    (printed,) = inner.statements
+    assert isinstance(printed, stmt.Print)
+    assert isinstance(printed.expr, expr.Binary)
+    assert resolver.slots[id(printed.expr.left)] == (1, 0)
+    assert resolver.slots[id(printed.expr.right)] == (1, 1)
+
+
+def test_globals_get_indexes_in_order_of_appearance():
+    resolver = Resolver()
+    for statement in parse("print y;\nvar x = y;\nx = 1;"):
+        resolver.resolve(statement)
+    assert resolver.global_names == {"y": 0, "x": 1}
+    assert all(depth == GLOBAL for depth, _ in resolver.slots.values())
+
+
+@pytest.mark.parametrize(
+    ("source", "message"),
+    [
+        ("{ var a = a; }", "Can't read local variable in its own initializer."),
+        ("{ var a; var a; }", "Already a variable with this name in this scope."),
+    ],
+)
+def test_resolver_errors(source: str, message: str):
+    resolver = Resolver()
+    with pytest.raises(RuntimeError, match=message):
+        for statement in parse(source):
+            resolver.resolve(statement)
+
+
+def test_globals_may_be_redeclared_and_read_in_initializer():
+    assert run(Interpreter, "var a = 1;\nvar a = a + 1;\nprint a;") == "2.0\n"
+
+
+@pytest.mark.parametrize("parser", [Parser, RecursiveDescentParser])
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("a = b = 1;", "(= a (= b 1.0))"),
+        ("a = 1 + 2;", "(= a (+ 1.0 2.0))"),
+        ("(a = 1) == 1;", "(== (group (= a 1.0)) 1.0)"),
+    ],
+)
+def test_assignment_parses_right_associative(
+    parser: type[Parser], source: str, expected: str
+):
+    (statement,) = parser(RegexScanner(source).scan_buffer()).parse()
+    assert isinstance(statement, stmt.Expression)
+    assert expr.AstPrinter().print(statement.expr) == expected
+
+
+@pytest.mark.parametrize("parser", [Parser, RecursiveDescentParser])
+@pytest.mark.parametrize("source", ["a + b = 1;", "(a) = 1;", "-a = 1;", "1 = 2;"])
+def test_invalid_assignment_target(parser: type[Parser], source: str):
+    with pytest.raises(RuntimeError, match="Invalid assignment target."):
+        _ = parser(RegexScanner(source).scan_buffer()).parse()
+
+
+def test_global_table_is_a_mapping_by_name():
+    table = GlobalTable({"a": 0}, {"b": 2.0})
+    assert dict(table) == {"b": 2.0}
+    table["a"] = 1.0
+    assert table["a"] == 1.0
+    assert table.names == {"a": 0, "b": 1}
+    assert list(table.values()) == [1.0, 2.0]
+    assert table.cells == [1.0, 2.0]
+    with pytest.raises(KeyError):
+        _ = table["c"]
+
+
+def test_program_binds_only_referenced_globals():
+    program = pylox.compile("{ var y = x * 2; print y; }")
+    stdout = io.StringIO()
+    program.run({"x": 3.0, "unused": 1.0}, stdout)
+    assert stdout.getvalue() == "6.0\n"
+    assert program.resolver.global_names == {"x": 0}
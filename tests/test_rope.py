@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from pylox.closures import ClosureInterpreter
+from pylox.interpreter import Interpreter
+from pylox.optimizer import optimize
+from pylox.parser import Parser
+from pylox.quicken import SpecializingInterpreter
+from pylox.rope import FLAT_LIMIT, Rope, concat
+from pylox.scanner import RegexScanner
+from pylox.vm import VM
+
+LONG: str = "x" * FLAT_LIMIT
+
+
+def test_short_concatenation_stays_str():
+    assert type(concat("a", "b")) is str
+
+
+def test_long_concatenation_builds_a_rope():
+    rope = concat(LONG, "y")
+    assert isinstance(rope, Rope)
+    assert len(rope) == FLAT_LIMIT + 1
+    assert str(rope) == LONG + "y"
+
+
+def test_rope_compares_and_hashes_like_str():
+    rope = concat(LONG, "y")
+    assert rope == LONG + "y"
+    assert LONG + "y" == rope
+    assert rope != LONG + "z"
+    assert rope != 1.0
+    assert hash(rope) == hash(LONG + "y")
+    assert {rope: 1}[LONG + "y"] == 1
+
+
+def test_appends_share_pieces():
+    rope = concat(LONG, "a")
+    for piece in "bcd":
+        rope = concat(rope, piece)
+    assert isinstance(rope, Rope)
+    assert rope.pieces() == [LONG, "a", "b", "c", "d"]
+
+
+def test_branching_from_an_older_rope_copies():
+    base = concat(LONG, "a")
+    left = concat(base, "b")
+    right = concat(base, "c")
+    assert (str(base), str(left), str(right)) == (LONG + "a", LONG + "ab", LONG + "ac")
+
+
+def test_rope_concatenated_with_itself():
+    rope = concat(LONG, "a")
+    assert str(concat(rope, rope)) == (LONG + "a") * 2
+
+
+@pytest.mark.parametrize(
+    "engine", [Interpreter, SpecializingInterpreter, ClosureInterpreter, VM]
+)
+def test_engines_build_ropes(engine: type):
+    appends = 'report = report + "0123456789";\n' * 100
+    source = (
+        f'var report = "";\n{appends}'
+        f'print report == "{"0123456789" * 100}";\nprint report;\n'
+    )
+    stdout = io.StringIO()
+    engine(stdout=stdout).interpret(Parser(RegexScanner(source).scan_buffer()).parse())
+    assert stdout.getvalue() == f"True\n{'0123456789' * 100}\n"
+
+
+def test_folded_strings_are_flat():
+    source = f'print "{LONG}" + "y";'
+    [statement], _ = optimize(Parser(RegexScanner(source).scan_buffer()).parse())
+    assert type(statement.expr.value) is str  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_identifiers_and_short_strings_are_interned():
+    buffer = RegexScanner('print name;\nprint name + "label" + "label";').scan_buffer()
+    assert buffer.lexeme(1) is buffer.lexeme(4)
+    assert buffer.literal(6) is buffer.literal(8)
@@ -0,0 +1,65 @@
+import random
+from configparser import ParsingError
+from pathlib import Path
+
+import pytest
+
+from pylox.scanner import KEYWORDS, PUNCTUATION, RegexScanner, Scanner
+
+GENERATED_TEST_CASE_COUNT: int = 100
+SAMPLES: list[Path] = sorted(Path(__file__).parent.parent.glob("samples/*.lox"))
+FRAGMENTS: list[str] = [
+    *KEYWORDS,
+    *PUNCTUATION,
+    "foo",
+    "_bar",
+    "baz9",
+    "0",
+    "12",
+    "3.25",
+    "7.",
+    '"text"',
+    '"multi\nline"',
+    '""',
+    "// comment",
+    "\n",
+    "\t",
+    "  ",
+    "é",
+    "naïve",
+    "١٢",
+    "½",
+]
+
+
+def generate_source() -> str:
+    fragments = random.choices(FRAGMENTS, k=random.randint(1, 40))
+    return "".join(fragment + random.choice(["", " ", "\n"]) for fragment in fragments)
+
+
+def outcome(scanner: Scanner | RegexScanner) -> object:
+    try:
+        return scanner.scan_tokens()
+    except (ParsingError, ValueError) as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda path: path.name)
+def test_samples_match_scanner(path: Path):
+    source = path.read_text()
+    assert RegexScanner(source).scan_tokens() == Scanner(source).scan_tokens()
+
+
+@pytest.mark.parametrize(
+    "source", [generate_source() for _ in range(GENERATED_TEST_CASE_COUNT)]
+)
+def test_generated_sources_match_scanner(source: str):
+    assert outcome(RegexScanner(source)) == outcome(Scanner(source))
+
+
+@pytest.mark.parametrize(
+    "source",
+    ['print "unterminated;', "var a = 1 @ 2;", "1 + ²", '"a\n\n"\nb'],
+)
+def test_edge_cases_match_scanner(source: str):
+    assert outcome(RegexScanner(source)) == outcome(Scanner(source))
@@ -0,0 +1,151 @@
+import asyncio
+import io
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.output import MemorySink
+from pylox.program import compile
+from pylox.scheduler import (
+    CANCELLED,
+    DONE,
+    ERROR,
+    OUT_OF_BUDGET,
+    Scheduler,
+    Script,
+    run_all,
+    steps,
+)
+
+SCRIPT_COUNT: int = 1000
+
+
+def counter(count: int) -> str:
+    return "var n = 0;\n" + "n = n + 1;\n" * count + "print n;"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "print 1;\nprint 2;",
+        "var a = 1;\n{ var b = a + 1; { print a + b; } print b; }\nprint a;",
+        "{ var a = 1; print missing; }\nprint 2;",
+    ],
+)
+def test_steps_match_interpreter(source: str):
+    expected = io.StringIO()
+    Interpreter(stdout=expected).interpret(compile(source, 0).statements)
+    results = run_all({"script": source})
+    assert results[0].stdout.getvalue() == expected.getvalue()
+
+
+def test_steps_enter_blocks():
+    program = compile("{ var a = 1; { a = a + 1; } print a; }", 0)
+    stdout = MemorySink()
+    interpreter = program.bind(stdout=stdout)
+    frame = interpreter.frame
+    assert len(list(steps(interpreter, program.statements))) == 3
+    assert stdout.getvalue() == "2.0\n"
+    assert interpreter.frame is frame
+
+
+def test_many_scripts_finish():
+    results = run_all(
+        {f"s{index}": counter(index % 10) for index in range(SCRIPT_COUNT)}
+    )
+    assert all(result.status == DONE for result in results)
+    assert [result.stdout.getvalue() for result in results[:3]] == [
+        "0.0\n",
+        "1.0\n",
+        "2.0\n",
+    ]
+    assert results[-1].cost.steps == 11
+
+
+def test_slices_are_round_robin():
+    order: list[str] = []
+
+    async def main() -> list[Script]:
+        scheduler = Scheduler(slice_steps=1)
+        for name in "abc":
+            _ = scheduler.submit(name, f'print "{name}";\n' * 3)
+
+        async def watch() -> None:
+            for _ in range(9):
+                order.append(
+                    "".join(
+                        script.stdout.getvalue()[-2]
+                        for script in scheduler.scripts.values()
+                        if script.stdout.getvalue()
+                    )
+                )
+                await asyncio.sleep(0)
+
+        watcher = asyncio.create_task(watch())
+        results = await scheduler.wait()
+        await watcher
+        return results
+
+    results = asyncio.run(main())
+    assert [result.stdout.getvalue() for result in results] == [
+        f"{name}\n" * 3 for name in "abc"
+    ]
+    assert [result.cost.slices for result in results] == [3, 3, 3]
+    # Every script gets a slice before any script gets a second one.
+    assert order[1] == "abc"
+
+
+def test_step_budget():
+    results = run_all({"long": counter(50), "short": counter(5)}, max_steps=10)
+    assert [result.status for result in results] == [OUT_OF_BUDGET, DONE]
+    assert results[0].cost.steps == 10
+    assert results[0].error == "Step budget of 10 exceeded."
+    assert results[0].stdout.getvalue() == ""
+
+
+def test_time_budget():
+    results = run_all({"long": counter(10_000)}, slice_steps=10, max_seconds=0)
+    assert results[0].status == OUT_OF_BUDGET
+    assert results[0].cost.steps == 10
+
+
+def test_errors_are_reported():
+    results = run_all({"bad": "print 1;\nprint missing;", "parse": "print (;"})
+    assert [result.status for result in results] == [ERROR, ERROR]
+    assert results[0].stdout.getvalue() == "1.0\nUndefined variable 'missing'.\n"
+
+
+# Division by zero and scan errors are not RuntimeErrors.
+def test_python_and_scan_errors_are_reported():
+    results = run_all({"zero": "print 1;\nprint 1 / 0;", "scan": 'print "abc;'})
+    assert [result.status for result in results] == [ERROR, ERROR]
+    assert results[0].stdout.getvalue() == "1.0\nfloat division by zero\n"
+    assert results[0].error == "float division by zero"
+    assert results[1].error
+
+
+def test_cancel():
+    async def main() -> list[Script]:
+        scheduler = Scheduler(slice_steps=5)
+        _ = scheduler.submit("running", counter(1000))
+        _ = scheduler.submit("waiting", counter(1000))
+        await asyncio.sleep(0)
+        assert scheduler.cancel("running")
+        assert scheduler.cancel("waiting")
+        return await scheduler.wait()
+
+    results = asyncio.run(main())
+    assert [result.status for result in results] == [CANCELLED, CANCELLED]
+    assert results[0].cost.steps == 5
+    assert results[1].cost.steps in (0, 5)
+
+
+def test_duplicate_names_are_rejected():
+    async def main() -> None:
+        scheduler = Scheduler()
+        _ = scheduler.submit("a", "print 1;")
+        with pytest.raises(ValueError):
+            _ = scheduler.submit("a", "print 2;")
+        _ = await scheduler.wait()
+
+    asyncio.run(main())
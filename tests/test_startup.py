@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+HELLO: Path = Path(__file__).parent.parent / "samples" / "hello.lox"
+LAZY_MODULES: list[str] = ["rich", "pylox.vm", "pylox.closures", "pylox.optimizer"]
+
+
+def loaded_modules(code: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys\n{code}\nprint(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": ":".join(sys.path)},
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import pylox",
+        "import pylox.expr, pylox.token, pylox.interpreter",
+        f"from pylox import run_file; run_file(open({str(HELLO)!r}))",
+    ],
+)
+def test_headless_runs_do_not_import_extras(code: str):
+    modules = loaded_modules(code)
+    assert not [name for name in modules if name.split(".")[0] == "rich"]
+    assert modules.isdisjoint(LAZY_MODULES)
+
+
+@pytest.mark.parametrize(
+    ("source", "status", "stderr"),
+    [
+        ("print 1;", 0, ""),
+        ("print 1", 65, "Expect `;` after value"),
+        ('print "open;', 65, "Unterminated string"),
+        ("print 1 / 0;", 70, ""),
+    ],
+)
+def test_script_exit_statuses(tmp_path: Path, source: str, status: int, stderr: str):
+    script = tmp_path / "script.lox"
+    _ = script.write_text(source)
+    result = subprocess.run(
+        [sys.executable, "-m", "pylox", str(script)],
+        check=False,
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": ":".join(sys.path)},
+    )
+    assert result.returncode == status
+    assert stderr in result.stderr
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.output import MemorySink
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stream import TokenStream, flush_before_reading, read_chunks
+
+SAMPLES: list[Path] = sorted(Path(__file__).parent.parent.glob("samples/*.lox"))
+SOURCE: str = 'print 12.5 + 3;\n// note\nprint "two\nlines" == "x";\nprint !nil;\n'
+
+
+def chunked(source: str, size: int) -> list[str]:
+    return [source[i : i + size] for i in range(0, len(source), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda path: path.name)
+def test_chunked_scan_matches_whole_scan(path: Path, size: int):
+    source = path.read_text()
+    streamed = list(RegexScanner().scan_stream(chunked(source, size)))
+    assert streamed == RegexScanner(source).scan_tokens()
+
+
+def test_read_chunks_memory_maps_files(tmp_path: Path):
+    path = tmp_path / "script.lox"
+    _ = path.write_bytes('print "héllo";\r\nprint 1;\n'.encode())
+    with path.open() as file:
+        assert "".join(read_chunks(file, chunk_size=3)) == path.read_text()
+
+
+def test_read_chunks_falls_back_to_reading():
+    assert "".join(read_chunks(io.StringIO(SOURCE), chunk_size=5)) == SOURCE
+
+
+# A pipe's reader gets each line as it is written, not once a whole chunk
+# has arrived. The writer is closed after a while so a regression fails
+# instead of hanging.
+def test_read_chunks_does_not_wait_for_full_chunks_on_pipes():
+    read_fd, write_fd = os.pipe()
+    _ = os.write(write_fd, b"print 1;\n")
+    closer = threading.Timer(5, os.close, (write_fd,))
+    closer.start()
+    try:
+        with os.fdopen(read_fd, encoding="utf-8") as file:
+            start = time.perf_counter()
+            assert next(read_chunks(file)) == "print 1;\n"
+            assert time.perf_counter() - start < 5
+    finally:
+        closer.cancel()
+        with contextlib.suppress(OSError):
+            os.close(write_fd)
+
+
+def test_output_is_flushed_before_each_read():
+    output = MemorySink()
+    seen: list[str] = []
+
+    def chunks() -> Iterator[str]:
+        for chunk in ["print 1;\n", "print 2;\n", ""]:
+            seen.append("".join(output.chunks))
+            yield chunk
+
+    tokens = RegexScanner().scan_stream(flush_before_reading(chunks(), output))
+    Interpreter(None, output).interpret(Parser(TokenStream(tokens)).statements())
+    assert seen == ["", "1.0\n", "1.0\n2.0\n"]
+
+
+def test_token_stream_releases_parsed_tokens():
+    tokens = TokenStream(RegexScanner().scan_stream(chunked(SOURCE * 50, 16)), keep=4)
+    statements = list(Parser(tokens).statements())
+    assert statements == Parser(RegexScanner(SOURCE * 50).scan_tokens()).parse()
+    assert len(tokens.window) <= 6
+    with pytest.raises(IndexError):
+        _ = tokens[0]
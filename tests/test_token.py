@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.token import TokenType
+
+SAMPLES: list[Path] = sorted(Path(__file__).parent.parent.glob("samples/*.lox"))
+SOURCE: str = 'print (1.5 + 2) * -3 == "a\nb";\nprint !true != nil;\nnaïve;'
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda path: path.name)
+def test_buffer_view_matches_token_list(path: Path):
+    source = path.read_text()
+    assert (
+        list(RegexScanner(source).scan_buffer()) == RegexScanner(source).scan_tokens()
+    )
+
+
+def test_buffer_slices_lexemes_and_literals_on_demand():
+    buffer = RegexScanner(SOURCE).scan_buffer()
+    tokens = RegexScanner(SOURCE).scan_tokens()
+    assert len(buffer) == len(tokens)
+    for index, token in enumerate(tokens):
+        assert buffer.token_type(index) == token.token_type
+        assert buffer.lexeme(index) == token.lexeme
+        assert buffer.literal(index) == token.literal
+        assert buffer[index] == token
+    assert buffer.token_type(len(buffer) - 1) == TokenType.EOF
+
+
+def test_parser_reads_buffer_directly():
+    source = SOURCE.rsplit("\n", 1)[0]
+    assert (
+        Parser(RegexScanner(source).scan_buffer()).parse()
+        == Parser(RegexScanner(source).scan_tokens()).parse()
+    )
@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+
+from pylox.cache import ProgramCache
+from pylox.interpreter import Interpreter
+from pylox.output import MemorySink
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.scanner import Scanner
+from pylox.stmt import Stmt
+from pylox.transpile import (
+    CHUNK_STATEMENTS,
+    CODE_VERSION,
+    CompiledProgram,
+    TranspilingInterpreter,
+    run_source,
+    transpile,
+)
+
+PROGRAMS: list[str] = [
+    "print 1 + 2 * 3 - 4 / 2;",
+    "print -(3 * 2); print -true; print -nil;",
+    "print !nil; print !true; print !0; print !!false;",
+    'print "a" + "b"; print "a" + 1; print 1 + "b"; print true + 1;',
+    "print 1 < 2; print 2 <= 2; print 3 > 4; print nil < 1;",
+    'print nil == nil; print 1 != 2; print "a" == "a"; print true == 1;',
+    "var a = 1; var b; print b; b = a = a + 1; print a; print b;",
+    "var a = 1; { var a = a; var b = 2; { a = a + b; print a; } print a; } print a;",
+    '{ var s = "x"; { var s = s + "y"; print s; } print s; }',
+    "var a = 1; var a = 2; print a;",
+    "{ var a = 1; print a + (a = 2); print (a = 3) * a; print -a < 2 - a; }",
+    "{ var a = 1; } { var b = 2; { var a = b; print a; } }",
+    "{ var x = 1; { var y = 2; var a = a = 5; print x; print a + y; } }",
+    "print 1 / 0;",
+    "print missing; print 1;",
+    "var a = 1; print a; print b; print a;",
+]
+
+
+def parse(source: str) -> list[Stmt]:
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_transpiled_matches_interpreter(source: str):
+    expected = MemorySink()
+    Interpreter(None, expected).interpret(parse(source))
+    output = MemorySink()
+    TranspilingInterpreter(None, output).interpret(parse(source))
+    lines = output.getvalue().splitlines()
+    # Runtime errors also report their line, as the VM does.
+    assert [line for line in lines if not line.startswith("[line ")] == (
+        expected.getvalue().splitlines()
+    )
+
+
+def test_errors_report_lox_line():
+    output = MemorySink()
+    TranspilingInterpreter(None, output).interpret(
+        parse("print 1;\n\n{\n  var a = 1;\n  print a / 0;\n}\nprint 2;")
+    )
+    assert output.getvalue().splitlines() == [
+        "1.0",
+        "float division by zero",
+        "[line 5] in script",
+    ]
+
+
+def test_globals_and_compiled_program():
+    source = "var y = x * 3; print y;"
+    output = MemorySink()
+    TranspilingInterpreter({"x": 2.0}, output).interpret(parse(source))
+    assert output.getvalue() == "6.0\n"
+    program = CompiledProgram.loads(transpile(parse(source)).dumps())
+    output = MemorySink()
+    program.run({"x": 5.0}, output)
+    assert output.getvalue() == "15.0\n"
+
+
+def test_loads_rejects_other_versions():
+    resolver = Resolver()
+    data = transpile(parse("print 1;"), resolver).dumps()
+    version = CODE_VERSION.encode()
+    with pytest.raises(ValueError, match="another pylox"):
+        _ = CompiledProgram.loads(data.replace(version, b"0" + version[1:], 1))
+
+
+def test_falls_back_when_python_cannot_compile(monkeypatch: pytest.MonkeyPatch):
+    def too_deep(*_: object) -> CompiledProgram:
+        raise RecursionError("maximum recursion depth exceeded during compilation")
+
+    monkeypatch.setattr("pylox.transpile.compile_chunk", too_deep)
+    output = MemorySink()
+    engine = TranspilingInterpreter(None, output)
+    engine.interpret(parse("var a = 1; { var b = a + 1; print -b; }"))
+    assert output.getvalue() == "-2.0\n"
+
+
+def test_runs_nesting_too_deep_for_python():
+    output = MemorySink()
+    engine = TranspilingInterpreter(None, output)
+    engine.interpret(parse("print " + "1 + " * 20_000 + "1;"))
+    assert output.getvalue() == "20001.0\n"
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_runs_in_chunks(streamed: bool):
+    count = CHUNK_STATEMENTS * 2 + 1
+    statements = parse("var a = 0;\n" + "a = a + 1;\n" * count + "print a;")
+    # A resolver error stops the script after the statements before it ran.
+    statements[-1:] = parse("print a; { var b; var b; } print a;")
+    output = MemorySink()
+    TranspilingInterpreter(None, output).interpret(
+        iter(statements) if streamed else statements
+    )
+    assert output.getvalue().splitlines() == [
+        f"{count}.0",
+        "Already a variable with this name in this scope.",
+    ]
+
+
+def test_compiles_a_code_object_per_chunk():
+    program = transpile(parse("print 1;\n" * (CHUNK_STATEMENTS + 1)))
+    assert len(program.codes) == 2
+    output = MemorySink()
+    program.run(None, output)
+    assert output.getvalue() == "1.0\n" * (CHUNK_STATEMENTS + 1)
+
+
+def test_run_source_caches_code(tmp_path: Path):
+    cache = ProgramCache(tmp_path)
+    source = "var a = 2;\nprint a * a;\nprint missing;"
+    parsed: list[str] = []
+
+    def parse_once() -> list[Stmt]:
+        parsed.append(source)
+        return parse(source)
+
+    outputs = [MemorySink(), MemorySink()]
+    for output in outputs:
+        run_source(source, 1, parse_once, 0, cache, output)
+    assert len(parsed) == 1
+    assert (
+        outputs[0].getvalue()
+        == outputs[1].getvalue()
+        == "4.0\nUndefined variable 'missing'.\n[line 3] in script\n"
+    )
+    # The parsed-program entry for the same source is a different one.
+    assert cache.load(cache.key(source), 1) is None
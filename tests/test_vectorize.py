@@ -0,0 +1,101 @@
+import math
+import random
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.scanner import RegexScanner
+from pylox.stmt import Expression
+
+np = pytest.importorskip("numpy")
+vectorize = pytest.importorskip("pylox.vectorize")
+
+GENERATED_TEST_CASE_COUNT: int = 100
+OPERATORS: list[str] = ["==", "!=", "<", "<=", ">", ">=", "+", "-", "*", "/"]
+ROWS: int = 64
+
+
+def generate_expression(depth: int) -> str:
+    if depth == 0 or random.random() < 0.2:
+        return random.choice(["1", "2.5", '"s"', "true", "nil", "x", "y", "s", "m"])
+    match random.randint(0, 3):
+        case 0:
+            return f"{random.choice(['-', '!'])}{generate_expression(depth - 1)}"
+        case 1:
+            return f"({generate_expression(depth - 1)})"
+        case _:
+            left = generate_expression(depth - 1)
+            right = generate_expression(depth - 1)
+            return f"{left} {random.choice(OPERATORS)} {right}"
+
+
+def parse_expression(source: str):
+    [statement] = Parser(RegexScanner(f"{source};").scan_buffer()).parse()
+    assert isinstance(statement, Expression)
+    return statement.expr
+
+
+def columns():
+    rng = np.random.default_rng(0)
+    mixed = np.array(
+        [random.choice([None, True, False, 0.0, 2.5, "s", "t"]) for _ in range(ROWS)],
+        dtype=object,
+    )
+    return {
+        "x": rng.integers(-3, 4, ROWS).astype(np.float64),
+        "y": rng.integers(0, 2, ROWS).astype(np.bool_),
+        "s": np.array([random.choice(["s", "t", "st"]) for _ in range(ROWS)], object),
+        "m": mixed,
+    }
+
+
+def per_row(expression, bound: dict[str, object]) -> list[object]:
+    rows = {name: values.tolist() for name, values in bound.items()}
+    return [
+        Interpreter({name: values[row] for name, values in rows.items()}).evaluate(
+            expression
+        )
+        for row in range(ROWS)
+    ]
+
+
+def same(left: object, right: object) -> bool:
+    if isinstance(left, float) and isinstance(right, float):
+        return left == right or (math.isnan(left) and math.isnan(right))
+    return type(left) is type(right) and left == right
+
+
+@pytest.mark.parametrize(
+    "source", [generate_expression(4) for _ in range(GENERATED_TEST_CASE_COUNT)]
+)
+def test_matches_per_row_interpreter(source: str):
+    expression = parse_expression(source)
+    bound = columns()
+    try:
+        expected = per_row(expression, bound)
+    except ZeroDivisionError:
+        with pytest.raises(ZeroDivisionError):
+            _ = vectorize.evaluate(expression, bound)
+        return
+    actual = vectorize.evaluate(expression, bound).tolist()
+    assert all(map(same, actual, expected)), (actual, expected)
+
+
+def test_numeric_results_stay_float_arrays():
+    x = np.arange(5, dtype=np.float64)
+    result = vectorize.evaluate(parse_expression("x * 2 + 1"), {"x": x})
+    assert result.dtype == np.float64
+    assert result.tolist() == [1.0, 3.0, 5.0, 7.0, 9.0]
+    assert vectorize.evaluate(parse_expression("x < 2"), {"x": x}).dtype == np.bool_
+
+
+def test_type_mismatches_are_masked_to_nil():
+    values = np.array([1.0, "a", None, True], dtype=object)
+    result = vectorize.evaluate(parse_expression("v + 1"), {"v": values})
+    assert result.tolist() == [2.0, None, None, 2.0]
+
+
+def test_undefined_variable_raises():
+    with pytest.raises(RuntimeError, match="Undefined variable 'z'."):
+        _ = vectorize.evaluate(parse_expression("z + 1"), {}, rows=3)
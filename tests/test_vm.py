@@ -0,0 +1,69 @@
+import pytest
+
+from pylox.compiler import MAX_GLOBALS, Compiler, OpCode, disassemble
+from pylox.interpreter import Interpreter
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.scanner import Scanner
+from pylox.stmt import Stmt
+from pylox.vm import VM
+
+PROGRAMS: list[str] = [
+    'print "Hello lox";',
+    "print 1 + 2 * 3 - 4 / 2;",
+    "print (1 + 2) * (3 - 4);",
+    "print -(3 * 2);",
+    "print !nil; print !true; print !0;",
+    'print "a" + "b"; print "a" + 1; print 1 + "b";',
+    "print 1 < 2; print 2 <= 2; print 3 > 4; print 3 >= 4;",
+    "print nil == nil; print nil != nil; print 1 == 1; print 1 != 2;",
+    'print "a" == "a"; print true == 1; print -true; print true + 1;',
+    "print -nil; print nil < 1;",
+]
+
+
+def parse(source: str) -> list[Stmt]:
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_vm_matches_interpreter(source: str, capsys: pytest.CaptureFixture[str]):
+    statements = parse(source)
+    Interpreter().interpret(statements)
+    expected = capsys.readouterr().out
+    VM().interpret(statements)
+    assert capsys.readouterr().out == expected
+
+
+def test_constants_are_deduplicated():
+    chunk = Compiler().compile(parse("print 1 + 1 + 1; print 1;"))
+    assert chunk.constants == [1.0]
+    assert chunk.code[-1] == OpCode.RETURN
+
+
+def test_line_table_reports_failing_line(capsys: pytest.CaptureFixture[str]):
+    VM().interpret(parse("print 1;\nprint 1 / 0;"))
+    assert capsys.readouterr().out.splitlines() == [
+        "1.0",
+        "float division by zero",
+        "[line 2] in script",
+    ]
+
+
+@pytest.mark.parametrize("source", ["var last = 1;", "print last;", "last = 1;"])
+def test_global_indexes_are_bounded(source: str, capsys: pytest.CaptureFixture[str]):
+    resolver = Resolver()
+    for index in range(MAX_GLOBALS):
+        _ = resolver.global_index(f"g{index}")
+    VM(resolver=resolver).interpret(parse(source))
+    assert capsys.readouterr().out == "Too many global variables\n"
+
+
+def test_disassemble():
+    listing = disassemble(Compiler().compile(parse("print -2;")))
+    assert [line.split()[-1] for line in listing] == [
+        "2.0",
+        "NEGATE",
+        "PRINT",
+        "RETURN",
+    ]